@@ -6,7 +6,7 @@ from core.db import get_db
 from repositories.mock.user_repository import UserRepository
 from repositories.mock.role_repository import RoleRepository
 
-from core.security import verify_password, create_access_token
+from core.security import verify_password_async, create_access_token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -40,7 +40,7 @@ async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Неправильный логин или пароль")
 
-    if not verify_password(data.password, user["password_hash"]):
+    if not await verify_password_async(data.password, user["password_hash"]):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Неправильный логин или пароль")
 
     await repo.update_last_login(user["id"])
@@ -1,23 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from typing import List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.security import get_current_user
 from core.roles import UserRole
 from core.db import get_db
+from core.media_urls import media_url_scope
 
 from schemas import (
     CourseResponse,
     CourseDetailResponse,
     CourseCreate,
     CourseUpdate,
+    CourseBulkEnrollRequest,
+    CourseBulkEnrollResponse,
+    CourseStudentProgressResponse,
 )
 
 from services import CourseService
+from services.image_service import ensure_image_derivatives
 from repositories.mock.course_repository import JsonCourseRepository
 from repositories.mock.lesson_repository import JsonLessonRepository
 from repositories.mock.enrollment_repository import EnrollmentRepository
+from repositories.mock.progress_repository import ProgressRepository
 from schemas.content import CourseContentResponse
+from utils.pagination import NEXT_CURSOR_HEADER
+from utils.http_cache import REVALIDATE_CACHE_CONTROL, etag_matches, make_etag
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
 
@@ -25,6 +34,7 @@ async def get_course_service(db: AsyncSession = Depends(get_db)) -> CourseServic
     return CourseService(
         course_repo=JsonCourseRepository(db),
         lesson_repo=JsonLessonRepository(db),
+        progress_repo=ProgressRepository(db),
     )
 
 
@@ -32,40 +42,75 @@ async def get_enrollment_repo(db: AsyncSession = Depends(get_db)) -> EnrollmentR
     return EnrollmentRepository(db)
 
 
+def _viewer_scope(current_user: dict) -> Tuple[Optional[int], Optional[str]]:
+    """
+    (user_id, enrollment_type), которыми ограничивается выборка курсов.
+    Для администратора и менеджера ограничения нет — (None, None).
+    """
+    role = current_user["role"]
+    if role == UserRole.STUDENT.value:
+        return current_user["id"], "student"
+    if role == UserRole.TRAINER.value:
+        return current_user["id"], "trainer"
+    return None, None
+
+
+async def _list_visible_courses(
+    response: Response,
+    service: CourseService,
+    current_user: dict,
+    status: Optional[str],
+    search: Optional[str],
+    limit: int,
+    offset: int,
+    cursor: Optional[str],
+) -> List[CourseResponse]:
+    viewer_id, enrollment_type = _viewer_scope(current_user)
+
+    try:
+        courses = await service.get_all_courses(
+            status,
+            limit,
+            offset,
+            search,
+            viewer_id=viewer_id,
+            enrollment_type=enrollment_type,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    next_cursor = service.next_cursor(courses, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return courses
+
+
 @router.get("/", response_model=List[CourseResponse])
 async def list_courses(
+    response: Response,
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    limit: int = Query(20),
-    offset: int = Query(0),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     service: CourseService = Depends(get_course_service),
-    enrollment_repo: EnrollmentRepository = Depends(get_enrollment_repo),
     current_user: dict = Depends(get_current_user),
 ):
-    user_id = current_user["id"]
-    role = current_user["role"]
-
-    all_courses = await service.get_all_courses(status, limit, offset, search)
-
-    if role == UserRole.STUDENT.value:
-        allowed = set(await enrollment_repo.get_courses_for_student(user_id))
-        return [c for c in all_courses if c.id in allowed]
-
-    if role == UserRole.TRAINER.value:
-        allowed = set(await enrollment_repo.get_courses_for_trainer(user_id))
-        return [c for c in all_courses if c.id in allowed]
-
-    return all_courses
+    return await _list_visible_courses(
+        response, service, current_user, status, search, limit, offset, cursor
+    )
 
 
 @router.get("/my", response_model=List[CourseResponse])
 async def get_my_courses(
+    response: Response,
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    limit: int = Query(20),
-    offset: int = Query(0),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     service: CourseService = Depends(get_course_service),
-    enrollment_repo: EnrollmentRepository = Depends(get_enrollment_repo),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -74,98 +119,124 @@ async def get_my_courses(
     - Тренер: только курсы, которые он ведет
     - Студент: только курсы, куда он записан
     """
+    # Если роль не определена, возвращаем пустой список
+    if current_user["role"] not in (
+        UserRole.ADMIN.value,
+        UserRole.MANAGER.value,
+        UserRole.TRAINER.value,
+        UserRole.STUDENT.value,
+    ):
+        return []
+
+    return await _list_visible_courses(
+        response, service, current_user, status, search, limit, offset, cursor
+    )
+
+
+async def _ensure_course_access(
+    enrollment_repo: EnrollmentRepository,
+    current_user: dict,
+    course_id: int,
+) -> None:
     user_id = current_user["id"]
     role = current_user["role"]
 
-    all_courses = await service.get_all_courses(status, limit, offset, search)
-
-    # Администратор и менеджер видят все курсы
-    if role in (UserRole.ADMIN.value, UserRole.MANAGER.value):
-        return all_courses
+    if role == UserRole.STUDENT.value:
+        student_courses = await enrollment_repo.get_courses_for_student(user_id)
+        if course_id not in student_courses:
+            raise HTTPException(status_code=403, detail="Нет доступа")
 
-    # Тренер видит только курсы, которые он ведет
     if role == UserRole.TRAINER.value:
-        allowed = set(await enrollment_repo.get_courses_for_trainer(user_id))
-        return [c for c in all_courses if c.id in allowed]
+        trainer_courses = await enrollment_repo.get_courses_for_trainer(user_id)
+        if course_id not in trainer_courses:
+            raise HTTPException(status_code=403, detail="Нет доступа")
 
-    # Студент видит только курсы, куда он записан
-    if role == UserRole.STUDENT.value:
-        allowed = set(await enrollment_repo.get_courses_for_student(user_id))
-        return [c for c in all_courses if c.id in allowed]
 
-    # Если роль не определена, возвращаем пустой список
-    return []
+def _set_cache_headers(response: Response, etag: str) -> dict:
+    headers = {"etag": etag, "cache-control": REVALIDATE_CACHE_CONTROL, "vary": "Authorization"}
+    response.headers.update(headers)
+    return headers
 
 
 @router.get("/{course_id}", response_model=CourseDetailResponse)
 async def course_detail(
     course_id: int,
+    request: Request,
+    response: Response,
     service: CourseService = Depends(get_course_service),
     enrollment_repo: EnrollmentRepository = Depends(get_enrollment_repo),
     current_user: dict = Depends(get_current_user),
 ):
     user_id = current_user["id"]
-    role = current_user["role"]
 
-    course = await service.get_course_detail(course_id, user_id)
-    if not course:
+    # Версия курса — один легкий запрос; тело строится только если ETag не совпал
+    version = await service.get_content_version(course_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Курс не найден")
 
-    if role == UserRole.STUDENT.value:
-        student_courses = await enrollment_repo.get_courses_for_student(user_id)
-        if course_id not in student_courses:
-            raise HTTPException(status_code=403, detail="Нет доступа")
+    await _ensure_course_access(enrollment_repo, current_user, course_id)
 
-    if role == UserRole.TRAINER.value:
-        trainer_courses = await enrollment_repo.get_courses_for_trainer(user_id)
-        if course_id not in trainer_courses:
-            raise HTTPException(status_code=403, detail="Нет доступа")
+    enrollment_info = await service.get_enrollment_info(user_id, course_id)
+    image_version = await service.get_image_version(course_id, version)
+    etag = make_etag("detail", course_id, version, enrollment_info, image_version, media_url_scope())
+    headers = _set_cache_headers(response, etag)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
 
+    course = await service.get_course_detail(
+        course_id, user_id, version=version, enrollment_info=enrollment_info
+    )
+    if not course:
+        raise HTTPException(status_code=404, detail="Курс не найден")
     return course
 
 @router.get("/{course_id}/content", response_model=CourseContentResponse)
 async def course_content(
     course_id: int,
+    request: Request,
+    response: Response,
     service: CourseService = Depends(get_course_service),
     enrollment_repo: EnrollmentRepository = Depends(get_enrollment_repo),
     current_user: dict = Depends(get_current_user),
 ):
-    user_id = current_user["id"]
-    role = current_user["role"]
-
-    data = await service.get_course_content(course_id)
-    if not data:
+    version = await service.get_content_version(course_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Курс не найден")
 
-    if role == UserRole.STUDENT.value:
-        student_courses = await enrollment_repo.get_courses_for_student(user_id)
-        if course_id not in student_courses:
-            raise HTTPException(status_code=403, detail="Нет доступа")
+    await _ensure_course_access(enrollment_repo, current_user, course_id)
 
-    if role == UserRole.TRAINER.value:
-        trainer_courses = await enrollment_repo.get_courses_for_trainer(user_id)
-        if course_id not in trainer_courses:
-            raise HTTPException(status_code=403, detail="Нет доступа")
+    etag = make_etag("content", course_id, version, media_url_scope())
+    headers = _set_cache_headers(response, etag)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
 
+    data = await service.get_course_content(course_id, version=version)
+    if not data:
+        raise HTTPException(status_code=404, detail="Курс не найден")
     return data
 
 
 @router.post("/", response_model=CourseResponse, status_code=201)
 async def create_course(
     course_data: CourseCreate,
+    background_tasks: BackgroundTasks,
     service: CourseService = Depends(get_course_service),
     current_user: dict = Depends(get_current_user),
 ):
     if current_user["role"] not in (UserRole.ADMIN.value, UserRole.MANAGER.value):
         raise HTTPException(status_code=403, detail="Недостаточно прав")
 
-    return await service.create_course(course_data)
+    created = await service.create_course(course_data)
+    if course_data.image_url:
+        background_tasks.add_task(ensure_image_derivatives, course_data.image_url)
+    return created
 
 
 @router.patch("/{course_id}", response_model=CourseResponse)
 async def update_course(
     course_id: int,
     course_data: CourseUpdate,
+    background_tasks: BackgroundTasks,
     service: CourseService = Depends(get_course_service),
     current_user: dict = Depends(get_current_user),
 ):
@@ -176,6 +247,8 @@ async def update_course(
     if not updated:
         raise HTTPException(status_code=404, detail="Курс не найден")
 
+    if course_data.image_url:
+        background_tasks.add_task(ensure_image_derivatives, course_data.image_url)
     return updated
 
 
@@ -195,6 +268,67 @@ async def delete_course(
     return None
 
 
+@router.get("/{course_id}/progress", response_model=List[CourseStudentProgressResponse])
+async def course_progress(
+    course_id: int,
+    db: AsyncSession = Depends(get_db),
+    enrollment_repo: EnrollmentRepository = Depends(get_enrollment_repo),
+    current_user: dict = Depends(get_current_user),
+):
+    """Прогресс всех студентов курса (администратор, менеджер, тренер курса)"""
+    role = current_user["role"]
+
+    if role == UserRole.TRAINER.value:
+        trainer_courses = await enrollment_repo.get_courses_for_trainer(current_user["id"])
+        if course_id not in trainer_courses:
+            raise HTTPException(status_code=403, detail="Нет доступа")
+    elif role not in (UserRole.ADMIN.value, UserRole.MANAGER.value):
+        raise HTTPException(status_code=403, detail="Недостаточно прав")
+
+    return await ProgressRepository(db).get_course_progress(course_id)
+
+
+# Объявлен до /{course_id}/students/{student_id}, иначе "bulk" попадет в student_id
+@router.post("/{course_id}/students/bulk", response_model=CourseBulkEnrollResponse)
+async def assign_students_bulk(
+    course_id: int,
+    data: CourseBulkEnrollRequest,
+    enrollment_repo: EnrollmentRepository = Depends(get_enrollment_repo),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Массовая запись на курс: student_ids, участники группы group_id
+    и/или сотрудники отдела department_id — одним INSERT ... ON CONFLICT DO NOTHING.
+    Записываются только пользователи с ролью student.
+    skipped — уже записанные ранее пользователи и пользователи с другой ролью.
+    """
+    role = current_user["role"]
+    user_id = current_user["id"]
+
+    if role == UserRole.TRAINER.value:
+        trainer_courses = await enrollment_repo.get_courses_for_trainer(user_id)
+        if course_id not in trainer_courses:
+            raise HTTPException(status_code=403, detail="Вы не являетесь тренером курса")
+    elif role not in (UserRole.ADMIN.value, UserRole.MANAGER.value):
+        raise HTTPException(status_code=403, detail="Недостаточно прав")
+
+    try:
+        requested, inserted = await enrollment_repo.enroll_students_bulk(
+            course_id,
+            student_ids=data.student_ids,
+            group_id=data.group_id,
+            department_id=data.department_id,
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=404, detail="Курс не найден")
+
+    return CourseBulkEnrollResponse(
+        requested=requested,
+        inserted=inserted,
+        skipped=requested - inserted,
+    )
+
+
 @router.post("/{course_id}/students/{student_id}", status_code=204)
 async def assign_student(
     course_id: int,
@@ -1,7 +1,8 @@
 # api/v1/events.py
-from typing import List
+from datetime import date
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.db import get_db
@@ -10,6 +11,7 @@ from core.roles import UserRole
 
 from schemas.event import EventCreate, EventUpdate, EventOut
 from services.event_service import EventService
+from utils.pagination import NEXT_CURSOR_HEADER
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
@@ -20,25 +22,51 @@ def get_event_service(db: AsyncSession = Depends(get_db)) -> EventService:
 
 @router.get("/", response_model=List[EventOut])
 async def list_events(
+    response: Response,
+    date_from: Optional[date] = Query(None, alias="from", description="Начало окна календаря (включительно)"),
+    date_to: Optional[date] = Query(None, alias="to", description="Конец окна календаря (включительно)"),
+    company_id: Optional[int] = Query(None),
+    trainer_id: Optional[int] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     service: EventService = Depends(get_event_service),
     current_user: dict = Depends(get_current_user),
 ):
     role = current_user["role"]
     user_id = current_user["id"]
-
-    events = await service.list_events_with_participants()
-
-    if role in (UserRole.ADMIN.value, UserRole.MANAGER.value):
-        return events
+    participant_id: Optional[int] = None
 
     if role == UserRole.TRAINER.value:
-        return [e for e in events if e.trainer_id == user_id]
-
-    if role == UserRole.STUDENT.value:
-        # приглашения лучше делать через attendance (мы можем добавить join-фильтр)
+        # Тренер видит только свои мероприятия — фильтр в запросе, а не по странице
+        if trainer_id is not None and trainer_id != user_id:
+            return []
+        trainer_id = user_id
+    elif role == UserRole.STUDENT.value:
+        # Студент видит мероприятия, куда приглашен или записан;
+        # без явного окна — предстоящие, начиная с сегодняшнего дня
+        participant_id = user_id
+        if date_from is None and date_to is None:
+            date_from = date.today()
+    elif role not in (UserRole.ADMIN.value, UserRole.MANAGER.value):
         return []
 
-    return []
+    try:
+        events = await service.list_events_with_participants(
+            date_from=date_from,
+            date_to=date_to,
+            company_id=company_id,
+            trainer_id=trainer_id,
+            participant_id=participant_id,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    next_cursor = service.next_cursor(events, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return events
 
 
 @router.get("/{event_id}", response_model=EventOut)
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+
+from core.security import get_current_user
+from core.roles import UserRole
+
+from schemas import UploadedFileResponse
+from services import UploadService
+from services.image_service import ensure_image_derivatives
+
+router = APIRouter(prefix="/files", tags=["Files"])
+
+UPLOAD_ROLES = (UserRole.ADMIN.value, UserRole.MANAGER.value, UserRole.TRAINER.value)
+
+
+def _ensure_can_upload(current_user: dict) -> None:
+    if current_user["role"] not in UPLOAD_ROLES:
+        raise HTTPException(status_code=403, detail="Недостаточно прав")
+
+
+@router.get("/by-hash/{sha256}", response_model=UploadedFileResponse)
+async def get_file_by_hash(
+    sha256: str,
+    filename: str = Query(..., description="Имя файла (нужно для категории и расширения)"),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Проверить, загружен ли уже файл с таким SHA-256.
+    Если да — его url можно сразу использовать в content_url/file_path без загрузки.
+    """
+    _ensure_can_upload(current_user)
+
+    uploaded = await UploadService().find_by_hash(sha256, filename)
+    if not uploaded:
+        raise HTTPException(status_code=404, detail="Файл не найден")
+    return uploaded
+
+
+@router.post("/upload", response_model=UploadedFileResponse, status_code=201)
+async def upload_file(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    filename: str = Query(..., max_length=255, description="Исходное имя файла"),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Загрузить файл. Тело запроса — содержимое файла как есть (не multipart),
+    например fetch(url, {method: "POST", body: file}). Файл пишется на диск
+    по мере получения и хранится под путем по SHA-256 содержимого; одинаковые
+    файлы хранятся один раз. Для изображений после ответа в фоне создаются
+    уменьшенные копии (services.image_service).
+    """
+    _ensure_can_upload(current_user)
+
+    service = UploadService()
+    content_length = request.headers.get("content-length")
+    service.check_size(int(content_length) if content_length and content_length.isdigit() else None)
+
+    uploaded = await service.save_stream(filename, request.stream())
+    if uploaded.category == "photos":
+        background_tasks.add_task(ensure_image_derivatives, uploaded.url)
+    return uploaded
@@ -5,12 +5,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.security import get_current_user
 from core.roles import UserRole
 from core.db import get_db
+from core.responses import PydanticJSONResponse
 
-from schemas import LessonResponse, LessonCreate, LessonUpdate
+from schemas import LessonResponse, LessonCreate, LessonUpdate, CourseProgressResponse
 from services import LessonService
 from repositories.mock.lesson_repository import JsonLessonRepository
 from repositories.mock.course_repository import JsonCourseRepository
 from repositories.mock.enrollment_repository import EnrollmentRepository
+from repositories.mock.progress_repository import ProgressRepository
 
 router = APIRouter(prefix="/lessons", tags=["Lessons"])
 
@@ -93,7 +95,7 @@ async def get_lessons(
                     filtered.append(lesson)
             continue
 
-    return filtered
+    return PydanticJSONResponse(filtered, List[LessonResponse])
 
 @router.get("/{lesson_id}", response_model=LessonResponse)
 async def get_lesson(
@@ -112,6 +114,28 @@ async def get_lesson(
 
     return lesson
 
+@router.post("/{lesson_id}/complete", response_model=CourseProgressResponse)
+async def complete_lesson(
+    lesson_id: int,
+
+    db: AsyncSession = Depends(get_db),
+    service: LessonService = Depends(get_lesson_service),
+    course_repo: JsonCourseRepository = Depends(get_course_repo),
+    enrollment_repo: EnrollmentRepository = Depends(get_enrollment_repo),
+    current_user: dict = Depends(get_current_user),
+):
+    """Отметить урок пройденным; возвращает обновленный прогресс по курсу"""
+    lesson = await service.get_lesson_by_id(lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=404, detail="Урок не найден")
+
+    await check_lesson_access(lesson, current_user, course_repo, enrollment_repo)
+
+    progress = await ProgressRepository(db).complete_lesson(current_user["id"], lesson.id, lesson.course_id)
+    if progress is None:
+        raise HTTPException(status_code=403, detail="Вы не записаны на курс как студент")
+    return progress
+
 @router.post("/", response_model=LessonResponse, status_code=201)
 async def create_lesson(
     lesson_data: LessonCreate,
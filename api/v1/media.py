@@ -0,0 +1,111 @@
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from stat import S_ISREG
+from urllib.parse import quote
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.media_urls import verify_media_signature
+from services.upload_service import INCOMING_DIR
+from utils.http_cache import etag_matches
+
+router = APIRouter(prefix=settings.UPLOADS_URL, tags=["Media"], include_in_schema=False)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# <sha256> — загруженный файл, <sha256>_<ширина> — его производная (utils.images)
+_CONTENT_ADDRESSED_RE = re.compile(r"^[0-9a-f]{64}(_\d+)?$")
+
+_root = os.path.realpath(settings.UPLOADS_DIR)
+
+
+def _resolve(file_path: str) -> str:
+    """Путь внутри UPLOADS_DIR; выход за пределы каталога и скрытые папки запрещены"""
+    parts = Path(file_path).parts
+    if not parts or any(part.startswith(".") for part in parts) or INCOMING_DIR in parts:
+        raise HTTPException(status_code=404, detail="Файл не найден")
+
+    full_path = os.path.realpath(os.path.join(_root, file_path))
+    if not full_path.startswith(_root + os.sep):
+        raise HTTPException(status_code=404, detail="Файл не найден")
+    return full_path
+
+
+def _is_content_addressed(full_path: str) -> bool:
+    return bool(_CONTENT_ADDRESSED_RE.match(Path(full_path).stem))
+
+
+def _etag(full_path: str, stat_result: os.stat_result) -> str:
+    # У файлов, сохраненных по хэшу, имя определяется содержимым — strong ETag
+    if _is_content_addressed(full_path):
+        return f'"{Path(full_path).stem}"'
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def _is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match важнее If-Modified-Since (RFC 9110, 13.2.2)
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+@router.api_route("/{file_path:path}", methods=["GET", "HEAD"])
+async def get_media(file_path: str, request: Request):
+    """
+    Отдача загруженных файлов по подписанной ссылке (core.media_urls):
+    Range (перемотка видео), ETag/Last-Modified и 304.
+    Тело читается кусками (FileResponse) или через sendfile у nginx,
+    если задан MEDIA_ACCEL_REDIRECT_PREFIX.
+    """
+    # Подпись проверяется до обращения к диску и без запросов в БД
+    if settings.MEDIA_SIGNED_URLS and not verify_media_signature(
+        f"{settings.UPLOADS_URL}/{file_path}",
+        request.query_params.get("exp"),
+        request.query_params.get("uid"),
+        request.query_params.get("sig"),
+    ):
+        raise HTTPException(status_code=403, detail="Ссылка недействительна или устарела")
+
+    full_path = _resolve(file_path)
+    try:
+        stat_result = await run_in_threadpool(os.stat, full_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Файл не найден")
+    if not S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="Файл не найден")
+
+    etag = _etag(full_path, stat_result)
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": (
+            IMMUTABLE_CACHE_CONTROL
+            if _is_content_addressed(full_path)
+            else f"{'private' if settings.MEDIA_SIGNED_URLS else 'public'}, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+        ),
+    }
+
+    if _is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        relative_path = os.path.relpath(full_path, _root).replace(os.sep, "/")
+        headers["x-accel-redirect"] = f"{settings.MEDIA_ACCEL_REDIRECT_PREFIX}/{quote(relative_path)}"
+        return Response(headers=headers)
+
+    # FileResponse сам обрабатывает Range/If-Range и HEAD; при поддержке сервером
+    # расширения http.response.pathsend файл отдается без копирования в процесс
+    return FileResponse(full_path, stat_result=stat_result, headers=headers)
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.security import get_current_user
 from core.roles import UserRole
 from core.db import get_db
+from core.responses import PydanticJSONResponse
 
 from schemas import TaskResponse, TaskCreate, TaskUpdate
 from services import TaskService
@@ -30,12 +31,14 @@ async def get_tasks(
     
     # Администраторы и менеджеры видят все задания
     if role in (UserRole.ADMIN.value, UserRole.MANAGER.value):
-        return await service.get_all_tasks(course_id, user_id, assigned_to_user_id)
+        tasks = await service.get_all_tasks(course_id, user_id, assigned_to_user_id)
+        return PydanticJSONResponse(tasks, List[TaskResponse])
     
     # Тренеры видят задания своих курсов и свои задания
     if role == UserRole.TRAINER.value:
         # TODO: Добавить проверку через enrollment
-        return await service.get_all_tasks(course_id, current_user_id, assigned_to_user_id)
+        tasks = await service.get_all_tasks(course_id, current_user_id, assigned_to_user_id)
+        return PydanticJSONResponse(tasks, List[TaskResponse])
     
     # Студенты видят только назначенные им задания и свои созданные
     if role == UserRole.STUDENT.value:
@@ -45,9 +48,11 @@ async def get_tasks(
         if assigned_to_user_id is not None and assigned_to_user_id != current_user_id:
             raise HTTPException(status_code=403, detail="Недостаточно прав")
         # Показываем задания назначенные студенту или созданные им
-        return await service.get_all_tasks(course_id, current_user_id, current_user_id)
+        tasks = await service.get_all_tasks(course_id, current_user_id, current_user_id)
+        return PydanticJSONResponse(tasks, List[TaskResponse])
     
-    return await service.get_all_tasks(course_id, user_id, assigned_to_user_id)
+    tasks = await service.get_all_tasks(course_id, user_id, assigned_to_user_id)
+    return PydanticJSONResponse(tasks, List[TaskResponse])
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
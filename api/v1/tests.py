@@ -7,7 +7,9 @@ from core.roles import UserRole
 from core.db import get_db
 
 from schemas import TestResponse, TestCreate, TestUpdate, TestDetailResponse
-from services import TestService
+from schemas import TestSubmitRequest, TestSubmitResponse, TestAttemptResponse, TestItemAnalysisResponse
+from services import TestService, UserAnswerService, TestAttemptService, ItemAnalysisService
+from repositories.mock.enrollment_repository import EnrollmentRepository
 
 router = APIRouter(prefix="/tests", tags=["Tests"])
 
@@ -16,6 +18,16 @@ async def get_test_service(db: AsyncSession = Depends(get_db)) -> TestService:
     return TestService(db)
 
 
+async def _ensure_can_take_test(db: AsyncSession, test_id: int, current_user: dict) -> None:
+    """Студент может проходить только тесты курсов, на которые записан"""
+    if current_user["role"] != UserRole.STUDENT.value:
+        return
+    test = await TestService(db).get_test_by_id(test_id)
+    student_courses = await EnrollmentRepository(db).get_courses_for_student(current_user["id"])
+    if test.course_id not in student_courses:
+        raise HTTPException(status_code=403, detail="Вы не записаны на курс этого теста")
+
+
 @router.get("/", response_model=List[TestResponse])
 async def get_tests(
     course_id: Optional[int] = Query(None, description="Фильтр по курсу"),
@@ -36,6 +48,16 @@ async def get_tests(
     return await service.get_all_tests(course_id)
 
 
+@router.get("/attempts/my", response_model=List[TestAttemptResponse])
+async def get_my_attempts(
+    test_id: Optional[int] = Query(None, description="Фильтр по тесту"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Мои попытки и результаты по всем тестам"""
+    return await TestAttemptService(db).get_attempts(test_id=test_id, user_id=current_user["id"])
+
+
 @router.get("/{test_id}", response_model=TestResponse)
 async def get_test(
     test_id: int,
@@ -56,6 +78,78 @@ async def get_test_detail(
     return await service.get_test_detail(test_id)
 
 
+@router.post("/{test_id}/submit", response_model=TestSubmitResponse)
+async def submit_test(
+    test_id: int,
+    submission: TestSubmitRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Отправить ответы на весь тест одним запросом и завершить текущую попытку.
+    Если попытка не начата, она начинается автоматически (с проверкой лимита попыток);
+    для теста с ограничением по времени попытку нужно начать заранее, иначе 409.
+    """
+    await _ensure_can_take_test(db, test_id, current_user)
+    return await UserAnswerService(db).submit_test(test_id, current_user["id"], submission)
+
+
+@router.post("/{test_id}/attempts", response_model=TestAttemptResponse, status_code=201)
+async def start_attempt(
+    test_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Начать попытку (или вернуть текущую незавершенную); дедлайн — в deadline_at"""
+    await _ensure_can_take_test(db, test_id, current_user)
+    return await TestAttemptService(db).start_attempt(test_id, current_user["id"])
+
+
+@router.get("/{test_id}/attempts", response_model=List[TestAttemptResponse])
+async def get_test_attempts(
+    test_id: int,
+    user_id: Optional[int] = Query(None, description="Фильтр по пользователю"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Попытки теста с результатами (журнал оценок); студент видит только свои"""
+    role = current_user["role"]
+
+    if role == UserRole.STUDENT.value:
+        if user_id is not None and user_id != current_user["id"]:
+            raise HTTPException(status_code=403, detail="Недостаточно прав")
+        user_id = current_user["id"]
+    elif role == UserRole.TRAINER.value:
+        test = await TestService(db).get_test_by_id(test_id)
+        trainer_courses = await EnrollmentRepository(db).get_courses_for_trainer(current_user["id"])
+        if test.course_id not in trainer_courses:
+            raise HTTPException(status_code=403, detail="Вы не являетесь тренером курса")
+    elif role not in (UserRole.ADMIN.value, UserRole.MANAGER.value):
+        raise HTTPException(status_code=403, detail="Недостаточно прав")
+
+    return await TestAttemptService(db).get_attempts(test_id=test_id, user_id=user_id)
+
+
+@router.get("/{test_id}/item-analysis", response_model=TestItemAnalysisResponse)
+async def get_item_analysis(
+    test_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """Статистика по вопросам: трудность, дискриминация, выбор вариантов ответа"""
+    role = current_user["role"]
+
+    if role == UserRole.TRAINER.value:
+        test = await TestService(db).get_test_by_id(test_id)
+        trainer_courses = await EnrollmentRepository(db).get_courses_for_trainer(current_user["id"])
+        if test.course_id not in trainer_courses:
+            raise HTTPException(status_code=403, detail="Вы не являетесь тренером курса")
+    elif role not in (UserRole.ADMIN.value, UserRole.MANAGER.value):
+        raise HTTPException(status_code=403, detail="Недостаточно прав")
+
+    return await ItemAnalysisService(db).get_item_analysis(test_id)
+
+
 @router.post("/", response_model=TestResponse, status_code=201)
 async def create_test(
     test_data: TestCreate,
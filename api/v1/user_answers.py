@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.security import get_current_user
 from core.roles import UserRole
 from core.db import get_db
+from core.responses import PydanticJSONResponse
 
 from schemas import UserAnswerResponse, UserAnswerCreate, UserAnswerUpdate
-from services import UserAnswerService
+from services import UserAnswerService, ExportService
+from services.export_service import XLSX_MEDIA_TYPE, export_filename
+from repositories.mock.enrollment_repository import EnrollmentRepository
+from repositories.mock.test_repository import TestRepository
 
 router = APIRouter(prefix="/user-answers", tags=["UserAnswers"])
 
@@ -30,17 +35,71 @@ async def get_user_answers(
     
     # Администраторы и менеджеры видят все ответы
     if role in (UserRole.ADMIN.value, UserRole.MANAGER.value):
-        return await service.get_all_user_answers(user_id, question_id, test_id)
+        answers = await service.get_all_user_answers(user_id, question_id, test_id)
+        return PydanticJSONResponse(answers, List[UserAnswerResponse])
     
     # Тренеры видят ответы только на свои тесты
     # Студенты видят только свои ответы
     if role == UserRole.STUDENT.value:
         if user_id is not None and user_id != current_user_id:
             raise HTTPException(status_code=403, detail="Недостаточно прав")
-        return await service.get_all_user_answers(current_user_id, question_id, test_id)
+        answers = await service.get_all_user_answers(current_user_id, question_id, test_id)
+        return PydanticJSONResponse(answers, List[UserAnswerResponse])
     
     # Тренеры - TODO: Добавить проверку через enrollment
-    return await service.get_all_user_answers(user_id, question_id, test_id)
+    answers = await service.get_all_user_answers(user_id, question_id, test_id)
+    return PydanticJSONResponse(answers, List[UserAnswerResponse])
+
+
+@router.get("/export")
+async def export_user_answers(
+    format: Literal["csv", "xlsx"] = Query("csv", description="Формат выгрузки"),
+    user_id: Optional[int] = Query(None, description="Фильтр по пользователю"),
+    test_id: Optional[int] = Query(None, description="Фильтр по тесту"),
+    course_id: Optional[int] = Query(None, description="Фильтр по курсу"),
+    company_id: Optional[int] = Query(None, description="Фильтр по компании"),
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Потоковая выгрузка ответов пользователей (CSV или XLSX) вместе с данными
+    пользователя, теста, текстом вопроса и выбранного ответа.
+    Тренер выгружает только ответы по своим курсам (нужен course_id или test_id).
+    """
+    role = current_user["role"]
+
+    if role == UserRole.TRAINER.value:
+        target_course_id = course_id
+        if test_id is not None:
+            test = await TestRepository(db).get_by_id(test_id)
+            if not test:
+                raise HTTPException(status_code=404, detail="Тест не найден")
+            if course_id is not None and course_id != test.course_id:
+                raise HTTPException(status_code=400, detail="Тест не относится к этому курсу")
+            target_course_id = test.course_id
+        if target_course_id is None:
+            raise HTTPException(status_code=400, detail="Укажите course_id или test_id")
+
+        trainer_courses = await EnrollmentRepository(db).get_courses_for_trainer(current_user["id"])
+        if target_course_id not in trainer_courses:
+            raise HTTPException(status_code=403, detail="Вы не являетесь тренером курса")
+        course_id = target_course_id
+    elif role not in (UserRole.ADMIN.value, UserRole.MANAGER.value):
+        raise HTTPException(status_code=403, detail="Недостаточно прав")
+
+    export = ExportService(user_id=user_id, test_id=test_id, course_id=course_id, company_id=company_id)
+
+    if format == "xlsx":
+        body, media_type = export.stream_xlsx(), XLSX_MEDIA_TYPE
+    else:
+        body, media_type = export.stream_csv(), "text/csv; charset=utf-8"
+
+    filename = export_filename("user_answers", format)
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{user_answer_id}", response_model=UserAnswerResponse)
@@ -1,16 +1,29 @@
-from typing import List, Optional
+import codecs
+import csv
+import json
+import tempfile
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from fastapi import APIRouter, Query, HTTPException, Depends, Request
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.db import get_db
-from schemas.users import UserCreate, UserResponse, UserUpdate
+from schemas.users import UserBulkCreateResponse, UserCreate, UserResponse, UserUpdate
 from services.user_service import user_service
+from repositories.mock.user_repository import UserRepository
 from core.security import get_current_user
 from core.roles import UserRole
+from core.responses import PydanticJSONResponse
+from utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, encode_cursor
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Ограничение на число строк в одном POST /users/bulk
+BULK_MAX_ROWS = 20000
+# CSV держим в памяти до этого размера, дальше — во временном файле
+_CSV_SPOOL_BYTES = 4 * 1024 * 1024
+
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
     search: Optional[str] = Query(None, description="Поиск по ФИО, логину или email"),
@@ -19,40 +32,38 @@ async def get_users(
     company_id: Optional[int] = Query(None, description="Фильтр по компании"),
     department_id: Optional[int] = Query(None, description="Фильтр по отделу"),
     position_id: Optional[int] = Query(None, description="Фильтр по должности"),
+    scope: Optional[Literal["my-students"]] = Query(None, description="my-students — студенты курсов текущего тренера"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
-    users = await user_service.get_visible_users(db, current_user)
-
-    if search:
-        s = search.lower()
-        users = [
-            u for u in users
-            if s in (u.get("first_name") or "").lower()
-            or s in (u.get("last_name") or "").lower()
-            or s in (u.get("login") or "").lower()
-            or s in (u.get("email") or "").lower()
-        ]
-
-    # Фильтрация по роли (title) - приоритетный способ
+    role_titles = None
     if role:
         role_titles = [r.strip().lower() for r in role.split(",") if r.strip()]
-        users = [
-            u for u in users
-            if u.get("role") and u.get("role").lower() in role_titles
-        ]
-    # Фильтрация по role_id (для обратной совместимости)
-    elif role_id is not None:
-        users = [u for u in users if u.get("role_id") == role_id]
 
-    if company_id is not None:
-        users = [u for u in users if u.get("company_id") == company_id]
-    if department_id is not None:
-        users = [u for u in users if u.get("department_id") == department_id]
-    if position_id is not None:
-        users = [u for u in users if u.get("position_id") == position_id]
+    users, total = await user_service.list_users(
+        db,
+        current_user,
+        search=search,
+        role_titles=role_titles,
+        role_id=role_id,
+        company_id=company_id,
+        department_id=department_id,
+        position_id=position_id,
+        scope=scope,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
+
+    headers = {TOTAL_COUNT_HEADER: str(total)}
+    if len(users) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(users[-1]["id"])
 
-    return users
+    # dict из репозитория: одна валидация по UserResponse и сразу байты JSON
+    return PydanticJSONResponse.validated(users, List[UserResponse], headers=headers)
 
 
 @router.post("/", response_model=UserResponse, status_code=201)
@@ -65,8 +76,120 @@ async def create_user(
     return await user_service.create_user(db, user_in.model_dump(), current_user)
 
 
+def _validation_detail(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" if err["loc"] else err["msg"]
+        for err in e.errors()
+    )
+
+
+def _validate_bulk_rows(
+    items: List[Tuple[int, Any]],
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Построчная валидация UserCreate: (валидные строки, ошибки)"""
+    if len(items) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Не больше {BULK_MAX_ROWS} пользователей за запрос")
+
+    rows: List[Tuple[int, Dict[str, Any]]] = []
+    errors: List[Dict[str, Any]] = []
+    for row_no, item in items:
+        if not isinstance(item, dict):
+            errors.append({"row": row_no, "detail": "Ожидается объект пользователя"})
+            continue
+        try:
+            rows.append((row_no, UserCreate.model_validate(item).model_dump()))
+        except ValidationError as e:
+            login, email = item.get("login"), item.get("email")
+            errors.append({
+                "row": row_no,
+                "login": str(login) if login is not None else None,
+                "email": str(email) if email is not None else None,
+                "detail": _validation_detail(e),
+            })
+    return rows, errors
+
+
+async def _read_csv_rows(request: Request) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Читает CSV из тела запроса потоком (первая строка — заголовки, поля UserCreate).
+    Пустые ячейки считаются незаполненными полями.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    with tempfile.SpooledTemporaryFile(max_size=_CSV_SPOOL_BYTES, mode="w+", encoding="utf-8", newline="") as buf:
+        try:
+            async for chunk in request.stream():
+                buf.write(decoder.decode(chunk))
+            buf.write(decoder.decode(b"", final=True))
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV должен быть в кодировке UTF-8")
+        buf.seek(0)
+
+        items: List[Tuple[int, Dict[str, Any]]] = []
+        try:
+            for row_no, record in enumerate(csv.DictReader(buf), start=1):
+                items.append((
+                    row_no,
+                    {
+                        key.strip(): value.strip()
+                        for key, value in record.items()
+                        if key and isinstance(value, str) and value.strip()
+                    },
+                ))
+                if len(items) > BULK_MAX_ROWS:
+                    break
+        except csv.Error as e:
+            raise HTTPException(status_code=400, detail=f"Некорректный CSV: {e}")
+        return items
+
+
+@router.post("/bulk", response_model=UserBulkCreateResponse)
+async def bulk_create_users(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Массовое создание пользователей.
+
+    Тело — JSON-массив объектов UserCreate (Content-Type: application/json)
+    или CSV с заголовком (Content-Type: text/csv). Ошибочные строки
+    пропускаются и возвращаются в errors с номером строки (с 1).
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in ("text/csv", "application/csv"):
+        items = await _read_csv_rows(request)
+    elif content_type in ("", "application/json"):
+        try:
+            payload = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Некорректный JSON")
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=400, detail="Ожидается JSON-массив пользователей")
+        items = list(enumerate(payload, start=1))
+    else:
+        raise HTTPException(status_code=415, detail="Поддерживаются application/json и text/csv")
+
+    rows, errors = _validate_bulk_rows(items)
+    result = await user_service.bulk_create_users(db, rows, current_user)
+
+    if errors:
+        result["errors"] = sorted(result["errors"] + errors, key=lambda e: e["row"])
+        result["error_count"] = len(result["errors"])
+    return result
+
+
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: dict = Depends(get_current_user)):
+async def get_me(
+    db: AsyncSession = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    # В режиме AUTH_TRUST_TOKEN_CLAIMS current_user содержит только id/role/role_id
+    if current_user.get("login") is None:
+        user = await UserRepository(db).get_by_id(current_user["id"])
+        if not user:
+            raise HTTPException(status_code=404, detail="Пользователь не найден")
+        return user
     return current_user
 
 
@@ -22,6 +22,13 @@ DATABASE_URL_SYNC = os.getenv(
     f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}",
 )
 
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 def get_ip_address() -> str:
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
@@ -40,11 +47,76 @@ class Settings:
 
     STATIC_URL: str = "/static"
     UPLOADS_URL: str = "/uploads"
+    # Каталог загруженных файлов (подпапки по категориям: videos, pdfs, ...)
+    UPLOADS_DIR: str = os.getenv("UPLOADS_DIR", "uploads")
+    # Максимальный размер загружаемого файла, байт (0 — без ограничения)
+    UPLOAD_MAX_BYTES: int = int(os.getenv("UPLOAD_MAX_BYTES", str(2 * 1024 ** 3)))
+    # Сколько байт копится в памяти перед записью на диск
+    UPLOAD_WRITE_BUFFER_BYTES: int = int(os.getenv("UPLOAD_WRITE_BUFFER_BYTES", str(1024 ** 2)))
+    # Cache-Control max-age для медиа без хэша в имени (файлы по хэшу кэшируются навсегда)
+    MEDIA_CACHE_MAX_AGE: int = int(os.getenv("MEDIA_CACHE_MAX_AGE", "3600"))
+    # internal-location nginx с alias на UPLOADS_DIR, например /_uploads_internal.
+    # Если задан, файл отдает nginx (sendfile) по заголовку X-Accel-Redirect
+    MEDIA_ACCEL_REDIRECT_PREFIX: str = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "").rstrip("/")
+    # Производные изображений курсов (WebP/JPEG по ширинам + размытое превью)
+    IMAGE_DERIVATIVE_WIDTHS: list = [
+        int(w) for w in os.getenv("IMAGE_DERIVATIVE_WIDTHS", "320,640,1280").split(",") if w.strip()
+    ]
+    IMAGE_DERIVATIVE_QUALITY: int = int(os.getenv("IMAGE_DERIVATIVE_QUALITY", "80"))
+    # Процессы для ресайза (Pillow держит GIL на части операций, поэтому процессы, а не потоки)
+    IMAGE_WORKERS: int = int(os.getenv("IMAGE_WORKERS", str(min(2, os.cpu_count() or 1))))
+    IMAGE_MANIFEST_CACHE_TTL_SECONDS: int = int(os.getenv("IMAGE_MANIFEST_CACHE_TTL_SECONDS", "300"))
+    IMAGE_MANIFEST_CACHE_MAX_SIZE: int = int(os.getenv("IMAGE_MANIFEST_CACHE_MAX_SIZE", "5000"))
+    # Подписанные (HMAC) ссылки на /uploads с ограниченным сроком действия
+    MEDIA_SIGNED_URLS: bool = _env_bool("MEDIA_SIGNED_URLS", True)
+    # Пустой ключ — используется SECRET_KEY
+    MEDIA_SIGNING_KEY: str = os.getenv("MEDIA_SIGNING_KEY", "")
+    MEDIA_URL_TTL_SECONDS: int = int(os.getenv("MEDIA_URL_TTL_SECONDS", str(6 * 60 * 60)))
+    # Шаг округления срока действия: в пределах шага ссылка не меняется и кэшируется
+    MEDIA_URL_BUCKET_SECONDS: int = int(os.getenv("MEDIA_URL_BUCKET_SECONDS", str(60 * 60)))
 
     SECRET_KEY: str = os.getenv("SECRET_KEY", "change-me-in-production-1234567890")
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
 
+    # Кэш пользователя для get_current_user (0 — кэш выключен)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    PRINCIPAL_CACHE_MAX_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+    # Доверять role/role_id из JWT и не ходить в БД за пользователем.
+    # Отзыв токенов при изменении пользователя хранится в памяти процесса,
+    # поэтому включать только при запуске в один воркер
+    AUTH_TRUST_TOKEN_CLAIMS: bool = _env_bool("AUTH_TRUST_TOKEN_CLAIMS", False)
+
+    # Сколько bcrypt-хэширований/проверок выполняется параллельно (в отдельных потоках)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+    # Кэш ключей ответов тестов для проверки ответов (0 — кэш выключен)
+    ANSWER_KEY_CACHE_TTL_SECONDS: int = int(os.getenv("ANSWER_KEY_CACHE_TTL_SECONDS", "300"))
+    ANSWER_KEY_CACHE_MAX_TESTS: int = int(os.getenv("ANSWER_KEY_CACHE_MAX_TESTS", "1000"))
+
+    # Кэш анализа заданий теста (пересчитывается при появлении новых ответов)
+    ITEM_ANALYSIS_CACHE_TTL_SECONDS: int = int(os.getenv("ITEM_ANALYSIS_CACHE_TTL_SECONDS", "600"))
+    ITEM_ANALYSIS_CACHE_MAX_TESTS: int = int(os.getenv("ITEM_ANALYSIS_CACHE_MAX_TESTS", "256"))
+
+    # Кэш содержимого курсов для /courses/{id} и /courses/{id}/content
+    COURSE_CONTENT_CACHE_TTL_SECONDS: int = int(os.getenv("COURSE_CONTENT_CACHE_TTL_SECONDS", "600"))
+    COURSE_CONTENT_CACHE_MAX_COURSES: int = int(os.getenv("COURSE_CONTENT_CACHE_MAX_COURSES", "500"))
+
+    # Запас времени на сдачу теста после дедлайна попытки (сетевые задержки)
+    TEST_SUBMIT_GRACE_SECONDS: int = int(os.getenv("TEST_SUBMIT_GRACE_SECONDS", "30"))
+
+    # Пул соединений с БД (на один воркер)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Пересоздавать соединения старше N секунд (-1 — не пересоздавать)
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # Проверка соединения (SELECT 1) при каждой выдаче из пула
+    DB_POOL_PRE_PING: bool = _env_bool("DB_POOL_PRE_PING", True)
+    # LIFO держит "горячими" несколько соединений, остальные закрываются по recycle;
+    # в паре с DB_POOL_PRE_PING=false убирает лишний round-trip на checkout
+    DB_POOL_USE_LIFO: bool = _env_bool("DB_POOL_USE_LIFO", False)
+
 class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
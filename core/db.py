@@ -1,8 +1,70 @@
+import threading
+import time
+
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.config import DATABASE_URL_ASYNC, settings
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, который дополнительно считает время получения
+    соединения (ожидание свободного или открытие нового) и число таймаутов.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
 
-from core.config import DATABASE_URL_ASYNC
-engine = create_async_engine(DATABASE_URL_ASYNC, pool_pre_ping=True)
+    def stats(self) -> dict:
+        with self._stats_lock:
+            checkouts = self.checkouts
+            return {
+                "pool_size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "timeout_seconds": self._timeout,
+                "checkouts_total": checkouts,
+                "timeouts_total": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+engine = create_async_engine(
+    DATABASE_URL_ASYNC,
+    poolclass=InstrumentedPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_use_lifo=settings.DB_POOL_USE_LIFO,
+)
 
 SessionLocal = async_sessionmaker(
     bind=engine,
@@ -12,6 +74,16 @@ SessionLocal = async_sessionmaker(
 )
 Base = declarative_base()
 
+
+def get_pool_stats() -> dict:
+    """Текущее состояние пула соединений engine (для /health/db)"""
+    pool = engine.pool
+    stats = pool.stats() if isinstance(pool, InstrumentedPool) else {"status": pool.status()}
+    stats["pre_ping"] = settings.DB_POOL_PRE_PING
+    stats["use_lifo"] = settings.DB_POOL_USE_LIFO
+    return stats
+
+
 async def get_db() -> AsyncSession:
     async with SessionLocal() as db:
         yield db
@@ -0,0 +1,114 @@
+# core/media_urls.py
+import base64
+import hashlib
+import hmac
+import time
+from contextvars import ContextVar
+from typing import Optional, Tuple
+from urllib.parse import urlencode
+
+from core.config import settings
+
+# Пользователь текущего запроса: выставляется в get_current_user,
+# чтобы сервисы подписывали ссылки на медиа без передачи user_id по цепочке вызовов
+media_viewer_id: ContextVar[Optional[int]] = ContextVar("media_viewer_id", default=None)
+
+_signing_key = hashlib.sha256(
+    f"media-url:{settings.MEDIA_SIGNING_KEY or settings.SECRET_KEY}".encode("utf-8")
+).digest()
+
+
+def set_media_viewer(user_id: Optional[int]) -> None:
+    media_viewer_id.set(user_id)
+
+
+def _signature(path: str, expires: int, user_id: int) -> str:
+    message = f"{path}\n{expires}\n{user_id}".encode("utf-8")
+    digest = hmac.new(_signing_key, message, hashlib.sha256).digest()
+    # 128 бит подписи достаточно, ссылка остается короткой
+    return base64.urlsafe_b64encode(digest[:16]).decode("ascii").rstrip("=")
+
+
+def _expires_at(now: Optional[float] = None) -> int:
+    """
+    Срок действия округляется вверх до MEDIA_URL_BUCKET_SECONDS: в пределах одного
+    интервала ссылка на файл не меняется, и браузер/CDN переиспользуют кэш.
+    Ссылка живет от MEDIA_URL_TTL_SECONDS до TTL + bucket.
+    """
+    now = time.time() if now is None else now
+    bucket = max(settings.MEDIA_URL_BUCKET_SECONDS, 1)
+    return -(-int(now + settings.MEDIA_URL_TTL_SECONDS) // bucket) * bucket
+
+
+def sign_media_path(path: str, user_id: int, now: Optional[float] = None) -> str:
+    """Путь /uploads/... с параметрами exp, uid, sig"""
+    expires = _expires_at(now)
+    query = urlencode({"exp": expires, "uid": user_id, "sig": _signature(path, expires, user_id)})
+    return f"{path}?{query}"
+
+
+def verify_media_signature(
+    path: str,
+    expires: Optional[str],
+    user_id: Optional[str],
+    signature: Optional[str],
+    now: Optional[float] = None,
+) -> bool:
+    """Проверка подписи ссылки — только CPU, без обращения к БД"""
+    if not (expires and user_id and signature):
+        return False
+    try:
+        expires_int, user_id_int = int(expires), int(user_id)
+    except ValueError:
+        return False
+
+    if expires_int < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(_signature(path, expires_int, user_id_int), signature)
+
+
+def relative_media_url(url: Optional[str]) -> Optional[str]:
+    """
+    Обратное к absolute_media_url: полный URL сервера -> путь /uploads/... или /static/...
+    без параметров подписи. Клиент может прислать обратно ссылку из ответа,
+    а в БД должен попасть путь, у которого не истекает срок действия.
+    """
+    if not url or not url.startswith(settings.SERVER_URL + "/"):
+        return url
+    path = url[len(settings.SERVER_URL):]
+    if path.startswith(settings.UPLOADS_URL + "/"):
+        return path.split("?", 1)[0]
+    return path if path.startswith(settings.STATIC_URL + "/") else url
+
+
+def media_url_scope() -> Optional[Tuple[int, int]]:
+    """
+    От чего зависят подписанные ссылки в ответе: (пользователь, срок действия).
+    Входит в ETag ответов со ссылками на /uploads — при смене интервала
+    ссылки меняются, и клиент получает новое тело вместо 304.
+    """
+    viewer_id = media_viewer_id.get()
+    if not settings.MEDIA_SIGNED_URLS or viewer_id is None:
+        return None
+    return viewer_id, _expires_at()
+
+
+def absolute_media_url(url: Optional[str]) -> Optional[str]:
+    """
+    Относительный путь /uploads/... или /static/... -> полный URL сервера.
+    Файлы /uploads подписываются для текущего пользователя (если MEDIA_SIGNED_URLS).
+    Идемпотентна: полные URL и пустые значения возвращаются как есть.
+    """
+    if not url:
+        return url
+
+    if url.startswith(settings.UPLOADS_URL + "/"):
+        viewer_id = media_viewer_id.get()
+        if settings.MEDIA_SIGNED_URLS and viewer_id is not None and "?" not in url:
+            url = sign_media_path(url, viewer_id)
+        return f"{settings.SERVER_URL}{url}"
+
+    if url.startswith(settings.STATIC_URL + "/"):
+        return f"{settings.SERVER_URL}{url}"
+
+    return url
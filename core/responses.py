@@ -0,0 +1,48 @@
+# core/responses.py
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+
+
+@lru_cache(maxsize=256)
+def get_type_adapter(type_: Any) -> TypeAdapter:
+    """TypeAdapter строится один раз на тип (сборка схемы pydantic-core дорогая)"""
+    return TypeAdapter(type_)
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON-ответ, который кодирует pydantic-core (TypeAdapter.dump_json) прямо в байты.
+
+    Обычный путь FastAPI для response_model: model_dump -> повторная валидация ->
+    dict -> json.dumps. Здесь уже провалидированные модели сериализуются один раз,
+    без промежуточных dict и без стандартного json. field_serializer(when_used="json")
+    (например, полные URL медиа) срабатывают как обычно.
+
+    Возвращенный Response FastAPI не валидирует, поэтому content должен
+    соответствовать type_: модели этого типа. Для dict из репозиториев —
+    PydanticJSONResponse.validated(...), чтобы лишние ключи не попали в ответ.
+    response_model в декораторе оставляем — он нужен для OpenAPI.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        type_: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        self.adapter = get_type_adapter(type_)
+        super().__init__(content, status_code=status_code, headers=headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        return self.adapter.dump_json(content)
+
+    @classmethod
+    def validated(cls, content: Any, type_: Any, **kwargs: Any) -> "PydanticJSONResponse":
+        """Валидирует content (dict, ORM-объекты) по type_ и отдает результат"""
+        return cls(get_type_adapter(type_).validate_python(content, from_attributes=True), type_, **kwargs)
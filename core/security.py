@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 
@@ -7,17 +9,70 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.cache import TTLCache
 from core.config import settings
 from core.db import get_db
+from core.media_urls import set_media_viewer
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt отпускает GIL, поэтому потоки дают реальный параллелизм;
+# размер пула ограничивает, сколько ядер уходит на хэширование
+_password_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.PASSWORD_HASH_WORKERS),
+    thread_name_prefix="password-hash",
+)
+
 SECRET_KEY: str = settings.SECRET_KEY
 ALGORITHM: str = settings.JWT_ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
 bearer_scheme = HTTPBearer(auto_error=True)
 
+# Кэш пользователей по user_id, чтобы не ходить в БД на каждый запрос
+principal_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Время последнего изменения пользователя: токены, выданные раньше,
+# не используются в режиме доверия claims (храним не дольше жизни токена).
+# Хранится в памяти процесса: другие воркеры об изменении не узнают,
+# поэтому AUTH_TRUST_TOKEN_CLAIMS допустим только при одном воркере.
+_principal_changed_at: TTLCache[float] = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Сбросить закэшированного пользователя (вызывается при изменении/удалении)"""
+    user_id = int(user_id)
+    principal_cache.invalidate(user_id)
+    _principal_changed_at.set(user_id, datetime.now(timezone.utc).timestamp())
+
+
+def _principal_from_claims(user_id: int, payload: Dict[str, Any]) -> Dict[str, Any] | None:
+    """
+    Собирает пользователя из claims токена (role/role_id кладет /auth/login).
+    Возвращает None, если claims неполные или пользователь менялся после выдачи токена.
+    """
+    if not payload.get("role"):
+        return None
+
+    # iat в токене — целые секунды, поэтому сравниваем с той же точностью;
+    # токен, выданный в ту же секунду, что и изменение, тоже не доверяем
+    changed_at = _principal_changed_at.get(user_id)
+    issued_at = payload.get("iat")
+    if changed_at is not None and (issued_at is None or issued_at <= int(changed_at)):
+        return None
+
+    return {
+        "id": user_id,
+        "role_id": payload.get("role_id"),
+        "role": payload.get("role"),
+    }
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -27,6 +82,18 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+async def hash_password_async(password: str) -> str:
+    """hash_password в пуле потоков — не блокирует event loop на время bcrypt"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """verify_password в пуле потоков — не блокирует event loop на время bcrypt"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain, hashed)
+
+
 def create_access_token(
     data: Dict[str, Any],
     expires_delta: timedelta | None = None
@@ -34,8 +101,9 @@ def create_access_token(
     to_encode = data.copy()
     if expires_delta is None:
         expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    expire = datetime.now(timezone.utc) + expires_delta
-    to_encode.update({"exp": expire})
+    now = datetime.now(timezone.utc)
+    expire = now + expires_delta
+    to_encode.update({"exp": expire, "iat": int(now.timestamp())})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -58,12 +126,26 @@ async def get_current_user(
         user_id = payload.get("user_id")
         if user_id is None:
             raise credentials_exception
-    except JWTError:
+        user_id = int(user_id)
+    except (JWTError, TypeError, ValueError):
         raise credentials_exception
 
+    # Ссылки на медиа в ответе подписываются для этого пользователя
+    set_media_viewer(user_id)
+
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
+
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        principal = _principal_from_claims(user_id, payload)
+        if principal is not None:
+            return principal
+
     repo = UserRepository(db)
-    user = await repo.get_by_id(int(user_id))
+    user = await repo.get_by_id(user_id)
     if user is None:
         raise credentials_exception
 
-    return user
+    principal_cache.set(user_id, user)
+    return dict(user)
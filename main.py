@@ -1,9 +1,11 @@
 import os
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import text
 from core.config import settings
 
 from api.v1.courses import router as courses_router
@@ -20,7 +22,11 @@ from api.v1.answers import router as answers_router
 from api.v1.user_answers import router as user_answers_router
 from api.v1.tasks import router as tasks_router
 from api.v1.materials import router as materials_router
-from core.db import Base, engine
+from api.v1.files import router as files_router
+from api.v1.media import router as media_router
+from core.db import Base, engine, get_pool_stats
+from services.image_service import shutdown_image_pool
+from utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
 
 app = FastAPI(
     title="Course Platform API",
@@ -45,21 +51,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
 )
 
 
-for dir_name in ["static", "uploads"]:
+for dir_name in ["static", settings.UPLOADS_DIR]:
     os.makedirs(dir_name, exist_ok=True)
 
 # Создаем структуру подпапок для uploads
 uploads_subdirs = ["docs", "photos", "videos", "pdfs", "audio", "other"]
 for subdir in uploads_subdirs:
-    uploads_subdir_path = os.path.join("uploads", subdir)
+    uploads_subdir_path = os.path.join(settings.UPLOADS_DIR, subdir)
     os.makedirs(uploads_subdir_path, exist_ok=True)
 
 app.mount(settings.STATIC_URL, StaticFiles(directory="static"), name="static")
-print(settings.UPLOADS_URL, "<<<<<<<<<<<<< MY UPLOADS URL")
-app.mount(settings.UPLOADS_URL, StaticFiles(directory="/home/vrgrag/sdo-new/uploads"), name="uploads")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 @app.on_event("startup")
@@ -68,6 +73,10 @@ async def init_db():
         await conn.run_sync(Base.metadata.create_all)
 
 
+@app.on_event("shutdown")
+async def stop_image_pool():
+    shutdown_image_pool()
+
 
 app.include_router(courses_router, tags=["Courses"])
 app.include_router(lessons_router, tags=["Lessons"])
@@ -83,6 +92,8 @@ app.include_router(answers_router, tags=["Answers"])
 app.include_router(user_answers_router, tags=["UserAnswers"])
 app.include_router(tasks_router, tags=["Tasks"])
 app.include_router(materials_router, tags=["Materials"])
+app.include_router(files_router)
+app.include_router(media_router)
 @app.get("/", include_in_schema=False)
 async def root():
     return {
@@ -107,6 +118,25 @@ async def health_check():
     }
 
 
+@app.get("/health/db", include_in_schema=False)
+async def health_db():
+    healthy = True
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception:
+        healthy = False
+
+    # 503, чтобы балансировщик и probes видели недоступность БД
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={
+            "status": "healthy" if healthy else "unhealthy",
+            "pool": get_pool_stats(),
+        },
+    )
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("🌐 API ДОСТУПНО ПО АДРЕСУ:")
@@ -15,6 +15,16 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Индексы, которые есть только в миграциях (trigram-индексы users требуют pg_trgm
+# и не описаны в моделях, чтобы create_all работал без расширения)
+MIGRATION_ONLY_INDEXES = {
+    f"ix_users_{column}_trgm" for column in ("first_name", "last_name", "login", "email")
+}
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    return not (type_ == "index" and reflected and name in MIGRATION_ONLY_INDEXES)
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
@@ -24,6 +34,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -42,6 +53,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,27 @@
+"""attendance_user_index
+
+Revision ID: 0eee3a2481b6
+Revises: af6d66f5e71c
+Create Date: 2026-10-17 18:25:07.340916
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0eee3a2481b6'
+down_revision: Union[str, Sequence[str], None] = 'af6d66f5e71c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_attendance_user_id_event_id', 'attendance', ['user_id', 'event_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_attendance_user_id_event_id', table_name='attendance')
@@ -0,0 +1,28 @@
+"""user_answer_updated_at
+
+Revision ID: 3b6ad91e8e80
+Revises: 5acefd72c846
+Create Date: 2026-10-17 19:37:16.284051
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b6ad91e8e80'
+down_revision: Union[str, Sequence[str], None] = '5acefd72c846'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_answer', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_answer', 'updated_at')
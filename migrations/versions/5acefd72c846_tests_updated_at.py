@@ -0,0 +1,28 @@
+"""tests_updated_at
+
+Revision ID: 5acefd72c846
+Revises: 0eee3a2481b6
+Create Date: 2026-10-17 19:04:52.713385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5acefd72c846'
+down_revision: Union[str, Sequence[str], None] = '0eee3a2481b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tests', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tests', 'updated_at')
@@ -0,0 +1,46 @@
+"""users_search_indexes
+
+Revision ID: 93033a1f3360
+Revises: f3234635d239
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '93033a1f3360'
+down_revision: Union[str, Sequence[str], None] = 'f3234635d239'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRGM_COLUMNS = ('first_name', 'last_name', 'login', 'email')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_users_{column}_trgm',
+            'users',
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+    op.create_index(op.f('ix_users_company_id'), 'users', ['company_id'], unique=False)
+    op.create_index(op.f('ix_users_department_id'), 'users', ['department_id'], unique=False)
+    op.create_index(op.f('ix_users_position_id'), 'users', ['position_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_users_position_id'), table_name='users')
+    op.drop_index(op.f('ix_users_department_id'), table_name='users')
+    op.drop_index(op.f('ix_users_company_id'), table_name='users')
+    for column in reversed(TRGM_COLUMNS):
+        op.drop_index(f'ix_users_{column}_trgm', table_name='users')
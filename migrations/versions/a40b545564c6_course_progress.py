@@ -0,0 +1,55 @@
+"""course_progress
+
+Revision ID: a40b545564c6
+Revises: bbd355f8d125
+Create Date: 2026-10-17 16:05:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a40b545564c6'
+down_revision: Union[str, Sequence[str], None] = 'bbd355f8d125'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('lesson_completions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('lesson_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'lesson_id', name='uq_lesson_completion_user_lesson')
+    )
+    op.create_index('ix_lesson_completions_user_id_course_id', 'lesson_completions', ['user_id', 'course_id'], unique=False)
+    op.create_index('ix_lesson_completions_lesson_id', 'lesson_completions', ['lesson_id'], unique=False)
+    op.add_column('course_enrollments', sa.Column('completed_lessons', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('course_enrollments', sa.Column('progress_percentage', sa.Float(), server_default=sa.text('0'), nullable=False))
+    op.add_column('course_enrollments', sa.Column('current_lesson_id', sa.Integer(), nullable=True))
+    op.add_column('course_enrollments', sa.Column('last_activity_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('course_enrollments', sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_foreign_key('course_enrollments_current_lesson_id_fkey', 'course_enrollments', 'lessons', ['current_lesson_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('course_enrollments_current_lesson_id_fkey', 'course_enrollments', type_='foreignkey')
+    op.drop_column('course_enrollments', 'completed_at')
+    op.drop_column('course_enrollments', 'last_activity_at')
+    op.drop_column('course_enrollments', 'current_lesson_id')
+    op.drop_column('course_enrollments', 'progress_percentage')
+    op.drop_column('course_enrollments', 'completed_lessons')
+    op.drop_index('ix_lesson_completions_lesson_id', table_name='lesson_completions')
+    op.drop_index('ix_lesson_completions_user_id_course_id', table_name='lesson_completions')
+    op.drop_table('lesson_completions')
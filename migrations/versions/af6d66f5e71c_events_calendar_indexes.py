@@ -0,0 +1,31 @@
+"""events_calendar_indexes
+
+Revision ID: af6d66f5e71c
+Revises: a40b545564c6
+Create Date: 2026-10-17 17:42:31.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'af6d66f5e71c'
+down_revision: Union[str, Sequence[str], None] = 'a40b545564c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_events_company_id_start_date_start_time', 'events', ['company_id', 'start_date', 'start_time'], unique=False)
+    op.create_index('ix_events_trainer_id_start_date_start_time', 'events', ['trainer_id', 'start_date', 'start_time'], unique=False)
+    op.create_index('ix_events_start_date_start_time', 'events', ['start_date', 'start_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_start_date_start_time', table_name='events')
+    op.drop_index('ix_events_trainer_id_start_date_start_time', table_name='events')
+    op.drop_index('ix_events_company_id_start_date_start_time', table_name='events')
@@ -0,0 +1,54 @@
+"""test_attempts
+
+Revision ID: bbd355f8d125
+Revises: d3b551b073cb
+Create Date: 2026-10-17 14:22:41.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bbd355f8d125'
+down_revision: Union[str, Sequence[str], None] = 'd3b551b073cb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('test_attempts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('test_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('deadline_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('score', sa.Float(), nullable=True),
+    sa.Column('correct_answers', sa.Integer(), nullable=True),
+    sa.Column('total_questions', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['test_id'], ['tests.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_test_attempts_user_id_test_id', 'test_attempts', ['user_id', 'test_id'], unique=False)
+    op.create_index('ix_test_attempts_test_id_user_id', 'test_attempts', ['test_id', 'user_id'], unique=False)
+    op.create_index('uq_test_attempts_in_progress', 'test_attempts', ['user_id', 'test_id'], unique=True, postgresql_where=sa.text("status = 'in_progress'"))
+    op.add_column('user_answer', sa.Column('attempt_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_user_answer_attempt_id'), 'user_answer', ['attempt_id'], unique=False)
+    op.create_foreign_key('user_answer_attempt_id_fkey', 'user_answer', 'test_attempts', ['attempt_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('user_answer_attempt_id_fkey', 'user_answer', type_='foreignkey')
+    op.drop_index(op.f('ix_user_answer_attempt_id'), table_name='user_answer')
+    op.drop_column('user_answer', 'attempt_id')
+    op.drop_index('uq_test_attempts_in_progress', table_name='test_attempts')
+    op.drop_index('ix_test_attempts_test_id_user_id', table_name='test_attempts')
+    op.drop_index('ix_test_attempts_user_id_test_id', table_name='test_attempts')
+    op.drop_table('test_attempts')
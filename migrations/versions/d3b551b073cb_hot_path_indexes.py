@@ -0,0 +1,48 @@
+"""hot_path_indexes
+
+Revision ID: d3b551b073cb
+Revises: 93033a1f3360
+Create Date: 2026-10-17 11:04:19.527733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3b551b073cb'
+down_revision: Union[str, Sequence[str], None] = '93033a1f3360'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_course_enrollments_user_id_enrollment_type', 'course_enrollments', ['user_id', 'enrollment_type'], unique=False)
+    op.create_index('ix_course_enrollments_course_id_enrollment_type', 'course_enrollments', ['course_id', 'enrollment_type'], unique=False)
+    op.create_index('ix_lessons_course_id_order', 'lessons', ['course_id', 'order'], unique=False)
+    op.create_index(op.f('ix_questions_test_id'), 'questions', ['test_id'], unique=False)
+    op.create_index(op.f('ix_answers_question_id'), 'answers', ['question_id'], unique=False)
+    op.create_index('ix_user_answer_user_id_question_id', 'user_answer', ['user_id', 'question_id'], unique=False)
+    op.create_index(op.f('ix_user_answer_question_id'), 'user_answer', ['question_id'], unique=False)
+    op.create_index(op.f('ix_attendance_event_id'), 'attendance', ['event_id'], unique=False)
+    op.create_index('ix_tasks_course_id_created_at', 'tasks', ['course_id', 'created_at'], unique=False)
+    op.create_index('ix_users_lower_login', 'users', [sa.text('lower(login)')], unique=False)
+    op.create_index('ix_users_lower_email', 'users', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_lower_email', table_name='users')
+    op.drop_index('ix_users_lower_login', table_name='users')
+    op.drop_index('ix_tasks_course_id_created_at', table_name='tasks')
+    op.drop_index(op.f('ix_attendance_event_id'), table_name='attendance')
+    op.drop_index(op.f('ix_user_answer_question_id'), table_name='user_answer')
+    op.drop_index('ix_user_answer_user_id_question_id', table_name='user_answer')
+    op.drop_index(op.f('ix_answers_question_id'), table_name='answers')
+    op.drop_index(op.f('ix_questions_test_id'), table_name='questions')
+    op.drop_index('ix_lessons_course_id_order', table_name='lessons')
+    op.drop_index('ix_course_enrollments_course_id_enrollment_type', table_name='course_enrollments')
+    op.drop_index('ix_course_enrollments_user_id_enrollment_type', table_name='course_enrollments')
@@ -16,6 +16,7 @@ from models.course_enrollments import CourseEnrollment
 # materials / lessons
 from models.materials import Materials
 from models.lessons import Lessons
+from models.lesson_completions import LessonCompletion
 
 
 # tests
@@ -23,6 +24,7 @@ from models.tests import Tests
 from models.questions import Question
 from models.answers import Answer
 from models.users_answers import UserAnswer
+from models.test_attempts import TestAttempt
 
 # groups
 from models.groups import Groups
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from core.db import Base
@@ -13,8 +13,12 @@ class Attendance(Base):
     registered = Column(Integer)
     invited = Column(Integer)
 
-    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
+    __table_args__ = (
+        Index("ix_attendance_user_id_event_id", "user_id", "event_id"),
+    )
+
     event = relationship("Event", back_populates="attendances")
     user = relationship("Users", back_populates="attendances")
\ No newline at end of file
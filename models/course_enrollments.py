@@ -3,9 +3,12 @@ from sqlalchemy import (
     Column,
     Integer,
     String,
+    Float,
     DateTime,
     ForeignKey,
-    UniqueConstraint
+    Index,
+    UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import relationship
 from core.db import Base
@@ -19,10 +22,20 @@ class CourseEnrollment(Base):
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     enrollment_type = Column(String(20), nullable=False)  # 'student' или 'trainer'
     enrolled_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    # Прогресс студента: обновляется при прохождении уроков (ProgressRepository),
+    # чтобы не считать lesson_completions на каждый запрос
+    completed_lessons = Column(Integer, default=0, server_default=text("0"), nullable=False)
+    progress_percentage = Column(Float, default=0.0, server_default=text("0"), nullable=False)
+    current_lesson_id = Column(Integer, ForeignKey("lessons.id", ondelete="SET NULL"), nullable=True)
+    last_activity_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
     
     # Уникальность: один пользователь не может быть записан дважды на один курс с одним типом
     __table_args__ = (
         UniqueConstraint('user_id', 'course_id', 'enrollment_type', name='uq_user_course_type'),
+        Index('ix_course_enrollments_user_id_enrollment_type', 'user_id', 'enrollment_type'),
+        Index('ix_course_enrollments_course_id_enrollment_type', 'course_id', 'enrollment_type'),
     )
     
     user = relationship("Users", back_populates="course_enrollments")
@@ -1,6 +1,6 @@
 # models/events.py
 from sqlalchemy import (
-    Column, Integer, String, Text, Date, Time, DateTime, ForeignKey, func
+    Column, Integer, String, Text, Date, Time, DateTime, ForeignKey, Index, func
 )
 from sqlalchemy.orm import relationship
 
@@ -29,6 +29,13 @@ class Event(Base):
 
     company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
 
+    # Календарь: диапазон дат внутри компании / тренера / всех мероприятий
+    __table_args__ = (
+        Index("ix_events_company_id_start_date_start_time", "company_id", "start_date", "start_time"),
+        Index("ix_events_trainer_id_start_date_start_time", "trainer_id", "start_date", "start_time"),
+        Index("ix_events_start_date_start_time", "start_date", "start_time"),
+    )
+
     trainer = relationship("Users",back_populates="trainer_events",foreign_keys=[trainer_id],)
     company = relationship("Company", back_populates="events")
     attendances = relationship("Attendance", back_populates="event", cascade="all, delete-orphan")
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from core.db import Base
+
+
+class LessonCompletion(Base):
+    __tablename__ = "lesson_completions"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    lesson_id = Column(Integer, ForeignKey("lessons.id", ondelete="CASCADE"), nullable=False)
+    # Денормализовано из lessons.course_id — пересчет прогресса по курсу без join
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    completed_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    # Урок засчитывается пользователю один раз
+    __table_args__ = (
+        UniqueConstraint("user_id", "lesson_id", name="uq_lesson_completion_user_lesson"),
+        Index("ix_lesson_completions_user_id_course_id", "user_id", "course_id"),
+        Index("ix_lesson_completions_lesson_id", "lesson_id"),
+    )
+
+    user = relationship("Users")
+    lesson = relationship("Lessons")
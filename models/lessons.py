@@ -6,7 +6,8 @@ from sqlalchemy import (
     Text,
     DateTime,
     ForeignKey,
-    Boolean
+    Boolean,
+    Index
 )
 from sqlalchemy.orm import relationship
 from core.db import Base
@@ -31,5 +32,9 @@ class Lessons(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime(timezone=True), nullable=True, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        Index("ix_lessons_course_id_order", "course_id", "order"),
+    )
+
     course = relationship("Courses", back_populates="lessons")
 
@@ -5,7 +5,8 @@ Integer,
 String,
 Text,
 DateTime,
-ForeignKey
+ForeignKey,
+Index
 )
 from sqlalchemy.orm import relationship
 from core.db import Base
@@ -24,6 +25,10 @@ class Tasks(Base):
     created_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
 
+    __table_args__ = (
+        Index("ix_tasks_course_id_created_at", "course_id", "created_at"),
+    )
+
     course = relationship("Courses", back_populates="tasks")
     assignee = relationship("Users", back_populates="assigned_tasks", foreign_keys=[assigned_to_user_id])
     creator = relationship("Users", back_populates="created_tasks", foreign_keys=[created_by_id])
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, text
+from sqlalchemy.orm import relationship
+
+from core.db import Base
+
+
+class TestAttempt(Base):
+    __tablename__ = "test_attempts"
+
+    id = Column(Integer, primary_key=True)
+    test_id = Column(Integer, ForeignKey("tests.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False, default="in_progress")  # in_progress, finished, expired
+    started_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    # Крайний срок сдачи (started_at + time_limit_minutes), NULL — без ограничения
+    deadline_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Результат фиксируется при завершении попытки
+    score = Column(Float, nullable=True)
+    correct_answers = Column(Integer, nullable=True)
+    total_questions = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_test_attempts_user_id_test_id", "user_id", "test_id"),
+        Index("ix_test_attempts_test_id_user_id", "test_id", "user_id"),
+        # Не больше одной незавершенной попытки пользователя на тест
+        Index(
+            "uq_test_attempts_in_progress",
+            "user_id",
+            "test_id",
+            unique=True,
+            postgresql_where=text("status = 'in_progress'"),
+        ),
+    )
+
+    test = relationship("Tests", back_populates="attempts")
+    user = relationship("Users")
+    answers = relationship("UserAnswer", back_populates="attempt")
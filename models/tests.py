@@ -5,7 +5,7 @@ from sqlalchemy import (
     String,
     Text,
     DateTime,
-    ForeignKey, Boolean
+    ForeignKey, Boolean, func
 )
 from sqlalchemy.orm import relationship
 
@@ -21,6 +21,9 @@ class Tests(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=True)
     time_limit_minutes = Column(Integer, nullable=True)
     course_id = Column(Integer, ForeignKey('courses.id', ondelete="CASCADE"), nullable=False)
+    # Версия ключа ответов: обновляется при любом изменении теста, его вопросов и ответов
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     course = relationship("Courses", back_populates="tests")
     questions = relationship("Question", back_populates="test", cascade="all, delete-orphan")
+    attempts = relationship("TestAttempt", back_populates="test", cascade="all, delete-orphan")
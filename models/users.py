@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Date
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Date, Index, func
 from sqlalchemy.orm import relationship
 from core.db import Base
 
@@ -19,14 +19,17 @@ class Users(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     last_login = Column(DateTime, nullable=True)
 
-    company_id = Column(Integer, ForeignKey("companies.id", ondelete="SET NULL"), nullable=True)
-    department_id = Column(Integer, ForeignKey("departments.id", ondelete="SET NULL"), nullable=True)
-    position_id = Column(Integer, ForeignKey("positions.id", ondelete="SET NULL"), nullable=True)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="SET NULL"), nullable=True, index=True)
+    department_id = Column(Integer, ForeignKey("departments.id", ondelete="SET NULL"), nullable=True, index=True)
+    position_id = Column(Integer, ForeignKey("positions.id", ondelete="SET NULL"), nullable=True, index=True)
     role_id = Column(Integer, ForeignKey("roles.id", ondelete="SET NULL"), nullable=True)
 
     hire_date = Column(Date, nullable=True)
     telegram_username = Column(String(128), nullable=True, unique=True)
 
+    # trigram-индексы (pg_trgm) для поиска ILIKE '%...%' в GET /users создаются
+    # только миграцией 93033a1f3360: create_all при старте не должен требовать pg_trgm
+
     company = relationship("Company", back_populates="users")
     department = relationship("Department", back_populates="users")
     position = relationship("Position", back_populates="users")
@@ -53,3 +56,7 @@ class Users(Base):
     # course enrollments
     course_enrollments = relationship("CourseEnrollment", back_populates="user", cascade="all, delete-orphan")
 
+
+# функциональные индексы для поиска по логину/email без учета регистра
+Index("ix_users_lower_login", func.lower(Users.login))
+Index("ix_users_lower_email", func.lower(Users.email))
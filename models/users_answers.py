@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Boolean, DateTime, Index, func
 from sqlalchemy.orm import relationship
 
 from core.db import Base
@@ -11,11 +11,19 @@ class UserAnswer(Base):
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False, index=True)
     selected_answer_id = Column(Integer, ForeignKey("answers.id", ondelete="SET NULL"))
+    attempt_id = Column(Integer, ForeignKey("test_attempts.id", ondelete="CASCADE"), nullable=True, index=True)
     is_correct = Column(Boolean, default=False, nullable=False)
     answered_at = Column(DateTime(timezone=True), nullable=False)
+    # Время последнего изменения (PATCH); NULL — ответ не менялся
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        Index("ix_user_answer_user_id_question_id", "user_id", "question_id"),
+    )
 
     user = relationship("Users", back_populates="user_answers")
     question = relationship("Question", back_populates="user_answers")
     selected_answer = relationship("Answer", back_populates="selected_in")
+    attempt = relationship("TestAttempt", back_populates="answers")
@@ -1,6 +1,6 @@
 # 📁 repositories/base.py
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 from schemas import CourseResponse, CourseCreate, CourseUpdate, CourseStatus
 from schemas import LessonResponse, LessonCreate, LessonUpdate
@@ -16,8 +16,16 @@ class ICourseRepository(ABC):
         status: Optional[CourseStatus] = None,
         limit: int = 20,
         offset: int = 0,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        viewer_id: Optional[int] = None,
+        enrollment_type: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[CourseResponse]:
+        """
+        viewer_id + enrollment_type ограничивают выборку курсами, на которые
+        пользователь записан с этим типом (student/trainer).
+        cursor — keyset-курсор из предыдущей страницы (offset тогда игнорируется).
+        """
         pass
 
     @abstractmethod
@@ -35,6 +43,11 @@ class ICourseRepository(ABC):
     @abstractmethod
     async def delete(self, course_id: int) -> bool:
         pass
+
+    @abstractmethod
+    async def get_content_version(self, course_id: int) -> Optional[Tuple]:
+        """Версия курса и его уроков для кэша и ETag; None — курса нет"""
+        pass
 class ILessonRepository(ABC):
     @abstractmethod
     async def get_all(
@@ -0,0 +1,97 @@
+# repositories/mock/answer_key_cache.py
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from core.cache import TTLCache
+from core.config import settings
+
+# Ключ ответов теста: question_id -> {"type", "answer_ids", "correct_ids"}
+AnswerKey = Dict[int, Dict[str, Any]]
+
+
+class AnswerKeyCache:
+    """
+    Кэш ключей ответов тестов для проверки ответов без обращения к БД.
+
+    Версию теста передает вызывающий код — это tests.updated_at из БД, который
+    обновляется в той же транзакции, что и любое изменение вопросов/ответов
+    (touch_tests). Поэтому правка в одном воркере сразу инвалидирует ключ
+    во всех остальных: ключ отдается только при совпадении версии.
+    invalidate_test дополнительно сразу чистит ключ и обратные индексы в своем воркере.
+    """
+
+    def __init__(self, max_tests: int, ttl_seconds: float):
+        self._keys: TTLCache[Tuple[Hashable, AnswerKey]] = TTLCache(max_size=max_tests, ttl_seconds=ttl_seconds)
+        # обратные индексы, заполняются при построении ключа
+        self._question_test: TTLCache[int] = TTLCache(max_size=max_tests * 100, ttl_seconds=ttl_seconds)
+        self._answer_question: TTLCache[int] = TTLCache(max_size=max_tests * 500, ttl_seconds=ttl_seconds)
+
+    @staticmethod
+    def _freeze(key: AnswerKey) -> AnswerKey:
+        return {
+            question_id: {
+                "type": entry["type"],
+                "answer_ids": frozenset(entry["answer_ids"]),
+                "correct_ids": frozenset(entry["correct_ids"]),
+            }
+            for question_id, entry in key.items()
+        }
+
+    async def get_or_load(
+        self,
+        test_id: int,
+        version: Optional[Hashable],
+        loader: Callable[[int], Awaitable[AnswerKey]],
+    ) -> AnswerKey:
+        """
+        Ключ теста из кэша или loader(test_id), если версия изменилась.
+        Версия читается до загрузки: если тест изменят во время загрузки,
+        ключ сохранится под старой версией и при следующем запросе перечитается.
+        version=None (теста нет) — загружаем без кэширования.
+        """
+        cached = self._keys.get(test_id)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1]
+
+        key = self._freeze(await loader(test_id))
+        if version is None:
+            return key
+
+        self._keys.set(test_id, (version, key))
+        for question_id, entry in key.items():
+            self._question_test.set(question_id, test_id)
+            for answer_id in entry["answer_ids"]:
+                self._answer_question.set(answer_id, question_id)
+        return key
+
+    def test_of_question(self, question_id: int) -> Optional[int]:
+        return self._question_test.get(question_id)
+
+    def question_of_answer(self, answer_id: int) -> Optional[int]:
+        return self._answer_question.get(answer_id)
+
+    def invalidate_test(self, test_id: Optional[int]) -> None:
+        """Вызывается при любом изменении вопросов, ответов или самого теста"""
+        if test_id is None:
+            return
+        cached = self._keys.get(test_id)
+        self._keys.invalidate(test_id)
+        if cached is not None:
+            for question_id, entry in cached[1].items():
+                self._question_test.invalidate(question_id)
+                for answer_id in entry["answer_ids"]:
+                    self._answer_question.invalidate(answer_id)
+
+    def forget_question(self, question_id: int) -> None:
+        """Убрать вопрос из обратного индекса (вопрос перенесен или удален)"""
+        self._question_test.invalidate(question_id)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._question_test.clear()
+        self._answer_question.clear()
+
+
+answer_key_cache = AnswerKeyCache(
+    max_tests=settings.ANSWER_KEY_CACHE_MAX_TESTS,
+    ttl_seconds=settings.ANSWER_KEY_CACHE_TTL_SECONDS,
+)
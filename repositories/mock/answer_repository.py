@@ -1,10 +1,13 @@
-from typing import List, Optional
+from typing import List, Optional, Set
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from schemas import AnswerResponse, AnswerCreate, AnswerUpdate
 from models.answers import Answer
+from models.questions import Question
+from repositories.mock.answer_key_cache import answer_key_cache
+from repositories.mock.test_repository import touch_tests
 
 
 class AnswerRepository:
@@ -20,6 +23,30 @@ class AnswerRepository:
             question_id=answer.question_id,
         )
 
+    async def _touch_tests(self, *question_ids: Optional[int]) -> Set[int]:
+        """
+        Обновить версию ключа ответов тестов, к которым относятся вопросы
+        (в текущей транзакции). Возвращает id этих тестов.
+        """
+        ids = {qid for qid in question_ids if qid is not None}
+        if not ids:
+            return set()
+        res = await self.db.execute(select(Question.test_id).where(Question.id.in_(ids)))
+        test_ids = set(res.scalars().all())
+        await touch_tests(self.db, test_ids)
+        return test_ids
+
+    @staticmethod
+    def _invalidate_answer_key(test_ids: Set[int]) -> None:
+        """Сбросить ключ ответов тестов в кэше этого воркера"""
+        for test_id in test_ids:
+            answer_key_cache.invalidate_test(test_id)
+
+    async def get_question_id(self, answer_id: int) -> Optional[int]:
+        """ID вопроса, к которому относится ответ"""
+        res = await self.db.execute(select(Answer.question_id).where(Answer.id == answer_id))
+        return res.scalar_one_or_none()
+
     async def get_all(
         self,
         question_id: Optional[int] = None
@@ -49,12 +76,14 @@ class AnswerRepository:
             question_id=answer.question_id,
         )
         self.db.add(answer_obj)
+        test_ids = await self._touch_tests(answer.question_id)
         try:
             await self.db.commit()
         except IntegrityError:
             await self.db.rollback()
             raise
         await self.db.refresh(answer_obj)
+        self._invalidate_answer_key(test_ids)
         return self._to_response(answer_obj)
 
     async def update(self, answer_id: int, answer_data: AnswerUpdate) -> Optional[AnswerResponse]:
@@ -62,11 +91,13 @@ class AnswerRepository:
         answer = await self.db.get(Answer, answer_id)
         if not answer:
             return None
-        
+
+        old_question_id = answer.question_id
         update_data = answer_data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             if value is not None:
                 setattr(answer, key, value)
+        test_ids = await self._touch_tests(old_question_id, answer.question_id)
         
         try:
             await self.db.commit()
@@ -75,6 +106,7 @@ class AnswerRepository:
             raise
         
         await self.db.refresh(answer)
+        self._invalidate_answer_key(test_ids)
         return self._to_response(answer)
 
     async def delete(self, answer_id: int) -> bool:
@@ -82,7 +114,10 @@ class AnswerRepository:
         answer = await self.db.get(Answer, answer_id)
         if not answer:
             return False
+        question_id = answer.question_id
         await self.db.delete(answer)
+        test_ids = await self._touch_tests(question_id)
         await self.db.commit()
+        self._invalidate_answer_key(test_ids)
         return True
 
@@ -0,0 +1,68 @@
+# repositories/mock/course_content_cache.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from core.cache import TTLCache
+from core.config import settings
+
+
+class CourseContentCache:
+    """
+    Кэш содержимого курса (курс + уроки) для /courses/{id} и /courses/{id}/content.
+
+    Запись хранится вместе с версией курса (JsonCourseRepository.get_content_version),
+    поэтому изменения, сделанные другим воркером, видны сразу: версия в БД
+    не совпадет с закэшированной. В кэше лежат данные с относительными URL
+    медиа — подпись ссылок зависит от пользователя и делается при ответе.
+
+    При промахе загрузку выполняет один запрос, остальные ждут его результат
+    (защита от одновременного наплыва студентов к началу занятия).
+    """
+
+    def __init__(self, max_courses: int, ttl_seconds: float):
+        self._entries: TTLCache[Tuple[Hashable, Any]] = TTLCache(max_size=max_courses, ttl_seconds=ttl_seconds)
+        self._locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+
+    async def get_or_load(
+        self,
+        kind: str,
+        course_id: int,
+        version: Hashable,
+        loader: Callable[[], Awaitable[Optional[Any]]],
+    ) -> Optional[Any]:
+        key = (kind, course_id)
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                # пока ждали блокировку, данные мог загрузить другой запрос
+                cached = self._entries.get(key)
+                if cached is not None and cached[0] == version:
+                    return cached[1]
+
+                value = await loader()
+                if value is not None:
+                    self._entries.set(key, (version, value))
+                return value
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+    def invalidate_course(self, course_id: Optional[int]) -> None:
+        """Вызывается при изменении курса или его уроков"""
+        if course_id is None:
+            return
+        for kind in ("content", "detail"):
+            self._entries.invalidate((kind, course_id))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+course_content_cache = CourseContentCache(
+    max_courses=settings.COURSE_CONTENT_CACHE_MAX_COURSES,
+    ttl_seconds=settings.COURSE_CONTENT_CACHE_TTL_SECONDS,
+)
@@ -1,13 +1,17 @@
 # 📁 repositories/mock/course_repository.py
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import select, or_, func
+from typing import List, Optional, Tuple
+from sqlalchemy import select, or_, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from repositories.base import ICourseRepository
 from schemas import CourseResponse, CourseCreate, CourseUpdate, CourseStatus
 from models.courses import Courses
+from models.course_enrollments import CourseEnrollment
+from models.lessons import Lessons
+from repositories.mock.course_content_cache import course_content_cache
+from utils.pagination import decode_cursor
 
 
 class JsonCourseRepository(ICourseRepository):
@@ -37,6 +41,7 @@ class JsonCourseRepository(ICourseRepository):
             requirements=course.requirements if course.requirements else [],
             what_you_learn=course.what_you_learn if course.what_you_learn else [],
             status=status,
+            created_at=course.created_at,
         )
 
     async def get_all(
@@ -44,9 +49,23 @@ class JsonCourseRepository(ICourseRepository):
             status: Optional[CourseStatus] = None,
             limit: int = 20,
             offset: int = 0,
-            search: Optional[str] = None
+            search: Optional[str] = None,
+            viewer_id: Optional[int] = None,
+            enrollment_type: Optional[str] = None,
+            cursor: Optional[str] = None,
     ) -> List[CourseResponse]:
-        stmt = select(Courses)
+        # Студенту сразу отдаем его прогресс из строки записи на курс
+        with_progress = viewer_id is not None and enrollment_type == "student"
+        stmt = select(Courses, CourseEnrollment.progress_percentage) if with_progress else select(Courses)
+
+        # Видимость по записям на курс — join в том же запросе, а не фильтр страницы в Python
+        if viewer_id is not None and enrollment_type is not None:
+            stmt = stmt.join(
+                CourseEnrollment,
+                (CourseEnrollment.course_id == Courses.id)
+                & (CourseEnrollment.user_id == viewer_id)
+                & (CourseEnrollment.enrollment_type == enrollment_type),
+            )
 
         # Фильтр по статусу
         if status is not None:
@@ -62,15 +81,34 @@ class JsonCourseRepository(ICourseRepository):
                 )
             )
 
-        # Сортировка по дате создания (новые первые)
-        stmt = stmt.order_by(Courses.created_at.desc())
-
-        # Пагинация
-        stmt = stmt.limit(limit).offset(offset)
+        # Сортировка по дате создания (новые первые), id — для стабильного порядка
+        stmt = stmt.order_by(Courses.created_at.desc(), Courses.id.desc())
+
+        # Пагинация: keyset по (created_at, id), если передан курсор, иначе offset
+        if cursor:
+            created_at_raw, last_id = decode_cursor(cursor, 2)
+            try:
+                created_at = datetime.fromisoformat(created_at_raw)
+                last_id = int(last_id)
+            except (TypeError, ValueError) as e:
+                raise ValueError("Некорректный курсор") from e
+            stmt = stmt.where(
+                tuple_(Courses.created_at, Courses.id) < tuple_(created_at, last_id)
+            )
+            stmt = stmt.limit(limit)
+        else:
+            stmt = stmt.limit(limit).offset(offset)
 
         res = await self.db.execute(stmt)
-        courses = res.scalars().all()
-        return [self._to_response(c) for c in courses]
+        if not with_progress:
+            return [self._to_response(c) for c in res.scalars().all()]
+
+        courses = []
+        for course, progress in res.all():
+            response = self._to_response(course)
+            response.progress_percentage = progress
+            courses.append(response)
+        return courses
 
     async def get_by_id(self, course_id: int) -> Optional[CourseResponse]:
         course = await self.db.get(Courses, course_id)
@@ -79,6 +117,29 @@ class JsonCourseRepository(ICourseRepository):
         return self._to_response(course)
 
 
+    async def get_content_version(self, course_id: int) -> Optional[Tuple]:
+        """
+        Версия содержимого курса одним запросом по индексу уроков:
+        updated_at курса, число уроков, максимальный id и updated_at урока.
+        Меняется при любом изменении курса, добавлении, удалении и правке урока.
+        None — курса нет.
+        """
+        stmt = (
+            select(
+                Courses.updated_at,
+                func.count(Lessons.id),
+                func.max(Lessons.id),
+                func.max(Lessons.updated_at),
+            )
+            .outerjoin(Lessons, Lessons.course_id == Courses.id)
+            .where(Courses.id == course_id)
+            .group_by(Courses.id)
+        )
+        row = (await self.db.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        return tuple(v.isoformat() if isinstance(v, datetime) else v for v in row)
+
     async def create(self, course_data: CourseCreate) -> CourseResponse:
         now = datetime.utcnow()
 
@@ -132,6 +193,7 @@ class JsonCourseRepository(ICourseRepository):
             await self.db.rollback()
             raise
 
+        course_content_cache.invalidate_course(course_id)
         await self.db.refresh(course)
         return self._to_response(course)
 
@@ -141,6 +203,7 @@ class JsonCourseRepository(ICourseRepository):
             return False
         await self.db.delete(course)
         await self.db.commit()
+        course_content_cache.invalidate_course(course_id)
         return True
 
     async def get_courses_by_trainer(self, trainer_id: int) -> List[dict]:
@@ -162,22 +225,6 @@ class JsonCourseRepository(ICourseRepository):
         return await self.get_courses_by_trainer(teacher_id)
 
     async def get_students_by_course(self, course_id: int) -> List[dict]:
-        from repositories.mock.enrollment_repository import EnrollmentRepository
         from repositories.mock.user_repository import UserRepository
 
-        enrollment_repo = EnrollmentRepository(self.db)
-        user_repo = UserRepository(self.db)
-        all_users = await user_repo.get_all()
-
-        students_ids = set()
-        for u in all_users:
-            if u.get("role") != "student":
-                continue
-            uid = u.get("id")
-            if uid is None:
-                continue
-            student_courses = await enrollment_repo.get_courses_for_student(uid)
-            if course_id in student_courses:
-                students_ids.add(uid)
-
-        return [u for u in all_users if u.get("id") in students_ids]
+        return await UserRepository(self.db).get_students_by_course(course_id)
@@ -1,10 +1,16 @@
 # repositories/mock/enrollment_repository.py
-from typing import List
-from sqlalchemy import select, and_, delete
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import select, and_, delete, func, literal, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 
 from models.course_enrollments import CourseEnrollment
+from core.roles import UserRole
+from models.groups_users import GroupsUsers
+from models.roles import Role
+from models.users import Users
 
 
 class EnrollmentRepository:
@@ -39,6 +45,73 @@ class EnrollmentRepository:
             await self.db.rollback()
             raise
 
+    async def enroll_students_bulk(
+        self,
+        course_id: int,
+        student_ids: Iterable[int] = (),
+        group_id: Optional[int] = None,
+        department_id: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """
+        Записать на курс пользователей из student_ids, группы group_id и отдела
+        department_id одним запросом:
+            WITH src AS (SELECT users.id, roles.title ...),
+                 ins AS (INSERT ... SELECT FROM src WHERE title = 'student'
+                         ON CONFLICT DO NOTHING RETURNING id)
+            SELECT count(src), count(ins)
+        Записываются только пользователи с ролью student; несуществующие id
+        пропускаются. Возвращает (requested, inserted), где requested — число
+        найденных пользователей (включая не-студентов, которые не записываются).
+        """
+        conditions = []
+        student_ids = list(set(student_ids))
+        if student_ids:
+            conditions.append(Users.id.in_(student_ids))
+        if group_id is not None:
+            conditions.append(
+                Users.id.in_(select(GroupsUsers.user_id).where(GroupsUsers.group_id == group_id))
+            )
+        if department_id is not None:
+            conditions.append(Users.department_id == department_id)
+        if not conditions:
+            return 0, 0
+
+        src = (
+            select(Users.id, Role.title.label("role"))
+            .outerjoin(Role, Role.id == Users.role_id)
+            .where(or_(*conditions))
+            .cte("src")
+        )
+        ins = (
+            pg_insert(CourseEnrollment)
+            .from_select(
+                ["user_id", "course_id", "enrollment_type", "enrolled_at"],
+                select(
+                    src.c.id,
+                    literal(course_id),
+                    literal("student"),
+                    func.now(),
+                ).where(func.lower(src.c.role) == UserRole.STUDENT.value),
+            )
+            .on_conflict_do_nothing(constraint="uq_user_course_type")
+            .returning(CourseEnrollment.id)
+            .cte("ins")
+        )
+        stmt = select(
+            select(func.count()).select_from(src).scalar_subquery(),
+            select(func.count()).select_from(ins).scalar_subquery(),
+        )
+
+        try:
+            result = await self.db.execute(stmt)
+            requested, inserted = result.one()
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
+
+        return requested, inserted
+
     async def unenroll_student(self, student_id: int, course_id: int) -> None:
         """Отписать студента с курса"""
         stmt = delete(CourseEnrollment).where(
@@ -113,6 +186,32 @@ class EnrollmentRepository:
         result = await self.db.execute(stmt)
         return [row[0] for row in result.all()]
 
+    @staticmethod
+    def students_of_trainer_query(trainer_id: int):
+        """
+        select(user_id) студентов всех курсов тренера:
+        self-join course_enrollments (student ⋈ trainer по course_id).
+        """
+        trainer_enrollment = aliased(CourseEnrollment)
+        return (
+            select(CourseEnrollment.user_id)
+            .join(
+                trainer_enrollment,
+                and_(
+                    trainer_enrollment.course_id == CourseEnrollment.course_id,
+                    trainer_enrollment.user_id == trainer_id,
+                    trainer_enrollment.enrollment_type == "trainer",
+                ),
+            )
+            .where(CourseEnrollment.enrollment_type == "student")
+        )
+
+    async def get_student_ids_for_trainer(self, trainer_id: int) -> List[int]:
+        """Получить ID студентов всех курсов, которые ведет тренер (один запрос)"""
+        stmt = self.students_of_trainer_query(trainer_id).distinct()
+        result = await self.db.execute(stmt)
+        return [row[0] for row in result.all()]
+
     # Алиасы для обратной совместимости
     async def assign_teacher(self, teacher_id: int, course_id: int) -> None:
         """Алиас для assign_trainer (обратная совместимость)"""
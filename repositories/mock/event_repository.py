@@ -1,12 +1,15 @@
 # repositories/event_repository.py
 from __future__ import annotations
 
+from datetime import date, time
 from typing import Optional, List
 
-from sqlalchemy import select
+from sqlalchemy import or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from models.attendances import Attendance
 from models.events import Event
+from utils.pagination import decode_cursor
 
 
 class EventRepository:
@@ -24,9 +27,57 @@ class EventRepository:
         res = await self.db.execute(q)
         return res.scalar_one_or_none()
 
-    async def list_all(self) -> List[Event]:
-        q = select(Event).order_by(Event.start_date.desc(), Event.start_time.desc())
-        res = await self.db.execute(q)
+    async def list_range(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        company_id: Optional[int] = None,
+        trainer_id: Optional[int] = None,
+        participant_id: Optional[int] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> List[Event]:
+        """
+        Окно календаря: мероприятия с date_from по date_to включительно
+        в хронологическом порядке. Фильтр по компании или тренеру и диапазон
+        дат ложатся на индексы (company_id | trainer_id, start_date, start_time).
+        participant_id оставляет только мероприятия, куда пользователь приглашен
+        или записан (semi-join по индексу attendance (user_id, event_id)).
+        Пагинация — keyset по (start_date, start_time, id).
+        """
+        stmt = select(Event)
+
+        if participant_id is not None:
+            invited_event_ids = select(Attendance.event_id).where(
+                Attendance.user_id == participant_id,
+                or_(Attendance.invited > 0, Attendance.registered > 0),
+            )
+            stmt = stmt.where(Event.id.in_(invited_event_ids))
+
+        if company_id is not None:
+            stmt = stmt.where(Event.company_id == company_id)
+        if trainer_id is not None:
+            stmt = stmt.where(Event.trainer_id == trainer_id)
+        if date_from is not None:
+            stmt = stmt.where(Event.start_date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(Event.start_date <= date_to)
+
+        if cursor:
+            start_date_raw, start_time_raw, last_id = decode_cursor(cursor, 3)
+            try:
+                last_date = date.fromisoformat(start_date_raw)
+                last_time = time.fromisoformat(start_time_raw)
+                last_id = int(last_id)
+            except (TypeError, ValueError) as e:
+                raise ValueError("Некорректный курсор") from e
+            stmt = stmt.where(
+                tuple_(Event.start_date, Event.start_time, Event.id)
+                > tuple_(last_date, last_time, last_id)
+            )
+
+        stmt = stmt.order_by(Event.start_date, Event.start_time, Event.id).limit(limit)
+        res = await self.db.execute(stmt)
         return list(res.scalars().all())
 
     async def update(self, event: Event) -> Event:
@@ -7,6 +7,11 @@ from repositories.base import ILessonRepository
 from schemas import LessonResponse, LessonCreate, LessonUpdate
 from schemas.common import ContentType, LessonType
 from models.lessons import Lessons
+from repositories.mock.progress_repository import ProgressRepository
+from repositories.mock.course_content_cache import course_content_cache
+
+# Поля урока, от которых зависит прогресс студентов по курсу
+_PROGRESS_FIELDS = {"course_id", "is_published", "order"}
 
 
 class JsonLessonRepository(ILessonRepository):
@@ -93,6 +98,8 @@ class JsonLessonRepository(ILessonRepository):
             await self.db.rollback()
             raise
         await self.db.refresh(lesson_obj)
+        course_content_cache.invalidate_course(lesson_obj.course_id)
+        await ProgressRepository(self.db).recalculate_course(lesson_obj.course_id)
         return self._to_response(lesson_obj)
 
     async def update(
@@ -104,6 +111,7 @@ class JsonLessonRepository(ILessonRepository):
         if not lesson:
             return None
 
+        old_course_id = lesson.course_id
         update_data = lesson_data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             if value is None:
@@ -123,12 +131,26 @@ class JsonLessonRepository(ILessonRepository):
             raise
 
         await self.db.refresh(lesson)
+        course_content_cache.invalidate_course(lesson.course_id)
+        if old_course_id != lesson.course_id:
+            course_content_cache.invalidate_course(old_course_id)
+
+        changed = {key for key, value in update_data.items() if value is not None}
+        if changed & _PROGRESS_FIELDS:
+            progress_repo = ProgressRepository(self.db)
+            await progress_repo.recalculate_course(lesson.course_id)
+            if old_course_id != lesson.course_id:
+                await progress_repo.recalculate_course(old_course_id)
+
         return self._to_response(lesson)
 
     async def delete(self, lesson_id: int) -> bool:
         lesson = await self.db.get(Lessons, lesson_id)
         if not lesson:
             return False
+        course_id = lesson.course_id
         await self.db.delete(lesson)
         await self.db.commit()
+        course_content_cache.invalidate_course(course_id)
+        await ProgressRepository(self.db).recalculate_course(course_id)
         return True
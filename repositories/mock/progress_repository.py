@@ -0,0 +1,199 @@
+# repositories/mock/progress_repository.py
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, update, func, exists, and_, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.course_enrollments import CourseEnrollment
+from models.lesson_completions import LessonCompletion
+from models.lessons import Lessons
+from models.users import Users
+
+
+def _percentage(completed: int, total: int) -> float:
+    if not total:
+        return 0.0
+    return round(min(100.0, completed * 100.0 / total), 2)
+
+
+def _to_progress_dict(enrollment: CourseEnrollment) -> Dict[str, Any]:
+    return {
+        "course_id": enrollment.course_id,
+        "user_id": enrollment.user_id,
+        "enrolled_at": enrollment.enrolled_at,
+        "completed_lessons": enrollment.completed_lessons or 0,
+        "progress_percentage": enrollment.progress_percentage or 0.0,
+        "current_lesson_id": enrollment.current_lesson_id,
+        "last_activity_at": enrollment.last_activity_at,
+        "completed_at": enrollment.completed_at,
+        "is_active": True,
+    }
+
+
+class ProgressRepository:
+    """
+    Прогресс студентов по курсам.
+
+    Прохождения уроков хранятся в lesson_completions, а итог (число пройденных
+    уроков, процент, текущий урок) поддерживается в строке course_enrollments
+    при каждом прохождении — чтение прогресса не требует подсчетов.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _student_enrollment(self, user_id: int, course_id: int):
+        return select(CourseEnrollment).where(
+            CourseEnrollment.user_id == user_id,
+            CourseEnrollment.course_id == course_id,
+            CourseEnrollment.enrollment_type == "student",
+        )
+
+    async def _published_lessons_count(self, course_id: int) -> int:
+        stmt = select(func.count(Lessons.id)).where(
+            Lessons.course_id == course_id,
+            Lessons.is_published.is_(True),
+        )
+        res = await self.db.execute(stmt)
+        return res.scalar_one()
+
+    async def _next_lesson_id(self, user_id: int, course_id: int) -> Optional[int]:
+        """Первый по порядку опубликованный урок, который пользователь еще не прошел"""
+        stmt = (
+            select(Lessons.id)
+            .where(
+                Lessons.course_id == course_id,
+                Lessons.is_published.is_(True),
+                ~exists().where(
+                    LessonCompletion.lesson_id == Lessons.id,
+                    LessonCompletion.user_id == user_id,
+                ),
+            )
+            .order_by(Lessons.order.asc(), Lessons.id.asc())
+            .limit(1)
+        )
+        res = await self.db.execute(stmt)
+        return res.scalar_one_or_none()
+
+    async def get_enrollment_info(self, user_id: int, course_id: int) -> Optional[Dict[str, Any]]:
+        """Прогресс студента по курсу (None — пользователь не записан как студент)"""
+        res = await self.db.execute(self._student_enrollment(user_id, course_id))
+        enrollment = res.scalar_one_or_none()
+        return _to_progress_dict(enrollment) if enrollment else None
+
+    async def get_course_progress(self, course_id: int) -> List[Dict[str, Any]]:
+        """Прогресс всех студентов курса (для менеджеров и тренеров)"""
+        stmt = (
+            select(CourseEnrollment, Users.first_name, Users.last_name, Users.email)
+            .join(Users, Users.id == CourseEnrollment.user_id)
+            .where(
+                CourseEnrollment.course_id == course_id,
+                CourseEnrollment.enrollment_type == "student",
+            )
+            .order_by(CourseEnrollment.progress_percentage.desc(), Users.last_name.asc(), Users.id.asc())
+        )
+        res = await self.db.execute(stmt)
+        return [
+            {**_to_progress_dict(enrollment), "first_name": first_name, "last_name": last_name, "email": email}
+            for enrollment, first_name, last_name, email in res.all()
+        ]
+
+    async def complete_lesson(self, user_id: int, lesson_id: int, course_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Отметить урок пройденным и обновить прогресс записи на курс.
+        Повторное прохождение не увеличивает счетчик. None — пользователь не записан на курс.
+        """
+        # FOR UPDATE: параллельные прохождения одного студента не теряют инкремент
+        res = await self.db.execute(
+            self._student_enrollment(user_id, course_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        enrollment = res.scalar_one_or_none()
+        if not enrollment:
+            await self.db.rollback()
+            return None
+
+        now = datetime.utcnow()
+        stmt = (
+            pg_insert(LessonCompletion)
+            .values(user_id=user_id, lesson_id=lesson_id, course_id=course_id, completed_at=now)
+            .on_conflict_do_nothing(constraint="uq_lesson_completion_user_lesson")
+            .returning(LessonCompletion.id)
+        )
+        inserted = (await self.db.execute(stmt)).scalar_one_or_none() is not None
+
+        if inserted:
+            enrollment.completed_lessons = (enrollment.completed_lessons or 0) + 1
+        total = await self._published_lessons_count(course_id)
+        enrollment.progress_percentage = _percentage(enrollment.completed_lessons, total)
+        enrollment.current_lesson_id = await self._next_lesson_id(user_id, course_id)
+        enrollment.last_activity_at = now
+        if enrollment.current_lesson_id is None and total:
+            enrollment.completed_at = enrollment.completed_at or now
+
+        await self.db.commit()
+        return _to_progress_dict(enrollment)
+
+    async def recalculate_course(self, course_id: int) -> None:
+        """
+        Пересчитать прогресс всех студентов курса (набором UPDATE, без цикла по студентам).
+        Вызывается при изменении состава уроков: добавление, удаление, публикация, порядок.
+        """
+        total = await self._published_lessons_count(course_id)
+
+        completed_count = (
+            select(func.count(LessonCompletion.id))
+            .join(Lessons, Lessons.id == LessonCompletion.lesson_id)
+            .where(
+                LessonCompletion.user_id == CourseEnrollment.user_id,
+                LessonCompletion.course_id == CourseEnrollment.course_id,
+                Lessons.is_published.is_(True),
+            )
+            .scalar_subquery()
+        )
+        next_lesson = (
+            select(Lessons.id)
+            .where(
+                Lessons.course_id == CourseEnrollment.course_id,
+                Lessons.is_published.is_(True),
+                ~exists().where(
+                    LessonCompletion.lesson_id == Lessons.id,
+                    LessonCompletion.user_id == CourseEnrollment.user_id,
+                ),
+            )
+            .order_by(Lessons.order.asc(), Lessons.id.asc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        students = and_(
+            CourseEnrollment.course_id == course_id,
+            CourseEnrollment.enrollment_type == "student",
+        )
+
+        await self.db.execute(
+            update(CourseEnrollment)
+            .where(students)
+            .values(completed_lessons=completed_count, current_lesson_id=next_lesson)
+            .execution_options(synchronize_session=False)
+        )
+
+        if total:
+            percentage = func.least(100.0, func.round(CourseEnrollment.completed_lessons * 10000.0 / total) / 100.0)
+            completed_at = case(
+                (CourseEnrollment.completed_lessons >= total, func.coalesce(CourseEnrollment.completed_at, func.now())),
+                else_=None,
+            )
+        else:
+            percentage = 0.0
+            completed_at = None
+
+        await self.db.execute(
+            update(CourseEnrollment)
+            .where(students)
+            .values(progress_percentage=percentage, completed_at=completed_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
@@ -1,12 +1,15 @@
 from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
 
 from schemas import QuestionResponse, QuestionCreate, QuestionUpdate
 from schemas import AnswerResponse, AnswerCreate
 from models.questions import Question
 from models.answers import Answer
+from repositories.mock.answer_key_cache import answer_key_cache
+from repositories.mock.test_repository import touch_tests
 
 
 class QuestionRepository:
@@ -26,11 +29,7 @@ class QuestionRepository:
                 )
                 for a in answers
             ]
-        else:
-            # Если ответы не переданы, получаем их из базы
-            # Это не оптимально, лучше передавать всегда
-            pass
-        
+
         return QuestionResponse(
             id=question.id,
             question_text=question.question_text,
@@ -39,41 +38,46 @@ class QuestionRepository:
             answers=answer_responses,
         )
 
+    def _select_with_answers(self):
+        """
+        select(Question) с ответами, загруженными одним IN-запросом (selectinload).
+        populate_existing нужен, чтобы перечитать ответы у вопросов,
+        которые уже лежат в identity map сессии.
+        """
+        return (
+            select(Question)
+            .options(selectinload(Question.answers))
+            .execution_options(populate_existing=True)
+        )
+
     async def get_all(
         self,
         test_id: Optional[int] = None
     ) -> List[QuestionResponse]:
         """Получить все вопросы, опционально фильтровать по тесту"""
-        stmt = select(Question)
+        stmt = self._select_with_answers()
         
         if test_id is not None:
             stmt = stmt.where(Question.test_id == test_id)
         
+        stmt = stmt.order_by(Question.id.asc())
+
+        # 2 запроса независимо от количества вопросов: вопросы + ответы через IN
         res = await self.db.execute(stmt)
         questions = res.scalars().all()
-        
-        # Получаем ответы для каждого вопроса
-        result = []
-        for q in questions:
-            stmt_answers = select(Answer).where(Answer.question_id == q.id)
-            res_answers = await self.db.execute(stmt_answers)
-            answers = res_answers.scalars().all()
-            result.append(self._to_response(q, list(answers)))
-        
-        return result
+        return [self._to_response(q, list(q.answers)) for q in questions]
+
+    async def _get_with_answers(self, question_id: int) -> Optional[Question]:
+        stmt = self._select_with_answers().where(Question.id == question_id)
+        res = await self.db.execute(stmt)
+        return res.scalar_one_or_none()
 
     async def get_by_id(self, question_id: int) -> Optional[QuestionResponse]:
         """Получить вопрос по ID"""
-        question = await self.db.get(Question, question_id)
+        question = await self._get_with_answers(question_id)
         if not question:
             return None
-        
-        # Получаем ответы
-        stmt_answers = select(Answer).where(Answer.question_id == question_id)
-        res_answers = await self.db.execute(stmt_answers)
-        answers = res_answers.scalars().all()
-        
-        return self._to_response(question, list(answers))
+        return self._to_response(question, list(question.answers))
 
     async def create(self, question: QuestionCreate) -> QuestionResponse:
         """Создать новый вопрос с ответами"""
@@ -83,6 +87,7 @@ class QuestionRepository:
             test_id=question.test_id,
         )
         self.db.add(question_obj)
+        await touch_tests(self.db, [question.test_id])
         try:
             await self.db.commit()
         except IntegrityError:
@@ -102,14 +107,16 @@ class QuestionRepository:
             answers_list.append(answer_obj)
         
         if answers_list:
+            await touch_tests(self.db, [question_obj.test_id])
             try:
                 await self.db.commit()
             except IntegrityError:
                 await self.db.rollback()
                 raise
-            for a in answers_list:
-                await self.db.refresh(a)
-        
+            # id ответов уже выставлены при flush, а expire_on_commit=False
+            # сохраняет остальные поля — построчный refresh не нужен
+
+        answer_key_cache.invalidate_test(question_obj.test_id)
         return self._to_response(question_obj, answers_list)
 
     async def update(self, question_id: int, question_data: QuestionUpdate) -> Optional[QuestionResponse]:
@@ -117,33 +124,43 @@ class QuestionRepository:
         question = await self.db.get(Question, question_id)
         if not question:
             return None
-        
+
+        old_test_id = question.test_id
         update_data = question_data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             if value is not None:
                 setattr(question, key, value)
+        await touch_tests(self.db, [old_test_id, question.test_id])
         
         try:
             await self.db.commit()
         except IntegrityError:
             await self.db.rollback()
             raise
+
+        answer_key_cache.forget_question(question_id)
+        answer_key_cache.invalidate_test(old_test_id)
+        answer_key_cache.invalidate_test(question.test_id)
         
-        await self.db.refresh(question)
-        
-        # Получаем ответы
-        stmt_answers = select(Answer).where(Answer.question_id == question_id)
-        res_answers = await self.db.execute(stmt_answers)
-        answers = res_answers.scalars().all()
-        
-        return self._to_response(question, list(answers))
+        # Перечитываем вопрос вместе с ответами одним select + IN
+        question = await self._get_with_answers(question_id)
+        return self._to_response(question, list(question.answers))
 
     async def delete(self, question_id: int) -> bool:
         """Удалить вопрос (ответы удалятся каскадно)"""
         question = await self.db.get(Question, question_id)
         if not question:
             return False
+        test_id = question.test_id
         await self.db.delete(question)
+        await touch_tests(self.db, [test_id])
         await self.db.commit()
+        answer_key_cache.forget_question(question_id)
+        answer_key_cache.invalidate_test(test_id)
         return True
 
+    async def get_test_id(self, question_id: int) -> Optional[int]:
+        """ID теста, к которому относится вопрос"""
+        res = await self.db.execute(select(Question.test_id).where(Question.id == question_id))
+        return res.scalar_one_or_none()
+
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,3 +23,8 @@ class RoleRepository:
             select(Role.id).where(func.lower(Role.title) == title.lower()).limit(1)
         )
         return res.scalar_one_or_none()
+
+    async def get_id_map(self) -> Dict[str, int]:
+        """Все роли одним запросом: title в нижнем регистре -> id"""
+        res = await self.db.execute(select(Role.id, Role.title))
+        return {(title or "").strip().lower(): role_id for role_id, title in res.all()}
@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, func, insert, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+
+from core.config import settings
+from schemas import TestAttemptResponse
+from models.test_attempts import TestAttempt
+from models.users_answers import UserAnswer
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # в БД пишутся naive-значения в UTC (datetime.utcnow), читаются — aware
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def is_overdue(deadline_at: Optional[datetime], now: Optional[datetime] = None) -> bool:
+    """Истек ли срок попытки (с запасом TEST_SUBMIT_GRACE_SECONDS на сетевые задержки)"""
+    if deadline_at is None:
+        return False
+    grace = timedelta(seconds=settings.TEST_SUBMIT_GRACE_SECONDS)
+    return (now or utc_now()) > _as_utc(deadline_at) + grace
+
+
+class TestAttemptRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _to_response(self, attempt: TestAttempt) -> TestAttemptResponse:
+        """Преобразует модель TestAttempt в TestAttemptResponse"""
+        status = attempt.status
+        # просроченная, но еще не закрытая попытка показывается как expired
+        if status == "in_progress" and is_overdue(attempt.deadline_at):
+            status = "expired"
+
+        return TestAttemptResponse(
+            id=attempt.id,
+            test_id=attempt.test_id,
+            user_id=attempt.user_id,
+            status=status,
+            started_at=attempt.started_at,
+            deadline_at=attempt.deadline_at,
+            finished_at=attempt.finished_at,
+            score=attempt.score,
+            correct_answers=attempt.correct_answers,
+            total_questions=attempt.total_questions,
+        )
+
+    async def get_all(
+        self,
+        test_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ) -> List[TestAttemptResponse]:
+        """Попытки, опционально по тесту и/или пользователю, новые первыми"""
+        stmt = select(TestAttempt)
+        if test_id is not None:
+            stmt = stmt.where(TestAttempt.test_id == test_id)
+        if user_id is not None:
+            stmt = stmt.where(TestAttempt.user_id == user_id)
+        stmt = stmt.order_by(TestAttempt.started_at.desc(), TestAttempt.id.desc())
+
+        res = await self.db.execute(stmt)
+        return [self._to_response(a) for a in res.scalars().all()]
+
+    async def get_in_progress(self, test_id: int, user_id: int) -> Optional[TestAttemptResponse]:
+        """Незавершенная попытка пользователя (не больше одной — см. uq_test_attempts_in_progress)"""
+        stmt = select(TestAttempt).where(
+            TestAttempt.test_id == test_id,
+            TestAttempt.user_id == user_id,
+            TestAttempt.status == "in_progress",
+        )
+        res = await self.db.execute(stmt.execution_options(populate_existing=True))
+        attempt = res.scalar_one_or_none()
+        return self._to_response(attempt) if attempt else None
+
+    async def count_for_user(self, test_id: int, user_id: int) -> int:
+        """Сколько попыток пользователь уже использовал"""
+        stmt = select(func.count(TestAttempt.id)).where(
+            TestAttempt.test_id == test_id,
+            TestAttempt.user_id == user_id,
+        )
+        res = await self.db.execute(stmt)
+        return res.scalar_one()
+
+    async def create(self, test_id: int, user_id: int, deadline_at: Optional[datetime]) -> TestAttemptResponse:
+        """Начать попытку. IntegrityError — у пользователя уже есть незавершенная попытка"""
+        attempt = TestAttempt(
+            test_id=test_id,
+            user_id=user_id,
+            status="in_progress",
+            started_at=utc_now(),
+            deadline_at=deadline_at,
+        )
+        self.db.add(attempt)
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
+        await self.db.refresh(attempt)
+        return self._to_response(attempt)
+
+    async def expire(self, attempt_id: int) -> None:
+        """Закрыть просроченную попытку без ответов с нулевым результатом"""
+        stmt = (
+            update(TestAttempt)
+            .where(TestAttempt.id == attempt_id, TestAttempt.status == "in_progress")
+            .values(
+                status="expired",
+                finished_at=TestAttempt.deadline_at,
+                score=0.0,
+                correct_answers=0,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    async def finish(
+        self,
+        attempt_id: int,
+        answers: List[Dict[str, Any]],
+        score: float,
+        correct_answers: int,
+        total_questions: int,
+        finished_at: datetime,
+    ) -> bool:
+        """
+        Завершить попытку: ответы (многострочный INSERT) и итог попытки
+        в одной транзакции. Ответы, сохраненные в попытке ранее
+        (POST /user-answers), заменяются итоговыми, чтобы строки не дублировались.
+        False — попытка уже была завершена.
+        """
+        stmt = (
+            update(TestAttempt)
+            .where(TestAttempt.id == attempt_id, TestAttempt.status == "in_progress")
+            .values(
+                status="finished",
+                finished_at=finished_at,
+                score=score,
+                correct_answers=correct_answers,
+                total_questions=total_questions,
+            )
+            .returning(TestAttempt.id)
+            .execution_options(synchronize_session=False)
+        )
+        res = await self.db.execute(stmt)
+        if res.scalar_one_or_none() is None:
+            await self.db.rollback()
+            return False
+
+        await self.db.execute(
+            delete(UserAnswer)
+            .where(UserAnswer.attempt_id == attempt_id)
+            .execution_options(synchronize_session=False)
+        )
+        if answers:
+            rows = [{**row, "attempt_id": attempt_id} for row in answers]
+            await self.db.execute(insert(UserAnswer).values(rows))
+
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
+        return True
@@ -1,13 +1,33 @@
-from typing import List, Optional
-from sqlalchemy import select
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 
 from schemas import TestResponse, TestCreate, TestUpdate, TestDetailResponse
 from schemas import QuestionResponse, AnswerResponse
 from models.tests import Tests
 from models.questions import Question
 from models.answers import Answer
+from repositories.mock.answer_key_cache import answer_key_cache
+
+
+async def touch_tests(db: AsyncSession, test_ids: Iterable[Optional[int]]) -> None:
+    """
+    Обновить tests.updated_at — версию ключа ответов — в текущей транзакции.
+    Вызывается перед commit при изменении вопросов и ответов теста.
+    """
+    ids = {test_id for test_id in test_ids if test_id is not None}
+    if not ids:
+        return
+    stmt = (
+        update(Tests)
+        .where(Tests.id.in_(ids))
+        .values(updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(stmt)
 
 
 class TestRepository:
@@ -55,18 +75,19 @@ class TestRepository:
         if not test:
             return None
         
-        # Получаем вопросы для теста
-        stmt_questions = select(Question).where(Question.test_id == test_id)
+        # Вопросы и все их ответы: 2 запроса независимо от количества вопросов
+        stmt_questions = (
+            select(Question)
+            .options(selectinload(Question.answers))
+            .where(Question.test_id == test_id)
+            .order_by(Question.id.asc())
+            .execution_options(populate_existing=True)
+        )
         res_questions = await self.db.execute(stmt_questions)
         questions = res_questions.scalars().all()
         
         question_responses = []
         for q in questions:
-            # Получаем ответы для вопроса
-            stmt_answers = select(Answer).where(Answer.question_id == q.id)
-            res_answers = await self.db.execute(stmt_answers)
-            answers = res_answers.scalars().all()
-            
             question_responses.append(QuestionResponse(
                 id=q.id,
                 question_text=q.question_text,
@@ -77,12 +98,49 @@ class TestRepository:
                     answer_text=a.answer_text,
                     is_correct=a.is_correct,
                     question_id=a.question_id,
-                ) for a in answers]
+                ) for a in q.answers]
             ))
         
         test_response = self._to_response(test)
         return TestDetailResponse(**test_response.model_dump(), questions=question_responses)
 
+    async def get_answer_key_version(self, test_id: int) -> Optional[datetime]:
+        """Версия ключа ответов теста (tests.updated_at) одним запросом по PK; None — теста нет"""
+        res = await self.db.execute(select(Tests.updated_at).where(Tests.id == test_id))
+        return res.scalar_one_or_none()
+
+    async def get_cached_answer_key(self, test_id: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Ключ ответов теста через answer_key_cache — для всех путей проверки ответов.
+        Версия сверяется с БД, поэтому изменения из других воркеров видны сразу.
+        """
+        version = await self.get_answer_key_version(test_id)
+        return await answer_key_cache.get_or_load(test_id, version, self.get_answer_key)
+
+    async def get_answer_key(self, test_id: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Ключ ответов теста одним запросом (без кэша):
+        question_id -> {"type": тип вопроса, "answer_ids": все варианты, "correct_ids": правильные}
+        """
+        stmt = (
+            select(Question.id, Question.question_type, Answer.id, Answer.is_correct)
+            .join(Answer, Answer.question_id == Question.id, isouter=True)
+            .where(Question.test_id == test_id)
+        )
+        res = await self.db.execute(stmt)
+
+        key: Dict[int, Dict[str, Any]] = {}
+        for question_id, question_type, answer_id, is_correct in res.all():
+            entry = key.setdefault(
+                question_id,
+                {"type": question_type, "answer_ids": set(), "correct_ids": set()},
+            )
+            if answer_id is not None:
+                entry["answer_ids"].add(answer_id)
+                if is_correct:
+                    entry["correct_ids"].add(answer_id)
+        return key
+
     async def create(self, test: TestCreate) -> TestResponse:
         """Создать новый тест"""
         test_obj = Tests(
@@ -128,5 +186,6 @@ class TestRepository:
             return False
         await self.db.delete(test)
         await self.db.commit()
+        answer_key_cache.invalidate_test(test_id)
         return True
 
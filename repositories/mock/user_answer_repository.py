@@ -1,5 +1,5 @@
-from typing import List, Optional
-from sqlalchemy import select, and_
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
@@ -19,6 +19,7 @@ class UserAnswerRepository:
             user_id=user_answer.user_id,
             question_id=user_answer.question_id,
             selected_answer_id=user_answer.selected_answer_id,
+            attempt_id=user_answer.attempt_id,
             is_correct=user_answer.is_correct,
             answered_at=user_answer.answered_at,
         )
@@ -53,6 +54,96 @@ class UserAnswerRepository:
         user_answers = res.scalars().all()
         return [self._to_response(ua) for ua in user_answers]
 
+    async def get_test_watermark(self, test_id: int) -> Tuple[int, Optional[int], Optional[datetime]]:
+        """
+        (число ответов, максимальный id, последнее изменение) по тесту —
+        меняется, когда приходят новые ответы, удаляются или правятся старые
+        """
+        from models.questions import Question
+
+        stmt = (
+            select(func.count(UserAnswer.id), func.max(UserAnswer.id), func.max(UserAnswer.updated_at))
+            .join(Question, Question.id == UserAnswer.question_id)
+            .where(Question.test_id == test_id)
+        )
+        res = await self.db.execute(stmt)
+        count, max_id, last_updated_at = res.one()
+        return count, max_id, last_updated_at
+
+    async def get_test_answer_rows(self, test_id: int) -> Sequence[Tuple[int, Optional[int], int, Optional[int], bool]]:
+        """
+        Все ответы по тесту одним запросом, без ORM-объектов:
+        (user_id, attempt_id, question_id, selected_answer_id, is_correct)
+        """
+        from models.questions import Question
+
+        stmt = (
+            select(
+                UserAnswer.user_id,
+                UserAnswer.attempt_id,
+                UserAnswer.question_id,
+                UserAnswer.selected_answer_id,
+                UserAnswer.is_correct,
+            )
+            .join(Question, Question.id == UserAnswer.question_id)
+            .where(Question.test_id == test_id)
+        )
+        res = await self.db.execute(stmt)
+        return res.all()
+
+    @staticmethod
+    def export_query(
+        user_id: Optional[int] = None,
+        test_id: Optional[int] = None,
+        course_id: Optional[int] = None,
+        company_id: Optional[int] = None,
+    ):
+        """
+        select для выгрузки ответов: каждая строка уже соединена с пользователем,
+        тестом, текстом вопроса и выбранного ответа. Порядок — по id ответа.
+        """
+        from models.questions import Question
+        from models.answers import Answer
+        from models.tests import Tests
+        from models.users import Users
+
+        stmt = (
+            select(
+                UserAnswer.id,
+                UserAnswer.answered_at,
+                UserAnswer.attempt_id,
+                Users.id,
+                Users.login,
+                Users.last_name,
+                Users.first_name,
+                Users.email,
+                Users.company_id,
+                Tests.course_id,
+                Tests.id,
+                Tests.title,
+                Question.id,
+                Question.question_text,
+                UserAnswer.selected_answer_id,
+                Answer.answer_text,
+                UserAnswer.is_correct,
+            )
+            .join(Users, Users.id == UserAnswer.user_id)
+            .join(Question, Question.id == UserAnswer.question_id)
+            .join(Tests, Tests.id == Question.test_id)
+            .join(Answer, Answer.id == UserAnswer.selected_answer_id, isouter=True)
+        )
+
+        if user_id is not None:
+            stmt = stmt.where(UserAnswer.user_id == user_id)
+        if test_id is not None:
+            stmt = stmt.where(Question.test_id == test_id)
+        if course_id is not None:
+            stmt = stmt.where(Tests.course_id == course_id)
+        if company_id is not None:
+            stmt = stmt.where(Users.company_id == company_id)
+
+        return stmt.order_by(UserAnswer.id.asc())
+
     async def get_by_id(self, user_answer_id: int) -> Optional[UserAnswerResponse]:
         """Получить ответ пользователя по ID"""
         user_answer = await self.db.get(UserAnswer, user_answer_id)
@@ -60,30 +151,47 @@ class UserAnswerRepository:
             return None
         return self._to_response(user_answer)
 
+    async def _get_latest(self, user_id: int, question_id: int) -> Optional[UserAnswer]:
+        """
+        Последний ответ на вопрос: при нескольких попытках
+        у пользователя несколько строк на один вопрос.
+        """
+        stmt = (
+            select(UserAnswer)
+            .where(
+                and_(
+                    UserAnswer.user_id == user_id,
+                    UserAnswer.question_id == question_id
+                )
+            )
+            .order_by(UserAnswer.id.desc())
+            .limit(1)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def get_by_user_and_question(
         self,
         user_id: int,
         question_id: int
     ) -> Optional[UserAnswerResponse]:
-        """Получить ответ пользователя на конкретный вопрос"""
-        stmt = select(UserAnswer).where(
-            and_(
-                UserAnswer.user_id == user_id,
-                UserAnswer.question_id == question_id
-            )
-        )
-        result = await self.db.execute(stmt)
-        user_answer = result.scalar_one_or_none()
+        """Получить последний ответ пользователя на конкретный вопрос (по всем попыткам)"""
+        user_answer = await self._get_latest(user_id, question_id)
         if not user_answer:
             return None
         return self._to_response(user_answer)
 
-    async def create(self, user_answer: UserAnswerCreate) -> UserAnswerResponse:
-        """Создать новый ответ пользователя"""
+    async def create(
+        self,
+        user_answer: UserAnswerCreate,
+        attempt_id: Optional[int] = None,
+    ) -> UserAnswerResponse:
+        """Создать новый ответ пользователя (attempt_id — попытка, в рамках которой дан ответ)"""
         user_answer_obj = UserAnswer(
             user_id=user_answer.user_id,
             question_id=user_answer.question_id,
             selected_answer_id=user_answer.selected_answer_id,
+            attempt_id=attempt_id,
             is_correct=user_answer.is_correct,
             answered_at=datetime.utcnow(),
         )
@@ -130,15 +238,8 @@ class UserAnswerRepository:
         return True
 
     async def delete_by_user_and_question(self, user_id: int, question_id: int) -> bool:
-        """Удалить ответ пользователя на конкретный вопрос"""
-        stmt = select(UserAnswer).where(
-            and_(
-                UserAnswer.user_id == user_id,
-                UserAnswer.question_id == question_id
-            )
-        )
-        result = await self.db.execute(stmt)
-        user_answer = result.scalar_one_or_none()
+        """Удалить последний ответ пользователя на конкретный вопрос"""
+        user_answer = await self._get_latest(user_id, question_id)
         if not user_answer:
             return False
         await self.db.delete(user_answer)
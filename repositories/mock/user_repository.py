@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Set, Tuple
 from datetime import datetime
 
-from sqlalchemy import select, or_, func
+from sqlalchemy import select, insert, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
+from core.security import invalidate_principal
 from models.users import Users
 from models.roles import Role
+from models.course_enrollments import CourseEnrollment
+from utils.pagination import decode_cursor
+
+
+def _like_pattern(value: str) -> str:
+    """Шаблон для ILIKE '%value%' с экранированием спецсимволов LIKE"""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
 
 
 def _to_public_dict(user: Users, role_title: Optional[str] = None) -> Dict[str, Any]:
@@ -53,6 +62,109 @@ class UserRepository:
         rows = res.all()
         return [_to_public_dict(u, role_title=title) for u, title in rows]
 
+    async def search(
+        self,
+        search: Optional[str] = None,
+        role_titles: Optional[List[str]] = None,
+        role_id: Optional[int] = None,
+        company_id: Optional[int] = None,
+        department_id: Optional[int] = None,
+        position_id: Optional[int] = None,
+        only_user_id: Optional[int] = None,
+        students_of_trainer_id: Optional[int] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Поиск и фильтрация пользователей на стороне БД.
+        Возвращает (страница, общее количество подходящих пользователей).
+
+        only_user_id / students_of_trainer_id — ограничения видимости
+        (студент видит себя, тренер — студентов своих курсов).
+        search использует ILIKE по trigram-индексам на ФИО, логине и email.
+        """
+        conditions = []
+
+        if search and search.strip():
+            pattern = _like_pattern(search.strip())
+            conditions.append(
+                or_(
+                    Users.first_name.ilike(pattern, escape="\\"),
+                    Users.last_name.ilike(pattern, escape="\\"),
+                    Users.login.ilike(pattern, escape="\\"),
+                    Users.email.ilike(pattern, escape="\\"),
+                )
+            )
+
+        # Фильтрация по роли (title) - приоритетный способ, role_id — для обратной совместимости
+        if role_titles:
+            conditions.append(func.lower(Role.title).in_([t.lower() for t in role_titles]))
+        elif role_id is not None:
+            conditions.append(Users.role_id == role_id)
+
+        if company_id is not None:
+            conditions.append(Users.company_id == company_id)
+        if department_id is not None:
+            conditions.append(Users.department_id == department_id)
+        if position_id is not None:
+            conditions.append(Users.position_id == position_id)
+
+        if only_user_id is not None:
+            conditions.append(Users.id == only_user_id)
+        if students_of_trainer_id is not None:
+            from repositories.mock.enrollment_repository import EnrollmentRepository
+
+            conditions.append(
+                Users.id.in_(EnrollmentRepository.students_of_trainer_query(students_of_trainer_id))
+            )
+
+        count_stmt = select(func.count(Users.id))
+        if role_titles:
+            count_stmt = count_stmt.join(Role, Role.id == Users.role_id)
+        if conditions:
+            count_stmt = count_stmt.where(*conditions)
+
+        stmt = (
+            select(Users, Role.title)
+            .join(Role, Role.id == Users.role_id, isouter=True)
+            .order_by(Users.id.asc())
+        )
+        if conditions:
+            stmt = stmt.where(*conditions)
+
+        # keyset по id, если передан курсор, иначе offset
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            try:
+                last_id = int(last_id)
+            except (TypeError, ValueError) as e:
+                raise ValueError("Некорректный курсор") from e
+            stmt = stmt.where(Users.id > last_id).limit(limit)
+        else:
+            stmt = stmt.limit(limit).offset(offset)
+
+        total = (await self.db.execute(count_stmt)).scalar_one()
+        res = await self.db.execute(stmt)
+        users = [_to_public_dict(u, role_title=title) for u, title in res.all()]
+        return users, total
+
+    async def get_students_by_course(self, course_id: int) -> List[Dict[str, Any]]:
+        """Студенты, записанные на курс"""
+        stmt = (
+            select(Users, Role.title)
+            .join(Role, Role.id == Users.role_id, isouter=True)
+            .join(
+                CourseEnrollment,
+                (CourseEnrollment.user_id == Users.id)
+                & (CourseEnrollment.course_id == course_id)
+                & (CourseEnrollment.enrollment_type == "student"),
+            )
+            .order_by(Users.id.asc())
+        )
+        res = await self.db.execute(stmt)
+        return [_to_public_dict(u, role_title=title) for u, title in res.all()]
+
     async def get_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
         stmt = (
             select(Users, Role.title)
@@ -167,6 +279,48 @@ class UserRepository:
         
         return _to_public_dict(user_obj, role_title=role_title)
 
+    async def get_taken_logins_and_emails(
+        self,
+        logins: Iterable[str],
+        emails: Iterable[str],
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Какие из переданных логинов/email уже заняты — одним запросом.
+        Сравнение без учета регистра, результат в нижнем регистре.
+        """
+        logins = {l.strip().lower() for l in logins if l and l.strip()}
+        emails = {e.strip().lower() for e in emails if e and e.strip()}
+        if not logins and not emails:
+            return set(), set()
+
+        login_lower = func.lower(Users.login)
+        email_lower = func.lower(Users.email)
+        stmt = select(login_lower, email_lower).where(
+            or_(login_lower.in_(logins), email_lower.in_(emails))
+        )
+        res = await self.db.execute(stmt)
+
+        taken_logins: Set[str] = set()
+        taken_emails: Set[str] = set()
+        for login, email in res.all():
+            if login in logins:
+                taken_logins.add(login)
+            if email in emails:
+                taken_emails.add(email)
+        return taken_logins, taken_emails
+
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Вставка пачки пользователей одним INSERT ... VALUES ... RETURNING id.
+        rows — значения колонок Users; id возвращаются в порядке rows.
+        Коммит — на вызывающей стороне.
+        """
+        if not rows:
+            return []
+        stmt = insert(Users).returning(Users.id, sort_by_parameter_order=True)
+        res = await self.db.execute(stmt, rows)
+        return list(res.scalars().all())
+
     async def update_user(self, user_id: int, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         user = await self.db.get(Users, user_id)
         if not user:
@@ -181,6 +335,8 @@ class UserRepository:
             await self.db.rollback()
             raise
 
+        invalidate_principal(user_id)
+
         await self.db.refresh(user)
         
         # Получаем роль по title после обновления
@@ -198,6 +354,7 @@ class UserRepository:
             return False
         await self.db.delete(user)
         await self.db.commit()
+        invalidate_principal(user_id)
         return True
 
     async def update_last_login(self, user_id: int) -> Optional[Dict[str, Any]]:
@@ -207,6 +364,7 @@ class UserRepository:
 
         user.last_login = datetime.utcnow()
 
+        # last_login не влияет на права пользователя — кэш и токены не сбрасываем
         await self.db.commit()
         await self.db.refresh(user)
         
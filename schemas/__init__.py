@@ -5,12 +5,30 @@ from .course import (
     CourseUpdate,
     CourseResponse,
     CourseDetailResponse,
+    CourseBulkEnrollRequest,
+    CourseBulkEnrollResponse,
+    CourseProgressResponse,
+    CourseStudentProgressResponse,
+    CourseImageVariant,
+    CourseImageDerivatives,
 )
 from .module import ModuleBase, ModuleCreate, ModuleUpdate, ModuleResponse
 from .lesson import LessonBase, LessonCreate, LessonUpdate, LessonResponse
 from .test import TestBase, TestCreate, TestUpdate, TestResponse, TestDetailResponse
 from .question import QuestionBase, QuestionCreate, QuestionUpdate, QuestionResponse
 from .answer import AnswerBase, AnswerCreate, AnswerUpdate, AnswerResponse
-from .user_answer import UserAnswerBase, UserAnswerCreate, UserAnswerUpdate, UserAnswerResponse
+from .user_answer import (
+    UserAnswerBase,
+    UserAnswerCreate,
+    UserAnswerUpdate,
+    UserAnswerResponse,
+    TestSubmitAnswer,
+    TestSubmitRequest,
+    TestSubmitQuestionResult,
+    TestSubmitResponse,
+)
+from .test_attempt import TestAttemptResponse
+from .analytics import AnswerOptionStats, QuestionItemStats, TestItemAnalysisResponse
 from .task import TaskBase, TaskCreate, TaskUpdate, TaskResponse
 from .material import MaterialBase, MaterialCreate, MaterialUpdate, MaterialResponse
+from .file import UploadedFileResponse
@@ -0,0 +1,34 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class AnswerOptionStats(BaseModel):
+    answer_id: int
+    answer_text: str
+    is_correct: bool
+    selected_count: int = Field(..., description="Сколько раз вариант выбран")
+    selection_rate: float = Field(..., description="Доля ответивших на вопрос, выбравших вариант")
+    mean_total_score: Optional[float] = Field(None, description="Средний балл за тест у выбравших вариант")
+
+
+class QuestionItemStats(BaseModel):
+    question_id: int
+    question_text: str
+    question_type: str
+    responses: int = Field(..., description="Сколько респондентов ответили на вопрос")
+    correct_rate: Optional[float] = Field(None, description="Трудность: доля правильных ответов среди ответивших")
+    discrimination: Optional[float] = Field(
+        None,
+        description="Точечно-бисериальная корреляция правильности с баллом за остальные вопросы",
+    )
+    options: List[AnswerOptionStats] = []
+
+
+class TestItemAnalysisResponse(BaseModel):
+    test_id: int
+    respondents: int = Field(..., description="Число попыток (для ответов без попытки — пользователей)")
+    answers_count: int
+    mean_score: Optional[float] = Field(None, description="Средний балл (число правильных ответов)")
+    computed_at: datetime
+    questions: List[QuestionItemStats] = []
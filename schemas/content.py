@@ -1,5 +1,6 @@
 from typing import List, Literal, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
+from core.media_urls import absolute_media_url
 
 
 class ModuleItemBase(BaseModel):
@@ -17,6 +18,10 @@ class LessonItem(ModuleItemBase):
     content_url: Optional[str] = None
     lesson_type: str
 
+    @field_serializer("content_url", when_used="json")
+    def _serialize_content_url(self, value: Optional[str]) -> Optional[str]:
+        return absolute_media_url(value)
+
 
 class CourseContentResponse(BaseModel):
     id: int
@@ -1,5 +1,8 @@
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from datetime import datetime
+from pydantic import BaseModel, Field, field_serializer, field_validator, model_validator
+from core.config import settings
+from core.media_urls import absolute_media_url, relative_media_url
 from .common import CourseStatus
 from .lesson import LessonResponse  # ← вложенность: курс → уроки
 
@@ -16,7 +19,7 @@ class CourseBase(BaseModel):
 
 
 class CourseCreate(CourseBase):
-    pass
+    _normalize_image_url = field_validator("image_url", mode="before")(relative_media_url)
 
 
 class CourseUpdate(BaseModel):
@@ -29,10 +32,41 @@ class CourseUpdate(BaseModel):
     requirements: Optional[List[str]] = None
     what_you_learn: Optional[List[str]] = None
 
+    _normalize_image_url = field_validator("image_url", mode="before")(relative_media_url)
+
+
+DEFAULT_COURSE_IMAGE_URL = f"{settings.STATIC_URL}/default_course_image.jpg"
+
+
+class CourseImageVariant(BaseModel):
+    width: int
+    webp_url: str
+    jpeg_url: str
+
+    @field_serializer("webp_url", "jpeg_url", when_used="json")
+    def _serialize_url(self, value: str) -> str:
+        return absolute_media_url(value)
+
+
+class CourseImageDerivatives(BaseModel):
+    """Уменьшенные копии обложки курса (для srcset) и размытое превью"""
+    width: int = Field(..., description="Ширина исходного изображения")
+    height: int = Field(..., description="Высота исходного изображения")
+    placeholder: Optional[str] = Field(None, description="data:URI размытого превью 16px")
+    variants: List[CourseImageVariant] = []
+
 
 class CourseResponse(CourseBase):
     id: int
     status: CourseStatus
+    created_at: Optional[datetime] = None
+    # Прогресс текущего студента (только в списках курсов студента)
+    progress_percentage: Optional[float] = None
+    image_derivatives: Optional[CourseImageDerivatives] = None
+
+    @field_serializer("image_url", when_used="json")
+    def _serialize_image_url(self, value: Optional[str]) -> str:
+        return absolute_media_url(value or DEFAULT_COURSE_IMAGE_URL)
 
     class Config:
         from_attributes = True
@@ -40,4 +74,42 @@ class CourseResponse(CourseBase):
 
 class CourseDetailResponse(CourseResponse):
     lessons: List[LessonResponse] = []
-    enrollment_info: Optional[Dict[str, Any]] = None
\ No newline at end of file
+    enrollment_info: Optional[Dict[str, Any]] = None
+
+
+class CourseBulkEnrollRequest(BaseModel):
+    """Кого записать на курс: явные id, участники группы и/или сотрудники отдела"""
+    student_ids: List[int] = Field(default_factory=list)
+    group_id: Optional[int] = None
+    department_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def source_required(self):
+        if not self.student_ids and self.group_id is None and self.department_id is None:
+            raise ValueError("Укажите student_ids, group_id или department_id")
+        return self
+
+
+class CourseBulkEnrollResponse(BaseModel):
+    requested: int
+    inserted: int
+    skipped: int
+
+
+class CourseProgressResponse(BaseModel):
+    """Прогресс студента по курсу"""
+    course_id: int
+    user_id: int
+    enrolled_at: Optional[datetime] = None
+    completed_lessons: int = 0
+    progress_percentage: float = 0.0
+    current_lesson_id: Optional[int] = None
+    last_activity_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    is_active: bool = True
+
+
+class CourseStudentProgressResponse(CourseProgressResponse):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
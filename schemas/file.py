@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class UploadedFileResponse(BaseModel):
+    url: str = Field(..., description="Путь для content_url/file_path, например /uploads/videos/ab/ab12....mp4")
+    sha256: str = Field(..., description="SHA-256 содержимого")
+    size: int = Field(..., description="Размер файла, байт")
+    category: str = Field(..., description="Категория (videos, pdfs, photos, docs, audio, other)")
+    original_filename: str
+    deduplicated: bool = Field(..., description="Файл с таким содержимым уже был загружен")
@@ -1,5 +1,6 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, field_serializer, field_validator
+from core.media_urls import absolute_media_url, relative_media_url
 from .common import ContentType, LessonType
 
 
@@ -18,7 +19,7 @@ class LessonBase(BaseModel):
 
 
 class LessonCreate(LessonBase):
-    pass
+    _normalize_content_url = field_validator("content_url", mode="before")(relative_media_url)
 
 
 class LessonUpdate(BaseModel):
@@ -32,9 +33,16 @@ class LessonUpdate(BaseModel):
     lesson_type: Optional[LessonType] = None
     is_published: Optional[bool] = None
 
+    _normalize_content_url = field_validator("content_url", mode="before")(relative_media_url)
+
 
 class LessonResponse(LessonBase):
     id: int
 
+    # В модели путь хранится как в БД; полный (подписанный) URL — только в JSON ответа
+    @field_serializer("content_url", when_used="json")
+    def _serialize_content_url(self, value: Optional[str]) -> Optional[str]:
+        return absolute_media_url(value)
+
     class Config:
         from_attributes = True
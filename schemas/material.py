@@ -1,5 +1,6 @@
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer, field_validator
+from core.media_urls import absolute_media_url, relative_media_url
 
 
 class MaterialBase(BaseModel):
@@ -11,7 +12,7 @@ class MaterialBase(BaseModel):
 
 
 class MaterialCreate(MaterialBase):
-    pass
+    _normalize_file_path = field_validator("file_path", mode="before")(relative_media_url)
 
 
 class MaterialUpdate(BaseModel):
@@ -21,10 +22,16 @@ class MaterialUpdate(BaseModel):
     file_path: Optional[str] = Field(None, max_length=256)
     course_id: Optional[int] = None
 
+    _normalize_file_path = field_validator("file_path", mode="before")(relative_media_url)
+
 
 class MaterialResponse(MaterialBase):
     id: int
 
+    @field_serializer("file_path", when_used="json")
+    def _serialize_file_path(self, value: str) -> str:
+        return absolute_media_url(value)
+
     class Config:
         from_attributes = True
 
@@ -0,0 +1,19 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class TestAttemptResponse(BaseModel):
+    id: int
+    test_id: int
+    user_id: int
+    status: str = Field(..., description="in_progress, finished или expired")
+    started_at: datetime
+    deadline_at: Optional[datetime] = Field(None, description="Крайний срок сдачи (если у теста есть лимит времени)")
+    finished_at: Optional[datetime] = None
+    score: Optional[float] = Field(None, description="Процент правильных ответов")
+    correct_answers: Optional[int] = None
+    total_questions: Optional[int] = None
+
+    class Config:
+        from_attributes = True
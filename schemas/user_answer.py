@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -21,8 +21,35 @@ class UserAnswerUpdate(BaseModel):
 
 class UserAnswerResponse(UserAnswerBase):
     id: int
+    attempt_id: Optional[int] = None
     answered_at: datetime
 
     class Config:
         from_attributes = True
 
+
+class TestSubmitAnswer(BaseModel):
+    question_id: int = Field(..., description="ID вопроса")
+    selected_answer_ids: List[int] = Field(default_factory=list, description="ID выбранных ответов")
+
+
+class TestSubmitRequest(BaseModel):
+    answers: List[TestSubmitAnswer] = Field(default_factory=list, description="Ответы на вопросы теста")
+
+
+class TestSubmitQuestionResult(BaseModel):
+    question_id: int
+    selected_answer_ids: List[int] = []
+    is_correct: bool
+
+
+class TestSubmitResponse(BaseModel):
+    test_id: int
+    attempt_id: int
+    user_id: int
+    total_questions: int
+    answered_questions: int
+    correct_answers: int
+    score: float = Field(..., description="Процент правильных ответов от числа вопросов теста")
+    submitted_at: datetime
+    results: List[TestSubmitQuestionResult] = []
@@ -84,4 +84,23 @@ class UserResponse(BaseModel):
     rating: Optional[int] = 0
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class UserBulkCreated(BaseModel):
+    row: int
+    id: int
+    login: str
+
+
+class UserBulkError(BaseModel):
+    row: int
+    login: Optional[str] = None
+    email: Optional[str] = None
+    detail: str
+
+
+class UserBulkCreateResponse(BaseModel):
+    created_count: int
+    error_count: int
+    created: List[UserBulkCreated] = Field(default_factory=list)
+    errors: List[UserBulkError] = Field(default_factory=list)
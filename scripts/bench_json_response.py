@@ -0,0 +1,99 @@
+"""
+Бенчмарк кодирования больших списков: стандартный путь FastAPI (response_model)
+против core.responses.PydanticJSONResponse.
+
+Поднимается минимальное приложение с двумя одинаковыми эндпоинтами, отдающими
+N уже провалидированных моделей (как из репозитория), и оба вызываются напрямую
+через ASGI — без сети, чтобы замерялась только сериализация ответа.
+Проверяется, что тела ответов совпадают.
+
+Запуск из корня проекта:
+    python -m scripts.bench_json_response --items 5000 --requests 50
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import List
+
+from fastapi import FastAPI
+
+from core.responses import PydanticJSONResponse
+from schemas import UserAnswerResponse
+
+
+def _items(count: int) -> List[UserAnswerResponse]:
+    return [
+        UserAnswerResponse(
+            id=i,
+            user_id=i % 500,
+            question_id=i % 40,
+            selected_answer_id=i,
+            is_correct=bool(i % 2),
+            answered_at=datetime(2026, 1, 1, 10, 0, i % 60),
+        )
+        for i in range(count)
+    ]
+
+
+def _app(items: List[UserAnswerResponse]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/standard", response_model=List[UserAnswerResponse])
+    async def standard():
+        return items
+
+    @app.get("/fast", response_model=List[UserAnswerResponse])
+    async def fast():
+        return PydanticJSONResponse(items, List[UserAnswerResponse])
+
+    return app
+
+
+async def _call(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 0), "server": ("test", 80),
+    }
+    body = bytearray()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return bytes(body)
+
+
+async def _run(items_count: int, requests: int) -> None:
+    app = _app(_items(items_count))
+
+    standard, fast = await _call(app, "/standard"), await _call(app, "/fast")
+    assert json.loads(standard) == json.loads(fast), "тела ответов различаются"
+
+    for path in ("/standard", "/fast"):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await _call(app, path)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{path:<10} items={items_count} {requests / elapsed:8.1f} req/s "
+            f"{elapsed / requests * 1000:8.1f} ms/req"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000, help="элементов в ответе")
+    parser.add_argument("--requests", type=int, default=50, help="запросов на каждый эндпоинт")
+    args = parser.parse_args()
+    asyncio.run(_run(args.items, args.requests))
+
+
+if __name__ == "__main__":
+    main()
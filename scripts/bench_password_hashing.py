@@ -0,0 +1,84 @@
+"""
+Бенчмарк проверки паролей при параллельных логинах.
+
+Запускает N одновременных проверок bcrypt так же, как это делает /auth/login,
+и параллельно — "фоновый трафик": задачу, которая каждые 10 мс просыпается
+и замеряет, насколько event loop опоздал ее разбудить. Сравниваются два режима:
+
+  * sync  — verify_password прямо в корутине (как было раньше);
+  * async — verify_password_async через пул потоков.
+
+В режиме sync логины выполняются строго по очереди и весь остальной трафик
+стоит; в режиме async задержка event loop остается на уровне миллисекунд.
+
+Запуск из корня проекта:
+    python -m scripts.bench_password_hashing --logins 32
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from core.config import settings
+from core.security import hash_password, verify_password, verify_password_async
+
+TICK_SECONDS = 0.01
+
+
+async def _heartbeat(stop: asyncio.Event, lags: List[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - started - TICK_SECONDS)
+
+
+async def _login_sync(password: str, hashed: str) -> bool:
+    return verify_password(password, hashed)
+
+
+async def _login_async(password: str, hashed: str) -> bool:
+    return await verify_password_async(password, hashed)
+
+
+async def _run(mode: str, logins: int, password: str, hashed: str) -> None:
+    login = _login_sync if mode == "sync" else _login_async
+
+    stop = asyncio.Event()
+    lags: List[float] = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    await asyncio.sleep(TICK_SECONDS * 2)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login(password, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await heartbeat
+    assert all(results)
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{mode:<5} logins={logins:<4} total={elapsed:7.2f}s "
+        f"throughput={logins / elapsed:7.1f}/s "
+        f"loop lag: median={statistics.median(lags_ms):7.1f}ms "
+        f"p99={p99:7.1f}ms max={lags_ms[-1]:7.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32, help="число одновременных логинов")
+    args = parser.parse_args()
+
+    password = "benchmark-password"
+    hashed = hash_password(password)
+    print(f"PASSWORD_HASH_WORKERS={settings.PASSWORD_HASH_WORKERS}")
+
+    for mode in ("sync", "async"):
+        asyncio.run(_run(mode, args.logins, password, hashed))
+
+
+if __name__ == "__main__":
+    main()
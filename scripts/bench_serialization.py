@@ -0,0 +1,134 @@
+"""
+Микробенчмарк сборки ответов со ссылками на медиа.
+
+Сравниваются два способа для N курсов и N уроков:
+
+  * legacy  — как было раньше: сервис делает model_dump(), дописывает SERVER_URL
+              к image_url/content_url и создает вторую модель (повторная валидация);
+  * current — сервис отдает модели из репозитория как есть, полный URL подставляет
+              field_serializer при сериализации в JSON.
+
+В обоих случаях затем выполняется то же, что FastAPI делает с response_model
+(model_dump -> валидация -> JSON), чтобы цифры соответствовали реальному запросу.
+Замеряются время и пик выделенной памяти (tracemalloc) на этапе сервиса
+и на всем пути до байтов ответа.
+
+Запуск из корня проекта:
+    python -m scripts.bench_serialization --count 10000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from pydantic import TypeAdapter
+
+from core.config import settings
+from core.media_urls import absolute_media_url, set_media_viewer
+from schemas import CourseResponse, CourseStatus, LessonResponse
+from schemas.common import ContentType, LessonType
+
+
+def _courses(count: int) -> List[CourseResponse]:
+    return [
+        CourseResponse(
+            id=i,
+            title=f"Курс {i}",
+            description="Описание курса " * 5,
+            image_url=f"/uploads/photos/{i % 256:02x}/{i:064x}.png" if i % 3 else None,
+            tags=["python", "sql"],
+            status=CourseStatus.PUBLISHED,
+            created_at=datetime(2026, 1, 1),
+        )
+        for i in range(count)
+    ]
+
+
+def _lessons(count: int) -> List[LessonResponse]:
+    return [
+        LessonResponse(
+            id=i,
+            course_id=i // 20,
+            title=f"Урок {i}",
+            content_type=ContentType.VIDEO,
+            content_url=f"/uploads/videos/{i % 256:02x}/{i:064x}.mp4",
+            duration_minutes=15,
+            order=i % 20,
+            lesson_type=LessonType.THEORY,
+        )
+        for i in range(count)
+    ]
+
+
+def _legacy_courses(courses: List[CourseResponse]) -> List[CourseResponse]:
+    result = []
+    for course in courses:
+        data = course.model_dump()
+        data["image_url"] = absolute_media_url(data["image_url"]) if data["image_url"] else (
+            f"{settings.SERVER_URL}{settings.STATIC_URL}/default_course_image.jpg"
+        )
+        result.append(CourseResponse(**data))
+    return result
+
+
+def _legacy_lessons(lessons: List[LessonResponse]) -> List[LessonResponse]:
+    result = []
+    for lesson in lessons:
+        data = lesson.model_dump()
+        data["content_url"] = absolute_media_url(data["content_url"])
+        result.append(LessonResponse(**data))
+    return result
+
+
+def _fastapi_encode(adapter: TypeAdapter, items: list) -> bytes:
+    # FastAPI: model_dump -> валидация по response_model -> JSON
+    validated = adapter.validate_python([item.model_dump() for item in items])
+    return adapter.dump_json(validated)
+
+
+def _measure(fn: Callable[[], object]) -> Tuple[float, float]:
+    # время и память — в разных прогонах: tracemalloc сильно замедляет выполнение
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10000, help="число курсов и уроков")
+    args = parser.parse_args()
+
+    set_media_viewer(1)
+    courses, lessons = _courses(args.count), _lessons(args.count)
+    course_adapter = TypeAdapter(List[CourseResponse])
+    lesson_adapter = TypeAdapter(List[LessonResponse])
+
+    cases = [
+        ("courses", courses, _legacy_courses, course_adapter),
+        ("lessons", lessons, _legacy_lessons, lesson_adapter),
+    ]
+    for name, items, legacy, adapter in cases:
+        # legacy и current должны давать одинаковые байты (подпись стабильна в пределах интервала)
+        assert _fastapi_encode(adapter, legacy(items)) == _fastapi_encode(adapter, items)
+
+        rows = [
+            ("legacy service", lambda: legacy(items)),
+            ("current service", lambda: list(items)),
+            ("legacy full", lambda: _fastapi_encode(adapter, legacy(items))),
+            ("current full", lambda: _fastapi_encode(adapter, items)),
+        ]
+        print(f"{name} x{args.count}")
+        for label, fn in rows:
+            ms, mib = _measure(fn)
+            print(f"  {label:<16} {ms:9.1f} ms   peak {mib:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
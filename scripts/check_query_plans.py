@@ -0,0 +1,223 @@
+"""
+Проверка планов запросов репозиториев на локальном Postgres.
+
+Скрипт в одной транзакции создает схему во временном schema, заполняет её
+данными, вызывает канонические методы репозиториев, перехватывает их SQL
+и прогоняет каждый запрос через EXPLAIN. Если на «горячих» таблицах
+встречается Seq Scan, скрипт завершается с кодом 1. В конце транзакция
+откатывается — в базе ничего не остается.
+
+Запуск из корня проекта:
+    python -m scripts.check_query_plans
+
+Подключение берется из DATABASE_URL_ASYNC (можно переопределить
+переменной QUERY_PLAN_DATABASE_URL).
+"""
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from core.config import DATABASE_URL_ASYNC
+from core.db import Base
+import models  # noqa: F401  регистрирует все таблицы в Base.metadata
+
+from repositories.mock.course_repository import JsonCourseRepository
+from repositories.mock.enrollment_repository import EnrollmentRepository
+from repositories.mock.lesson_repository import JsonLessonRepository
+from repositories.mock.question_repository import QuestionRepository
+from repositories.mock.task_repository import TaskRepository
+from repositories.mock.test_repository import TestRepository
+from repositories.mock.user_answer_repository import UserAnswerRepository
+from repositories.mock.user_repository import UserRepository
+from services.event_service import EventService
+
+SCHEMA = "query_plan_check"
+
+USERS = 5000
+COURSES = 200
+EVENTS = 500
+
+# Таблицы, по которым последовательное сканирование считается ошибкой
+CHECKED_TABLES = {
+    "users",
+    "courses",
+    "course_enrollments",
+    "lessons",
+    "tests",
+    "questions",
+    "answers",
+    "user_answer",
+    "events",
+    "attendance",
+    "tasks",
+}
+
+SEED_SQL = [
+    "INSERT INTO roles (id, title) VALUES (1, 'admin'), (2, 'manager'), (3, 'trainer'), (4, 'student')",
+    "INSERT INTO companies (id, name) SELECT g, 'Компания ' || g FROM generate_series(1, 20) g",
+    f"""
+    INSERT INTO users (id, first_name, last_name, email, login, password_hash, created_at, role_id, company_id, is_active)
+    SELECT g, 'Имя' || g, 'Фамилия' || g, 'user' || g || '@example.com', 'user' || g, 'x', now(),
+           CASE WHEN g % 50 = 0 THEN 3 ELSE 4 END, 1 + g % 20, true
+    FROM generate_series(1, {USERS}) g
+    """,
+    f"""
+    INSERT INTO courses (id, title, description, status, duration_hours, created_at)
+    SELECT g, 'Курс ' || g, '', 'published', 0, now() - g * interval '1 minute'
+    FROM generate_series(1, {COURSES}) g
+    """,
+    f"""
+    INSERT INTO course_enrollments (user_id, course_id, enrollment_type, enrolled_at)
+    SELECT g, 1 + g % {COURSES}, 'student', now() FROM generate_series(1, {USERS}) g WHERE g % 50 <> 0
+    """,
+    f"""
+    INSERT INTO course_enrollments (user_id, course_id, enrollment_type, enrolled_at)
+    SELECT 50 * (1 + g % {USERS // 50 - 1}), g, 'trainer', now() FROM generate_series(1, {COURSES}) g
+    """,
+    f"""
+    INSERT INTO lessons (course_id, title, content_type, duration_minutes, "order", lesson_type, is_published, created_at)
+    SELECT 1 + g % {COURSES}, 'Урок ' || g, 'text', 0, g, 'theory', true, now()
+    FROM generate_series(1, {COURSES * 10}) g
+    """,
+    f"""
+    INSERT INTO tests (id, title, course_id, created_at)
+    SELECT g, 'Тест ' || g, g, now() FROM generate_series(1, {COURSES}) g
+    """,
+    f"""
+    INSERT INTO questions (id, test_id, question_text, question_type)
+    SELECT g, 1 + g % {COURSES}, 'Вопрос ' || g, 'single_choice' FROM generate_series(1, {COURSES * 20}) g
+    """,
+    f"""
+    INSERT INTO answers (question_id, answer_text, is_correct)
+    SELECT 1 + g % {COURSES * 20}, 'Ответ ' || g, g % 4 = 0 FROM generate_series(1, {COURSES * 80}) g
+    """,
+    f"""
+    INSERT INTO user_answer (user_id, question_id, is_correct, answered_at)
+    SELECT 1 + g % {USERS}, 1 + g % {COURSES * 20}, false, now() FROM generate_series(1, {USERS * 10}) g
+    """,
+    f"""
+    INSERT INTO events (id, title, trainer_id, start_date, start_time, company_id, updated_at)
+    SELECT g, 'Мероприятие ' || g, 50, current_date + g, make_time(10, 0, 0), 1 + g % 20, now()
+    FROM generate_series(1, {EVENTS}) g
+    """,
+    f"""
+    INSERT INTO attendance (event_id, user_id, invited)
+    SELECT 1 + g % {EVENTS}, 1 + g % {USERS}, 1 FROM generate_series(1, {USERS * 2}) g
+    """,
+    f"""
+    INSERT INTO tasks (title, course_id, created_at, created_by_id)
+    SELECT 'Задание ' || g, 1 + g % {COURSES}, now(), 50 FROM generate_series(1, {COURSES * 10}) g
+    """,
+]
+
+# Канонические запросы: (название, вызов репозитория)
+CHECKS: List[Tuple[str, Callable[[AsyncSession], Awaitable[Any]]]] = [
+    ("EnrollmentRepository.get_courses_for_student", lambda db: EnrollmentRepository(db).get_courses_for_student(1)),
+    ("EnrollmentRepository.get_courses_for_trainer", lambda db: EnrollmentRepository(db).get_courses_for_trainer(50)),
+    ("EnrollmentRepository.get_student_ids_for_trainer", lambda db: EnrollmentRepository(db).get_student_ids_for_trainer(50)),
+    ("JsonCourseRepository.get_all(student scope)", lambda db: JsonCourseRepository(db).get_all(viewer_id=1, enrollment_type="student")),
+    ("JsonLessonRepository.get_by_course", lambda db: JsonLessonRepository(db).get_by_course(1)),
+    ("QuestionRepository.get_all", lambda db: QuestionRepository(db).get_all(test_id=1)),
+    ("TestRepository.get_detail", lambda db: TestRepository(db).get_detail(1)),
+    ("UserAnswerRepository.get_all(user)", lambda db: UserAnswerRepository(db).get_all(user_id=1)),
+    ("UserAnswerRepository.get_by_user_and_question", lambda db: UserAnswerRepository(db).get_by_user_and_question(1, 1)),
+    ("EventService.get_participants", lambda db: EventService(db).get_participants(1)),
+    ("EventService.list_events_with_participants(company)", lambda db: EventService(db).list_events_with_participants(company_id=1, limit=50)),
+    ("EventService.list_events_with_participants(trainer)", lambda db: EventService(db).list_events_with_participants(trainer_id=50, limit=50)),
+    ("EventService.list_events_with_participants(student)", lambda db: EventService(db).list_events_with_participants(participant_id=1, limit=50)),
+    ("TaskRepository.get_all(course)", lambda db: TaskRepository(db).get_all(course_id=1)),
+    ("UserRepository.get_by_login", lambda db: UserRepository(db).get_by_login("USER1")),
+    ("UserRepository.get_by_email", lambda db: UserRepository(db).get_by_email("user1@example.com")),
+    ("UserRepository.search(students of trainer)", lambda db: UserRepository(db).search(students_of_trainer_id=50)),
+]
+
+
+def _seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Имена таблиц из CHECKED_TABLES, которые читаются через Seq Scan"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+async def _seed(conn: AsyncConnection) -> None:
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    await conn.execute(text(f"SET LOCAL search_path TO {SCHEMA}"))
+    await conn.run_sync(Base.metadata.create_all)
+    for sql in SEED_SQL:
+        await conn.execute(text(sql))
+    for table in Base.metadata.sorted_tables:
+        await conn.execute(text(f'ANALYZE "{table.name}"'))
+    # Без seqscan планировщик берет индекс, если он вообще есть
+    await conn.execute(text("SET LOCAL enable_seqscan = off"))
+
+
+async def run_checks(database_url: str) -> int:
+    engine = create_async_engine(database_url)
+    captured: List[Tuple[str, Any]] = []
+    capturing = {"on": False}
+    failures = 0
+
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                await _seed(conn)
+
+                @event.listens_for(conn.sync_connection, "before_cursor_execute")
+                def _capture(_conn, _cursor, statement, parameters, _context, _executemany):
+                    if capturing["on"] and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                        captured.append((statement, parameters))
+
+                session = AsyncSession(
+                    bind=conn,
+                    join_transaction_mode="create_savepoint",
+                    expire_on_commit=False,
+                )
+
+                for name, call in CHECKS:
+                    captured.clear()
+                    capturing["on"] = True
+                    try:
+                        await call(session)
+                    finally:
+                        capturing["on"] = False
+
+                    check_failed = False
+                    for statement, parameters in list(captured):
+                        res = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                        raw = res.scalar_one()
+                        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+                        scans = _seq_scans(plan)
+                        if scans:
+                            failures += 1
+                            check_failed = True
+                            print(f"FAIL {name}: Seq Scan on {', '.join(sorted(set(scans)))}")
+                            print(f"     {' '.join(statement.split())}")
+                    if not check_failed:
+                        print(f"ok   {name} ({len(captured)} queries)")
+
+                await session.close()
+            finally:
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+    print(f"\n{failures} query(ies) with sequential scans")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    database_url = os.getenv("QUERY_PLAN_DATABASE_URL", DATABASE_URL_ASYNC)
+    return asyncio.run(run_checks(database_url))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
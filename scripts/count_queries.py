@@ -0,0 +1,159 @@
+"""
+Подсчет SQL-запросов на «горячих» путях репозиториев.
+
+Для каждого пути скрипт создает схему в пустой in-memory SQLite, заполняет
+данные нескольких размеров, вызывает метод репозитория и считает выполненные
+запросы через before_cursor_execute. Число запросов не должно зависеть от
+объема данных (нет N+1) — иначе скрипт завершается с кодом 1.
+
+Запуск из корня проекта (нужен aiosqlite из requirements-dev.txt):
+    python -m scripts.count_queries
+"""
+import asyncio
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from core.db import Base
+import models  # noqa: F401  регистрирует все таблицы в Base.metadata
+from models.answers import Answer
+from models.course_enrollments import CourseEnrollment
+from models.courses import Courses
+from models.questions import Question
+from models.roles import Role
+from models.tests import Tests
+from models.users import Users
+
+from repositories.mock.course_repository import JsonCourseRepository
+from repositories.mock.question_repository import QuestionRepository
+from repositories.mock.test_repository import TestRepository
+from schemas import QuestionUpdate
+from services.user_service import user_service
+
+DATABASE_URL = "sqlite+aiosqlite://"
+
+# Вопросов в тесте
+QUESTION_COUNTS = (10, 50, 200)
+ANSWERS_PER_QUESTION = 4
+
+# Курсов тренера; на каждом курсе STUDENTS_PER_COURSE студентов (до 10k пользователей)
+COURSE_COUNTS = (50, 500)
+STUDENTS_PER_COURSE = 20
+TRAINER = {"id": 1, "role_id": 3, "role": "trainer"}
+
+
+async def _seed_test(conn: AsyncConnection, questions: int) -> None:
+    """Тест 1 с questions вопросами по ANSWERS_PER_QUESTION вариантов"""
+    await conn.execute(insert(Courses), [{"id": 1, "title": "Курс", "status": "published", "duration_hours": 0}])
+    await conn.execute(insert(Tests), [{"id": 1, "title": "Тест", "course_id": 1}])
+    await conn.execute(insert(Question), [
+        {"id": q, "test_id": 1, "question_text": f"Вопрос {q}", "question_type": "single_choice"}
+        for q in range(1, questions + 1)
+    ])
+    await conn.execute(insert(Answer), [
+        {"question_id": q, "answer_text": f"Ответ {a}", "is_correct": a == 0}
+        for q in range(1, questions + 1)
+        for a in range(ANSWERS_PER_QUESTION)
+    ])
+
+
+async def _seed_trainer(conn: AsyncConnection, courses: int) -> None:
+    """Тренер 1 ведет courses курсов, на каждом STUDENTS_PER_COURSE студентов"""
+    students = courses * STUDENTS_PER_COURSE
+    await conn.execute(insert(Role), [
+        {"id": 1, "title": "admin"}, {"id": 2, "title": "manager"},
+        {"id": 3, "title": "trainer"}, {"id": 4, "title": "student"},
+    ])
+    await conn.execute(insert(Users), [
+        {
+            "id": u,
+            "first_name": f"Имя{u}",
+            "last_name": f"Фамилия{u}",
+            "email": f"user{u}@example.com",
+            "login": f"user{u}",
+            "password_hash": "x",
+            "role_id": 3 if u == 1 else 4,
+        }
+        for u in range(1, students + 2)
+    ])
+    await conn.execute(insert(Courses), [
+        {"id": c, "title": f"Курс {c}", "status": "published", "duration_hours": 0}
+        for c in range(1, courses + 1)
+    ])
+    await conn.execute(insert(CourseEnrollment), [
+        {"user_id": 1, "course_id": c, "enrollment_type": "trainer"}
+        for c in range(1, courses + 1)
+    ] + [
+        {"user_id": u, "course_id": 1 + u % courses, "enrollment_type": "student"}
+        for u in range(2, students + 2)
+    ])
+
+
+Seed = Callable[[AsyncConnection, int], Awaitable[None]]
+Call = Callable[[AsyncSession], Awaitable[Any]]
+
+# (название, заполнение данных, размеры, вызов репозитория)
+CHECKS: List[Tuple[str, Seed, Sequence[int], Call]] = [
+    ("TestRepository.get_detail", _seed_test, QUESTION_COUNTS, lambda db: TestRepository(db).get_detail(1)),
+    ("QuestionRepository.get_all", _seed_test, QUESTION_COUNTS, lambda db: QuestionRepository(db).get_all(test_id=1)),
+    ("QuestionRepository.get_by_id", _seed_test, QUESTION_COUNTS, lambda db: QuestionRepository(db).get_by_id(1)),
+    (
+        "QuestionRepository.update",
+        _seed_test,
+        QUESTION_COUNTS,
+        lambda db: QuestionRepository(db).update(1, QuestionUpdate(question_text="Новый текст")),
+    ),
+    ("UserService.list_users(trainer)", _seed_trainer, COURSE_COUNTS, lambda db: user_service.list_users(db, TRAINER)),
+    ("UserService.apply_visibility(trainer)", _seed_trainer, COURSE_COUNTS, lambda db: user_service.apply_visibility(db, [], TRAINER)),
+    ("JsonCourseRepository.get_students_by_course", _seed_trainer, COURSE_COUNTS, lambda db: JsonCourseRepository(db).get_students_by_course(1)),
+]
+
+
+async def count_queries(seed: Seed, size: int, call: Call) -> int:
+    """Число запросов, которые выполняет call(db) на данных размера size"""
+    engine = create_async_engine(DATABASE_URL)
+    statements: List[str] = []
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await seed(conn, size)
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _count(_conn, _cursor, statement, _parameters, _context, _executemany):
+            statements.append(statement)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await call(session)
+    finally:
+        await engine.dispose()
+
+    return len(statements)
+
+
+async def run_checks() -> int:
+    failures = 0
+    for name, seed, sizes, call in CHECKS:
+        counts: Dict[int, int] = {}
+        for size in sizes:
+            counts[size] = await count_queries(seed, size, call)
+
+        summary = ", ".join(f"{size}: {count}" for size, count in counts.items())
+        if len(set(counts.values())) > 1:
+            failures += 1
+            print(f"FAIL {name}: число запросов растет с объемом данных ({summary})")
+        else:
+            print(f"ok   {name}: {next(iter(counts.values()))} queries ({summary})")
+
+    print(f"\n{failures} path(s) with data-dependent query count")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    return asyncio.run(run_checks())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Создание производных изображений (WebP/JPEG по ширинам и размытое превью)
+для уже лежащих на диске обложек: static/course_images и <UPLOADS_DIR>/photos.
+
+Новые изображения обрабатываются автоматически при загрузке и при смене
+image_url курса; скрипт нужен для первичного заполнения и после смены
+IMAGE_DERIVATIVE_WIDTHS / IMAGE_DERIVATIVE_QUALITY.
+
+Запуск из корня проекта:
+    python -m scripts.generate_image_derivatives [--force]
+"""
+import argparse
+import asyncio
+import os
+import re
+import time
+from typing import List
+
+from core.config import settings
+from services.image_service import generate_image_derivatives, ensure_image_derivatives, shutdown_image_pool
+from utils.images import MANIFEST_SUFFIX
+
+SOURCES = [
+    ("static/course_images", f"{settings.STATIC_URL}/course_images"),
+    (os.path.join(settings.UPLOADS_DIR, "photos"), f"{settings.UPLOADS_URL}/photos"),
+]
+
+SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
+_DERIVATIVE_RE = re.compile(r"^(?P<stem>.+)_\d+$")
+
+
+def _collect_urls() -> List[str]:
+    urls = []
+    for directory, url_prefix in SOURCES:
+        for dirpath, _dirnames, filenames in os.walk(directory):
+            names = set(filenames)
+            for name in sorted(filenames):
+                stem, ext = os.path.splitext(name)
+                if name.startswith(".") or ext.lower() not in SOURCE_EXTENSIONS:
+                    continue
+                # <stem>_<ширина>.webp/.jpg рядом с манифестом <stem> — это производная
+                derived = _DERIVATIVE_RE.match(stem)
+                if derived and f"{derived.group('stem')}{MANIFEST_SUFFIX}" in names:
+                    continue
+                relative = os.path.relpath(os.path.join(dirpath, name), directory).replace(os.sep, "/")
+                urls.append(f"{url_prefix}/{relative}")
+    return urls
+
+
+async def _run(force: bool) -> None:
+    urls = _collect_urls()
+    print(f"Изображений: {len(urls)}, ширины: {settings.IMAGE_DERIVATIVE_WIDTHS}, процессов: {settings.IMAGE_WORKERS}")
+
+    started = time.perf_counter()
+    handler = generate_image_derivatives if force else ensure_image_derivatives
+    await asyncio.gather(*(handler(url) for url in urls))
+    print(f"Готово за {time.perf_counter() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", action="store_true", help="пересоздать производные, даже если они актуальны")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args.force))
+    finally:
+        shutdown_image_pool()
+
+
+if __name__ == "__main__":
+    main()
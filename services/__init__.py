@@ -7,8 +7,12 @@ from .test_service import TestService
 from .question_service import QuestionService
 from .answer_service import AnswerService
 from .user_answer_service import UserAnswerService
+from .test_attempt_service import TestAttemptService
 from .task_service import TaskService
 from .material_service import MaterialService
+from .export_service import ExportService
+from .item_analysis_service import ItemAnalysisService
+from .upload_service import UploadService
 
 __all__ = [
     "CourseService",
@@ -18,6 +22,10 @@ __all__ = [
     "QuestionService",
     "AnswerService",
     "UserAnswerService",
+    "TestAttemptService",
     "TaskService",
     "MaterialService",
+    "ExportService",
+    "ItemAnalysisService",
+    "UploadService",
 ]
@@ -1,18 +1,20 @@
 # services/course_service.py
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from schemas.content import CourseContentResponse, LessonItem
 
 from schemas import (
     CourseResponse,
     CourseDetailResponse,
-    LessonResponse,
     CourseStatus,
     CourseCreate, CourseUpdate,
+    CourseProgressResponse,
 )
 
 from repositories import ICourseRepository, ILessonRepository
-from core.config import settings
+from repositories.mock.progress_repository import ProgressRepository
+from repositories.mock.course_content_cache import course_content_cache
+from services.image_service import get_image_derivatives, get_image_derivatives_version
+from utils.pagination import encode_cursor
 
 
 class CourseService:
@@ -20,9 +22,11 @@ class CourseService:
         self,
         course_repo: ICourseRepository,
         lesson_repo: Optional[ILessonRepository] = None,
+        progress_repo: Optional[ProgressRepository] = None,
     ):
         self.course_repo = course_repo
         self.lesson_repo = lesson_repo
+        self.progress_repo = progress_repo
         
         if not self.lesson_repo:
             raise ValueError("lesson_repo обязателен")
@@ -33,6 +37,9 @@ class CourseService:
         limit: int = 20,
         offset: int = 0,
         search: Optional[str] = None,
+        viewer_id: Optional[int] = None,
+        enrollment_type: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[CourseResponse]:
         status_enum = None
         if status:
@@ -41,74 +48,137 @@ class CourseService:
             except ValueError:
                 status_enum = None
 
-        courses = await self.course_repo.get_all(status_enum, limit, offset, search)
-        return [self._enrich_course_response(c) for c in courses]
+        courses = await self.course_repo.get_all(
+            status_enum,
+            limit,
+            offset,
+            search,
+            viewer_id=viewer_id,
+            enrollment_type=enrollment_type,
+            cursor=cursor,
+        )
+        return [self._with_image_derivatives(c) for c in courses]
+
+    @staticmethod
+    def next_cursor(courses: List[CourseResponse], limit: int) -> Optional[str]:
+        """Курсор следующей страницы или None, если страница последняя"""
+        if not courses or len(courses) < limit:
+            return None
+        last = courses[-1]
+        return encode_cursor(last.created_at, last.id)
 
     async def get_course_by_id(self, course_id: int) -> Optional[CourseResponse]:
         course = await self.course_repo.get_by_id(course_id)
-        return self._enrich_course_response(course) if course else None
+        return self._with_image_derivatives(course) if course else None
+
+    async def get_content_version(self, course_id: int) -> Optional[Tuple]:
+        """Версия курса и уроков (для кэша и ETag); None — курса нет"""
+        return await self.course_repo.get_content_version(course_id)
+
+    async def get_enrollment_info(self, user_id: int, course_id: int) -> Optional[Dict[str, Any]]:
+        if not self.progress_repo:
+            return None
+        progress = await self.progress_repo.get_enrollment_info(user_id, course_id)
+        if not progress:
+            return None
+        return CourseProgressResponse(**progress).model_dump(mode="json")
+
+    async def get_image_version(self, course_id: int, version: Tuple) -> Optional[int]:
+        """
+        Состояние производных обложки курса (для ETag): они появляются
+        в фоне после сохранения курса и не меняют версию курса.
+        Курс берется из course_content_cache, как и в get_course_detail.
+        """
+        loaded = await course_content_cache.get_or_load(
+            "detail", course_id, version, lambda: self._load_course_with_lessons(course_id)
+        )
+        if not loaded:
+            return None
+        course, _ = loaded
+        return get_image_derivatives_version(course.image_url)
+
+    async def _load_course_with_lessons(self, course_id: int):
+        course = await self.course_repo.get_by_id(course_id)
+        if not course:
+            return None
+        # Получаем уроки напрямую по курсу
+        lessons = await self.lesson_repo.get_by_course(course_id)
+        return course, lessons
 
     async def get_course_detail(
         self,
         course_id: int,
         user_id: Optional[int] = None,
+        version: Optional[Tuple] = None,
+        enrollment_info: Optional[Dict[str, Any]] = None,
     ) -> Optional[CourseDetailResponse]:
-        course = await self.course_repo.get_by_id(course_id)
-        if not course:
+        """
+        Курс с уроками. Курс и уроки берутся из course_content_cache по версии
+        (если version не передана — запрашивается); прогресс пользователя не кэшируется.
+        """
+        if version is None:
+            version = await self.get_content_version(course_id)
+            if version is None:
+                return None
+
+        loaded = await course_content_cache.get_or_load(
+            "detail", course_id, version, lambda: self._load_course_with_lessons(course_id)
+        )
+        if not loaded:
             return None
+        course, lessons = loaded
 
-        enriched_course = self._enrich_course_response(course)
-        # Получаем уроки напрямую по курсу
-        lessons = await self.lesson_repo.get_by_course(course_id)
-        
-        enriched_lessons: List[LessonResponse] = []
-        for lesson in lessons:
-            lesson_dict = lesson.model_dump()
-            content_url = lesson_dict.get("content_url")
-            if content_url and (
-                content_url.startswith("/static/") or content_url.startswith("/uploads/")
-            ):
-                lesson_dict["content_url"] = f"{settings.SERVER_URL}{content_url}"
-            enriched_lessons.append(LessonResponse(**lesson_dict))
-
-        enrollment_info = None
-        if user_id:
-            enrollment_info = self._get_mock_enrollment_info(user_id, course_id)
-
-        return CourseDetailResponse(
-            **enriched_course.model_dump(),
-            lessons=enriched_lessons,
+        if enrollment_info is None and user_id:
+            enrollment_info = await self.get_enrollment_info(user_id, course_id)
+
+        # Поля уже провалидированы репозиторием — собираем ответ без повторной валидации;
+        # объекты из кэша не меняются, URL медиа подставляются при сериализации в JSON
+        return CourseDetailResponse.model_construct(
+            **dict(self._with_image_derivatives(course)),
+            lessons=lessons,
             enrollment_info=enrollment_info,
         )
 
     async def create_course(self, course_data: CourseCreate) -> CourseResponse:
         course = await self.course_repo.create(course_data)
-        return self._enrich_course_response(course)
+        return self._with_image_derivatives(course)
 
     async def update_course(self, course_id: int, course_data: CourseUpdate) -> Optional[CourseResponse]:
         updated = await self.course_repo.update(course_id, course_data)
-        return self._enrich_course_response(updated) if updated else None
+        return self._with_image_derivatives(updated) if updated else None
 
     async def delete_course(self, course_id: int) -> bool:
         return await self.course_repo.delete(course_id)
 
     # === helpers ===
-    def _enrich_course_response(self, course: CourseResponse) -> CourseResponse:
-        if not course:
+    @staticmethod
+    def _with_image_derivatives(course: CourseResponse) -> CourseResponse:
+        """Копия курса (без валидации) с размерами обложки, если они уже сгенерированы"""
+        derivatives = get_image_derivatives(course.image_url)
+        if derivatives is None:
             return course
+        return course.model_copy(update={"image_derivatives": derivatives})
 
-        data = course.model_dump()
-
-        image_url = data.get("image_url")
-        if image_url:
-            if image_url.startswith("/static/") or image_url.startswith("/uploads/"):
-                data["image_url"] = f"{settings.SERVER_URL}{image_url}"
-        else:
-            data["image_url"] = f"{settings.SERVER_URL}{settings.STATIC_URL}/default_course_image.jpg"
-
-        return CourseResponse(**data)
+    async def get_course_content(
+        self,
+        course_id: int,
+        version: Optional[Tuple] = None,
+    ) -> CourseContentResponse | None:
+        """
+        Содержимое курса из course_content_cache. URL уроков в нем относительные,
+        полный (подписанный для пользователя) URL подставляет сериализация LessonItem.
+        """
+        if version is None:
+            version = await self.get_content_version(course_id)
+            if version is None:
+                return None
+
+        content = await course_content_cache.get_or_load(
+            "content", course_id, version, lambda: self._load_course_content(course_id)
+        )
+        return content
 
-    async def get_course_content(self, course_id: int) -> CourseContentResponse | None:
+    async def _load_course_content(self, course_id: int) -> CourseContentResponse | None:
         course = await self.course_repo.get_by_id(course_id)
         if not course:
             return None
@@ -129,8 +199,6 @@ class CourseService:
             lesson_type = getattr(l.lesson_type, "value", l.lesson_type)
 
             content_url = getattr(l, "content_url", None)
-            if content_url and (content_url.startswith("/static/") or content_url.startswith("/uploads/")):
-                content_url = f"{settings.SERVER_URL}{content_url}"
 
             items.append(LessonItem(
                 id=l.id,
@@ -153,11 +221,3 @@ class CourseService:
             status=course_status,
             lessons=items,
         )
-
-    def _get_mock_enrollment_info(self, user_id: int, course_id: int) -> Dict[str, Any]:
-        return {
-            "enrolled_at": datetime.now().isoformat(),
-            "progress_percentage": 25.0,
-            "current_lesson_id": 1,
-            "is_active": True,
-        }
@@ -1,7 +1,8 @@
 # services/event_service.py
 from __future__ import annotations
 
-from typing import List
+from datetime import date
+from typing import Dict, Iterable, List, Optional
 
 from fastapi import HTTPException
 from sqlalchemy import select, func
@@ -12,6 +13,7 @@ from models.users import Users  # ✅ ВАЖНО: импорт модели по
 from models.attendances import Attendance
 from repositories.mock.event_repository import EventRepository
 from schemas.event import EventCreate, EventUpdate, EventOut
+from utils.pagination import encode_cursor
 
 
 class EventService:
@@ -66,66 +68,97 @@ class EventService:
         result = await self.db.execute(stmt)
         participants_count = result.scalar() or 0
         
-        # Преобразуем Event в EventOut
-        event_dict = {
-            "id": event.id,
-            "title": event.title,
-            "description": event.description,
-            "trainer_id": event.trainer_id,
-            "company_id": event.company_id,
-            "start_date": event.start_date,
-            "start_time": event.start_time,
-            "location": event.location,
-            "hours_count": event.hours_count,
-            "seats_count": event.seats_count,
-            "format": event.format,
-            "updated_at": event.updated_at,
-            "participants_count": participants_count,
-        }
-        return EventOut(**event_dict)
-
-    async def list_events(self) -> List[Event]:
-        return await self.repo.list_all()
-
-    async def list_events_with_participants(self) -> List[EventOut]:
-        """Получить список событий с количеством участников"""
-        events = await self.list_events()
-        
-        # Получаем количество участников для всех событий одним запросом
-        event_ids = [e.id for e in events]
+        return self._to_out(event, participants_count)
+
+    @staticmethod
+    def _to_out(event: Event, participants_count: int) -> EventOut:
+        """Преобразует Event в EventOut"""
+        return EventOut(
+            id=event.id,
+            title=event.title,
+            description=event.description,
+            trainer_id=event.trainer_id,
+            company_id=event.company_id,
+            start_date=event.start_date,
+            start_time=event.start_time,
+            location=event.location,
+            hours_count=event.hours_count,
+            seats_count=event.seats_count,
+            format=event.format,
+            updated_at=event.updated_at,
+            participants_count=participants_count,
+        )
+
+    async def _participants_counts(self, event_ids: Iterable[int]) -> Dict[int, int]:
+        """Количество участников для нескольких событий одним запросом"""
+        event_ids = list(event_ids)
         if not event_ids:
-            return []
-        
+            return {}
+
         stmt = (
             select(Attendance.event_id, func.count(Attendance.id).label("count"))
             .where(Attendance.event_id.in_(event_ids))
             .group_by(Attendance.event_id)
         )
         result = await self.db.execute(stmt)
-        participants_map = {row[0]: row[1] for row in result.all()}
-        
-        # Формируем ответ
-        events_out = []
-        for event in events:
-            participants_count = participants_map.get(event.id, 0)
-            event_dict = {
-                "id": event.id,
-                "title": event.title,
-                "description": event.description,
-                "trainer_id": event.trainer_id,
-                "company_id": event.company_id,
-                "start_date": event.start_date,
-                "start_time": event.start_time,
-                "location": event.location,
-                "hours_count": event.hours_count,
-                "seats_count": event.seats_count,
-                "format": event.format,
-                "updated_at": event.updated_at,
-                "participants_count": participants_count,
-            }
-            events_out.append(EventOut(**event_dict))
-        
-        return events_out
+        return {row[0]: row[1] for row in result.all()}
+
+    async def list_events(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        company_id: Optional[int] = None,
+        trainer_id: Optional[int] = None,
+        participant_id: Optional[int] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> List[Event]:
+        if date_from is not None and date_to is not None and date_to < date_from:
+            raise ValueError("Дата окончания раньше даты начала")
+
+        return await self.repo.list_range(
+            date_from=date_from,
+            date_to=date_to,
+            company_id=company_id,
+            trainer_id=trainer_id,
+            participant_id=participant_id,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    async def list_events_with_participants(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        company_id: Optional[int] = None,
+        trainer_id: Optional[int] = None,
+        participant_id: Optional[int] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> List[EventOut]:
+        """
+        Получить страницу событий календаря с количеством участников.
+        Участники считаются только для событий страницы.
+        """
+        events = await self.list_events(
+            date_from=date_from,
+            date_to=date_to,
+            company_id=company_id,
+            trainer_id=trainer_id,
+            participant_id=participant_id,
+            limit=limit,
+            cursor=cursor,
+        )
+        participants_map = await self._participants_counts(e.id for e in events)
+        return [self._to_out(e, participants_map.get(e.id, 0)) for e in events]
+
+    @staticmethod
+    def next_cursor(events: List[EventOut], limit: int) -> Optional[str]:
+        """Курсор следующей страницы или None, если страница последняя"""
+        if not events or len(events) < limit:
+            return None
+        last = events[-1]
+        return encode_cursor(last.start_date, last.start_time, last.id)
 
     async def remove_participant(self, event_id: int, user_id: int) -> None:
         """Удалить участника из события"""
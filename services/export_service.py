@@ -0,0 +1,134 @@
+# services/export_service.py
+import csv
+import io
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+
+from core.db import SessionLocal
+from repositories.mock.user_answer_repository import UserAnswerRepository
+
+# Сколько строк читается из серверного курсора за один раз
+EXPORT_BATCH_SIZE = 2000
+# Ограничение листа Excel (1 048 576 строк, одна — под заголовок)
+XLSX_MAX_ROWS_PER_SHEET = 1_048_575
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+USER_ANSWERS_HEADER = [
+    "user_answer_id",
+    "answered_at",
+    "attempt_id",
+    "user_id",
+    "login",
+    "last_name",
+    "first_name",
+    "email",
+    "company_id",
+    "course_id",
+    "test_id",
+    "test_title",
+    "question_id",
+    "question_text",
+    "selected_answer_id",
+    "selected_answer_text",
+    "is_correct",
+]
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # Excel не поддерживает datetime с часовым поясом
+        return value.replace(tzinfo=None) if value.tzinfo else value
+    return value
+
+
+class ExportService:
+    """
+    Потоковая выгрузка ответов пользователей.
+
+    Каждая выгрузка открывает свою сессию: строки читаются серверным курсором
+    пачками по EXPORT_BATCH_SIZE и сразу отдаются клиенту, поэтому память
+    не растет с размером выгрузки.
+    """
+
+    def __init__(
+        self,
+        user_id: Optional[int] = None,
+        test_id: Optional[int] = None,
+        course_id: Optional[int] = None,
+        company_id: Optional[int] = None,
+    ):
+        self.stmt = UserAnswerRepository.export_query(
+            user_id=user_id,
+            test_id=test_id,
+            course_id=course_id,
+            company_id=company_id,
+        )
+
+    async def _batches(self) -> AsyncIterator[Sequence[Sequence[Any]]]:
+        async with SessionLocal() as db:
+            result = await db.stream(self.stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for batch in result.partitions():
+                yield batch
+
+    async def stream_csv(self) -> AsyncIterator[bytes]:
+        """CSV в UTF-8 с BOM (чтобы Excel правильно открыл кириллицу)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        buffer.write("\ufeff")
+        writer.writerow(USER_ANSWERS_HEADER)
+        yield buffer.getvalue().encode("utf-8")
+
+        async for batch in self._batches():
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(batch)
+            yield buffer.getvalue().encode("utf-8")
+
+    async def stream_xlsx(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """
+        XLSX через write-only режим openpyxl: строки сразу уходят во временные
+        файлы листов, сам .xlsx собирается в файл на диске и отдается частями.
+        """
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = None
+        sheet_rows = XLSX_MAX_ROWS_PER_SHEET
+
+        def append_rows(rows: Iterable[Sequence[Any]]) -> None:
+            nonlocal sheet, sheet_rows
+            for row in rows:
+                if sheet_rows >= XLSX_MAX_ROWS_PER_SHEET:
+                    sheet = workbook.create_sheet(f"answers_{len(workbook.worksheets) + 1}")
+                    sheet.append(USER_ANSWERS_HEADER)
+                    sheet_rows = 0
+                sheet.append([_cell(v) for v in row])
+                sheet_rows += 1
+
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        try:
+            async for batch in self._batches():
+                await run_in_threadpool(append_rows, batch)
+            if sheet is None:
+                sheet = workbook.create_sheet("answers_1")
+                sheet.append(USER_ANSWERS_HEADER)
+            await run_in_threadpool(workbook.save, path)
+
+            with open(path, "rb") as f:
+                while True:
+                    chunk = await run_in_threadpool(f.read, chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            os.remove(path)
+
+
+def export_filename(prefix: str, extension: str) -> str:
+    return f"{prefix}_{datetime.utcnow():%Y%m%d_%H%M%S}.{extension}"
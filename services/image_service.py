@@ -0,0 +1,153 @@
+# services/image_service.py
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.cache import TTLCache
+from core.config import settings
+from schemas import CourseImageDerivatives, CourseImageVariant
+from utils.file_utils import get_file_category
+from utils.images import derivative_name, generate_derivatives, manifest_path
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Манифесты производных по пути исходника; {} — производных нет (negative cache)
+_manifest_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    max_size=settings.IMAGE_MANIFEST_CACHE_MAX_SIZE,
+    ttl_seconds=settings.IMAGE_MANIFEST_CACHE_TTL_SECONDS,
+)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: fork процесса с потоками event loop и пула БД небезопасен
+        _executor = ProcessPoolExecutor(
+            max_workers=max(1, settings.IMAGE_WORKERS),
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=100,
+        )
+    return _executor
+
+
+def shutdown_image_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def local_image_path(url: Optional[str]) -> Optional[str]:
+    """Путь на диске для /static/... или /uploads/...; для внешних URL — None"""
+    if not url or "?" in url or get_file_category(url) != "photos" or url.endswith(".svg"):
+        return None
+    if url.startswith(settings.STATIC_URL + "/"):
+        root, relative = "static", url[len(settings.STATIC_URL) + 1:]
+    elif url.startswith(settings.UPLOADS_URL + "/"):
+        root, relative = settings.UPLOADS_DIR, url[len(settings.UPLOADS_URL) + 1:]
+    else:
+        return None
+
+    root = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(root, relative))
+    return path if path.startswith(root + os.sep) else None
+
+
+async def generate_image_derivatives(url: str) -> Optional[Dict[str, Any]]:
+    """Сгенерировать производные в пуле процессов (CPU-нагрузка не блокирует воркер API)"""
+    path = local_image_path(url)
+    if not path or not os.path.isfile(path):
+        return None
+
+    loop = asyncio.get_running_loop()
+    try:
+        manifest = await loop.run_in_executor(
+            _get_executor(),
+            generate_derivatives,
+            path,
+            settings.IMAGE_DERIVATIVE_WIDTHS,
+            settings.IMAGE_DERIVATIVE_QUALITY,
+        )
+    except Exception:
+        logger.exception("Не удалось создать производные изображения %s", url)
+        return None
+
+    _manifest_cache.set(path, manifest)
+    return manifest
+
+
+async def ensure_image_derivatives(url: Optional[str]) -> None:
+    """Для BackgroundTasks: создать производные, если их нет или исходник изменился"""
+    path = local_image_path(url)
+    if not path:
+        return
+    manifest = _read_manifest(path)
+    if manifest and manifest.get("source_mtime_ns") == _mtime_ns(path):
+        return
+    await generate_image_derivatives(url)
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_manifest(path: str) -> Dict[str, Any]:
+    cached = _manifest_cache.get(path)
+    if cached is not None:
+        return cached
+    try:
+        with open(manifest_path(path), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    _manifest_cache.set(path, manifest)
+    return manifest
+
+
+def get_image_derivatives_version(url: Optional[str]) -> Optional[int]:
+    """Состояние производных для ETag: source_mtime_ns манифеста; None — производных нет"""
+    path = local_image_path(url)
+    if not path:
+        return None
+    return _read_manifest(path).get("source_mtime_ns")
+
+
+def get_image_derivatives(url: Optional[str]) -> Optional[CourseImageDerivatives]:
+    """
+    Размеры и ссылки на производные для ответа API. Манифест читается с диска
+    один раз и дальше берется из кэша; если производных еще нет — None.
+    URL относительные — полными их делает сериализация CourseImageVariant.
+    """
+    path = local_image_path(url)
+    if not path:
+        return None
+    manifest = _read_manifest(path)
+    if not manifest:
+        return None
+
+    base_url = url.rsplit("/", 1)[0]
+    stem = Path(path).stem
+    variants: List[CourseImageVariant] = [
+        CourseImageVariant(
+            width=width,
+            webp_url=f"{base_url}/{derivative_name(stem, width, 'webp')}",
+            jpeg_url=f"{base_url}/{derivative_name(stem, width, 'jpg')}",
+        )
+        for width in manifest.get("sizes", [])
+    ]
+    return CourseImageDerivatives(
+        width=manifest["width"],
+        height=manifest["height"],
+        placeholder=manifest.get("placeholder"),
+        variants=variants,
+    )
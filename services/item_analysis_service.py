@@ -0,0 +1,208 @@
+# services/item_analysis_service.py
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from core.cache import TTLCache
+from core.config import settings
+from schemas import (
+    AnswerOptionStats,
+    QuestionItemStats,
+    QuestionResponse,
+    TestItemAnalysisResponse,
+)
+from repositories.mock.question_repository import QuestionRepository
+from repositories.mock.test_repository import TestRepository
+from repositories.mock.user_answer_repository import UserAnswerRepository
+
+# test_id -> (водяной знак ответов, версия ключа ответов, результат)
+item_analysis_cache: TTLCache[
+    Tuple[Tuple[int, Optional[int], Optional[datetime]], Optional[datetime], TestItemAnalysisResponse]
+] = TTLCache(
+    max_size=settings.ITEM_ANALYSIS_CACHE_MAX_TESTS,
+    ttl_seconds=settings.ITEM_ANALYSIS_CACHE_TTL_SECONDS,
+)
+
+
+def _opt(value: float, digits: int = 4) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def _positions(ids: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Индексы values в массиве ids и маска найденных (векторный аналог dict.get)"""
+    if len(ids) == 0:
+        return np.zeros(len(values), dtype=np.int64), np.zeros(len(values), dtype=bool)
+    order = np.argsort(ids)
+    found_at = np.searchsorted(ids, values, sorter=order)
+    found_at = np.clip(found_at, 0, len(ids) - 1)
+    positions = order[found_at]
+    return positions, ids[positions] == values
+
+
+def compute_item_analysis(
+    test_id: int,
+    questions: List[QuestionResponse],
+    rows: Sequence[Tuple[int, Optional[int], int, Optional[int], bool]],
+) -> TestItemAnalysisResponse:
+    """
+    Статистика по вопросам теста на NumPy.
+
+    Респондент — попытка (attempt_id), для старых ответов без попытки — пользователь.
+    X[r, q] = 1, если респондент r правильно ответил на вопрос q (неотвеченный = 0).
+    Вопрос с вариантами засчитан, если выбраны ровно все правильные варианты
+    (как в grade_question); вопрос без вариантов — по is_correct строки.
+    Трудность — доля правильных среди ответивших; дискриминация — точечно-бисериальная
+    корреляция X[:, q] с баллом за остальные вопросы (corrected item-total).
+    """
+    n = len(rows)
+    question_ids = np.array([q.id for q in questions], dtype=np.int64)
+    option_ids = np.array([a.id for q in questions for a in q.answers], dtype=np.int64)
+    option_question = np.array([qi for qi, q in enumerate(questions) for _ in q.answers], dtype=np.int64)
+    option_correct = np.array([a.is_correct for q in questions for a in q.answers], dtype=np.float64)
+
+    user_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+    attempt_ids = np.fromiter((-1 if r[1] is None else r[1] for r in rows), dtype=np.int64, count=n)
+    row_questions = np.fromiter((r[2] for r in rows), dtype=np.int64, count=n)
+    selected = np.fromiter((-1 if r[3] is None else r[3] for r in rows), dtype=np.int64, count=n)
+    is_correct = np.fromiter((bool(r[4]) for r in rows), dtype=np.float64, count=n)
+
+    q_idx, q_found = _positions(question_ids, row_questions)
+    respondent_key = np.where(attempt_ids >= 0, attempt_ids * 2, user_ids * 2 + 1)
+    respondent_keys, r_idx = np.unique(respondent_key[q_found], return_inverse=True)
+    q_idx, is_correct, selected = q_idx[q_found], is_correct[q_found], selected[q_found]
+
+    n_resp, n_q = len(respondent_keys), len(question_ids)
+    n_opt = max(len(option_ids), 1)
+
+    answered = np.zeros((n_resp, n_q), dtype=bool)
+    answered[r_idx, q_idx] = True
+
+    # выбор вариантов: уникальные пары (респондент, вариант)
+    o_idx, o_found = _positions(option_ids, selected)
+    o_found &= selected >= 0
+    pairs = np.unique(r_idx[o_found] * n_opt + o_idx[o_found])
+    pair_resp, pair_opt = np.divmod(pairs, n_opt)
+
+    # вопросы с вариантами проверяются по ключу: все правильные выбраны, неправильных нет
+    pair_q = option_question[pair_opt]
+    selected_correct = np.zeros((n_resp, n_q))
+    selected_wrong = np.zeros((n_resp, n_q))
+    np.add.at(selected_correct, (pair_resp, pair_q), option_correct[pair_opt])
+    np.add.at(selected_wrong, (pair_resp, pair_q), 1 - option_correct[pair_opt])
+    correct_per_question = np.bincount(option_question, weights=option_correct, minlength=n_q)
+    has_options = np.bincount(option_question, minlength=n_q) > 0
+    graded = (
+        (selected_correct == correct_per_question)
+        & (selected_wrong == 0)
+        & (correct_per_question > 0)
+    )
+
+    # вопросы без вариантов (text) — засчитан, если засчитана любая строка
+    flagged = np.zeros((n_resp, n_q), dtype=np.float64)
+    np.maximum.at(flagged, (r_idx, q_idx), is_correct)
+
+    x = np.where(has_options, graded & answered, flagged).astype(np.float64)
+
+    responses = answered.sum(axis=0)
+    correct_rate = np.divide(
+        x.sum(axis=0), responses,
+        out=np.full(n_q, np.nan), where=responses > 0,
+    )
+
+    total = x.sum(axis=1)
+    rest = total[:, None] - x
+    if n_resp > 0:
+        xc = x - x.mean(axis=0)
+        rc = rest - rest.mean(axis=0)
+        numerator = (xc * rc).sum(axis=0)
+        denominator = np.sqrt((xc ** 2).sum(axis=0) * (rc ** 2).sum(axis=0))
+    else:
+        numerator = denominator = np.zeros(n_q)
+    discrimination = np.divide(
+        numerator, denominator,
+        out=np.full(n_q, np.nan), where=denominator > 0,
+    )
+
+    selected_count = np.bincount(pair_opt, minlength=len(option_ids))
+    score_sum = np.bincount(pair_opt, weights=total[pair_resp], minlength=len(option_ids))
+    mean_score_by_option = np.divide(
+        score_sum, selected_count,
+        out=np.full(len(option_ids), np.nan), where=selected_count > 0,
+    )
+    option_responses = responses[option_question] if len(option_ids) else np.zeros(0)
+    selection_rate = np.divide(
+        selected_count, option_responses,
+        out=np.zeros(len(option_ids)), where=option_responses > 0,
+    )
+
+    stats: List[QuestionItemStats] = []
+    option_pos = 0
+    for qi, question in enumerate(questions):
+        options: List[AnswerOptionStats] = []
+        for answer in question.answers:
+            options.append(AnswerOptionStats(
+                answer_id=answer.id,
+                answer_text=answer.answer_text,
+                is_correct=answer.is_correct,
+                selected_count=int(selected_count[option_pos]),
+                selection_rate=round(float(selection_rate[option_pos]), 4),
+                mean_total_score=_opt(mean_score_by_option[option_pos]),
+            ))
+            option_pos += 1
+
+        stats.append(QuestionItemStats(
+            question_id=question.id,
+            question_text=question.question_text,
+            question_type=question.question_type,
+            responses=int(responses[qi]),
+            correct_rate=_opt(correct_rate[qi]),
+            discrimination=_opt(discrimination[qi]),
+            options=options,
+        ))
+
+    return TestItemAnalysisResponse(
+        test_id=test_id,
+        respondents=n_resp,
+        answers_count=int(q_found.sum()),
+        mean_score=_opt(total.mean()) if n_resp else None,
+        computed_at=datetime.now(timezone.utc),
+        questions=stats,
+    )
+
+
+class ItemAnalysisService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.test_repo = TestRepository(db)
+        self.question_repo = QuestionRepository(db)
+        self.user_answer_repo = UserAnswerRepository(db)
+
+    async def get_item_analysis(self, test_id: int) -> TestItemAnalysisResponse:
+        """
+        Анализ заданий теста. Результат кэшируется, пока по тесту не пришли
+        новые ответы, не правились старые (число, максимальный id и последнее
+        изменение ответов) и не менялся ключ ответов.
+        """
+        test = await self.test_repo.get_by_id(test_id)
+        if not test:
+            raise HTTPException(status_code=404, detail="Тест не найден")
+
+        watermark = await self.user_answer_repo.get_test_watermark(test_id)
+        version = await self.test_repo.get_answer_key_version(test_id)
+
+        cached = item_analysis_cache.get(test_id)
+        if cached is not None and cached[0] == watermark and cached[1] == version:
+            return cached[2]
+
+        questions = await self.question_repo.get_all(test_id)
+        rows = await self.user_answer_repo.get_test_answer_rows(test_id)
+        result = await run_in_threadpool(compute_item_analysis, test_id, questions, rows)
+
+        # watermark и версия прочитаны до расчета: если данные изменились
+        # во время расчета, следующий запрос не совпадет с ними и пересчитает
+        item_analysis_cache.set(test_id, (watermark, version, result))
+        return result
@@ -0,0 +1,85 @@
+# services/test_attempt_service.py
+from datetime import timedelta
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from schemas import TestAttemptResponse, TestResponse
+from repositories.mock.test_repository import TestRepository
+from repositories.mock.test_attempt_repository import TestAttemptRepository, is_overdue, utc_now
+
+
+class TestAttemptService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.test_repo = TestRepository(db)
+        self.attempt_repo = TestAttemptRepository(db)
+
+    async def get_attempts(
+        self,
+        test_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ) -> List[TestAttemptResponse]:
+        """Попытки с сохраненными результатами (без пересчета по user_answer)"""
+        return await self.attempt_repo.get_all(test_id, user_id)
+
+    async def start_attempt(self, test_id: int, user_id: int) -> TestAttemptResponse:
+        """
+        Начать попытку или вернуть текущую незавершенную.
+        Проверяет number_of_attempts; дедлайн считается на сервере от time_limit_minutes.
+        """
+        test = await self.test_repo.get_by_id(test_id)
+        if not test:
+            raise HTTPException(status_code=404, detail="Тест не найден")
+        return await self._start(test, user_id)
+
+    async def get_active_attempt(self, test: TestResponse, user_id: int) -> Optional[TestAttemptResponse]:
+        """
+        Текущая незавершенная попытка или None.
+        Просроченную попытку закрывает и отвечает 409.
+        """
+        active = await self.attempt_repo.get_in_progress(test.id, user_id)
+        if active and is_overdue(active.deadline_at):
+            await self.attempt_repo.expire(active.id)
+            raise HTTPException(status_code=409, detail="Время на прохождение теста истекло")
+        return active
+
+    async def get_attempt_for_submit(self, test: TestResponse, user_id: int) -> TestAttemptResponse:
+        """
+        Попытка, в которую принимаются ответы: текущая незавершенная
+        или новая (для тестов без ограничения по времени, которые проходят
+        одним запросом). Тест с time_limit_minutes принимает ответы только
+        в попытке, начатой заранее, иначе отсчет времени обходится.
+        """
+        active = await self.get_active_attempt(test, user_id)
+        if active:
+            return active
+        if test.time_limit_minutes:
+            raise HTTPException(status_code=409, detail="Попытка не начата: сначала начните попытку")
+        return await self._start(test, user_id)
+
+    async def _start(self, test: TestResponse, user_id: int) -> TestAttemptResponse:
+        active = await self.attempt_repo.get_in_progress(test.id, user_id)
+        if active and not is_overdue(active.deadline_at):
+            return active
+        if active:
+            await self.attempt_repo.expire(active.id)
+
+        if test.number_of_attempts:
+            used = await self.attempt_repo.count_for_user(test.id, user_id)
+            if used >= test.number_of_attempts:
+                raise HTTPException(status_code=409, detail="Попытки прохождения теста закончились")
+
+        deadline_at = None
+        if test.time_limit_minutes:
+            deadline_at = utc_now() + timedelta(minutes=test.time_limit_minutes)
+
+        try:
+            return await self.attempt_repo.create(test.id, user_id, deadline_at)
+        except IntegrityError:
+            # параллельный запрос уже начал попытку
+            active = await self.attempt_repo.get_in_progress(test.id, user_id)
+            if not active:
+                raise HTTPException(status_code=409, detail="Не удалось начать попытку")
+            return active
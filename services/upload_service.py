@@ -0,0 +1,151 @@
+# services/upload_service.py
+import hashlib
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Optional
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from schemas import UploadedFileResponse
+from utils.file_utils import get_content_addressed_path, get_file_category
+
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+_EXT_RE = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+# Незавершенные загрузки лежат в том же разделе, что и uploads, чтобы os.replace был атомарным
+INCOMING_DIR = ".incoming"
+
+
+def _normalize_filename(filename: str) -> str:
+    """Оставляет от имени файла только базовое имя; непонятное расширение отбрасывается"""
+    name = Path(filename.replace("\\", "/")).name
+    ext = Path(name).suffix.lower()
+    if ext and not _EXT_RE.match(ext):
+        name = Path(name).stem
+    return name
+
+
+def _write_chunk(file: BinaryIO, hasher: "hashlib._Hash", data: bytes) -> None:
+    # hashlib отпускает GIL на больших буферах, поэтому хэш считается в том же потоке, что и запись
+    hasher.update(data)
+    file.write(data)
+
+
+def _discard(file: BinaryIO, path: str) -> None:
+    file.close()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _commit(tmp_path: str, final_path: str, size: int) -> bool:
+    """
+    Переносит временный файл на место по хэшу. Возвращает True, если такой файл уже был
+    (тогда временный удаляется). Две одновременные загрузки одного файла безопасны:
+    os.replace атомарен, а содержимое у них одинаковое.
+    """
+    if os.path.isfile(final_path) and os.path.getsize(final_path) == size:
+        os.remove(tmp_path)
+        return True
+
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(tmp_path, final_path)
+    return False
+
+
+class UploadService:
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.UPLOADS_DIR
+        self.max_bytes = settings.UPLOAD_MAX_BYTES
+        self.buffer_bytes = max(settings.UPLOAD_WRITE_BUFFER_BYTES, 64 * 1024)
+
+    def _to_response(
+        self,
+        relative_path: str,
+        digest: str,
+        size: int,
+        filename: str,
+        deduplicated: bool,
+    ) -> UploadedFileResponse:
+        return UploadedFileResponse(
+            url=f"{settings.UPLOADS_URL}/{relative_path}",
+            sha256=digest,
+            size=size,
+            category=get_file_category(filename),
+            original_filename=filename,
+            deduplicated=deduplicated,
+        )
+
+    def check_size(self, content_length: Optional[int]) -> None:
+        """Ранний отказ по Content-Length, до чтения тела запроса"""
+        if self.max_bytes and content_length is not None and content_length > self.max_bytes:
+            raise HTTPException(status_code=413, detail="Файл слишком большой")
+
+    async def find_by_hash(self, sha256: str, filename: str) -> Optional[UploadedFileResponse]:
+        """Найти уже загруженный файл по SHA-256 — клиент может не загружать его повторно"""
+        digest = sha256.lower()
+        if not SHA256_RE.match(digest):
+            raise HTTPException(status_code=400, detail="Некорректный SHA-256")
+
+        filename = _normalize_filename(filename)
+        relative_path = get_content_addressed_path(digest, filename)
+        full_path = os.path.join(self.root, relative_path)
+        try:
+            size = await run_in_threadpool(os.path.getsize, full_path)
+        except OSError:
+            return None
+        return self._to_response(relative_path, digest, size, filename, deduplicated=True)
+
+    async def save_stream(self, filename: str, chunks: AsyncIterator[bytes]) -> UploadedFileResponse:
+        """
+        Потоковая загрузка: тело читается кусками, копится не больше buffer_bytes
+        и пишется на диск в пуле потоков; SHA-256 считается по ходу записи.
+        Файл сохраняется под путем по хэшу, повторная загрузка того же содержимого
+        не создает копию.
+        """
+        filename = _normalize_filename(filename)
+        if not filename:
+            raise HTTPException(status_code=400, detail="Не указано имя файла")
+
+        incoming_dir = os.path.join(self.root, INCOMING_DIR)
+        await run_in_threadpool(os.makedirs, incoming_dir, exist_ok=True)
+        tmp_path = os.path.join(incoming_dir, uuid.uuid4().hex)
+
+        hasher = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        file = await run_in_threadpool(open, tmp_path, "xb")
+        try:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if self.max_bytes and size > self.max_bytes:
+                    raise HTTPException(status_code=413, detail="Файл слишком большой")
+
+                buffer += chunk
+                if len(buffer) >= self.buffer_bytes:
+                    data, buffer = buffer, bytearray()
+                    await run_in_threadpool(_write_chunk, file, hasher, data)
+
+            if buffer:
+                await run_in_threadpool(_write_chunk, file, hasher, buffer)
+            await run_in_threadpool(file.close)
+
+            if size == 0:
+                raise HTTPException(status_code=400, detail="Пустой файл")
+        except BaseException:
+            await run_in_threadpool(_discard, file, tmp_path)
+            raise
+
+        digest = hasher.hexdigest()
+        relative_path = get_content_addressed_path(digest, filename)
+        deduplicated = await run_in_threadpool(
+            _commit, tmp_path, os.path.join(self.root, relative_path), size
+        )
+        return self._to_response(relative_path, digest, size, filename, deduplicated)
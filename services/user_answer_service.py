@@ -1,12 +1,26 @@
 # services/user_answer_service.py
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from schemas import UserAnswerResponse, UserAnswerCreate, UserAnswerUpdate
+from schemas import TestSubmitRequest, TestSubmitResponse, TestSubmitQuestionResult, TestResponse
 from repositories.mock.user_answer_repository import UserAnswerRepository
 from repositories.mock.question_repository import QuestionRepository
 from repositories.mock.answer_repository import AnswerRepository
+from repositories.mock.test_repository import TestRepository
+from repositories.mock.answer_key_cache import answer_key_cache
+from repositories.mock.test_attempt_repository import TestAttemptRepository, utc_now
+from services.test_attempt_service import TestAttemptService
+
+
+def grade_question(key_entry: Dict[str, Any], selected_ids: Set[int]) -> bool:
+    """
+    Правильность ответа на вопрос по ключу теста: выбраны ровно все правильные варианты.
+    Вопросы без правильных вариантов (text) автоматически не засчитываются.
+    """
+    correct_ids = key_entry["correct_ids"]
+    return bool(correct_ids) and selected_ids == correct_ids
 
 
 class UserAnswerService:
@@ -15,6 +29,9 @@ class UserAnswerService:
         self.user_answer_repo = UserAnswerRepository(db)
         self.question_repo = QuestionRepository(db)
         self.answer_repo = AnswerRepository(db)
+        self.test_repo = TestRepository(db)
+        self.attempt_repo = TestAttemptRepository(db)
+        self.attempt_service = TestAttemptService(db)
 
     async def get_all_user_answers(
         self,
@@ -32,40 +49,95 @@ class UserAnswerService:
             raise HTTPException(status_code=404, detail="Ответ пользователя не найден")
         return user_answer
 
+    async def _get_test_id(self, question_id: int) -> Optional[int]:
+        test_id = answer_key_cache.test_of_question(question_id)
+        if test_id is None:
+            test_id = await self.question_repo.get_test_id(question_id)
+        return test_id
+
+    @staticmethod
+    def _uses_attempts(test: Optional[TestResponse]) -> bool:
+        """Ограничены ли у теста попытки или время — тогда ответы принимаются только в попытке"""
+        return bool(test and (test.number_of_attempts or test.time_limit_minutes))
+
+    async def _get_key_entry(self, question_id: int) -> Optional[Dict[str, Any]]:
+        """Запись ключа ответов для вопроса (из answer_key_cache, без чтения ответов из БД)"""
+        test_id = answer_key_cache.test_of_question(question_id)
+        if test_id is not None:
+            entry = (await self.test_repo.get_cached_answer_key(test_id)).get(question_id)
+            if entry is not None:
+                return entry
+
+        # вопроса еще нет в индексе кэша (или он перенесен в другой тест)
+        test_id = await self.question_repo.get_test_id(question_id)
+        if test_id is None:
+            return None
+        return (await self.test_repo.get_cached_answer_key(test_id)).get(question_id)
+
+    async def _get_answer_question_id(self, answer_id: int) -> Optional[int]:
+        question_id = answer_key_cache.question_of_answer(answer_id)
+        if question_id is None:
+            question_id = await self.answer_repo.get_question_id(answer_id)
+        return question_id
+
     async def create_user_answer(self, user_answer_data: UserAnswerCreate) -> UserAnswerResponse:
         """Создать ответ пользователя на вопрос"""
         # Проверяем что вопрос существует
-        question = await self.question_repo.get_by_id(user_answer_data.question_id)
-        if not question:
+        entry = await self._get_key_entry(user_answer_data.question_id)
+        if entry is None:
             raise HTTPException(status_code=404, detail="Вопрос не найден")
         
         # Проверяем что выбранный ответ существует (если указан)
-        if user_answer_data.selected_answer_id:
-            answer = await self.answer_repo.get_by_id(user_answer_data.selected_answer_id)
-            if not answer:
-                raise HTTPException(status_code=404, detail="Ответ не найден")
-            
-            # Проверяем что ответ принадлежит этому вопросу
-            if answer.question_id != user_answer_data.question_id:
+        answer_id = user_answer_data.selected_answer_id
+        if answer_id:
+            if answer_id not in entry["answer_ids"]:
+                if await self._get_answer_question_id(answer_id) is None:
+                    raise HTTPException(status_code=404, detail="Ответ не найден")
+                # Ответ существует, но принадлежит другому вопросу
                 raise HTTPException(status_code=400, detail="Ответ не принадлежит этому вопросу")
             
-            # Автоматически определяем правильность ответа
-            if user_answer_data.is_correct is None:
-                user_answer_data.is_correct = answer.is_correct
-        
-        return await self.user_answer_repo.create(user_answer_data)
+            # Автоматически определяем правильность ответа, если клиент ее не передал
+            if "is_correct" not in user_answer_data.model_fields_set:
+                user_answer_data.is_correct = answer_id in entry["correct_ids"]
+
+        # Для тестов с ограничениями ответ пишется в попытку: проверяются
+        # число попыток и дедлайн, как при отправке всего теста
+        attempt_id = None
+        test_id = await self._get_test_id(user_answer_data.question_id)
+        test = await self.test_repo.get_by_id(test_id) if test_id is not None else None
+        if self._uses_attempts(test):
+            attempt = await self.attempt_service.get_attempt_for_submit(test, user_answer_data.user_id)
+            attempt_id = attempt.id
+
+        return await self.user_answer_repo.create(user_answer_data, attempt_id=attempt_id)
+
+    async def _ensure_answer_editable(self, user_answer: UserAnswerResponse) -> None:
+        """Ответ на тест с ограничениями можно менять только в текущей незавершенной попытке"""
+        test_id = await self._get_test_id(user_answer.question_id)
+        test = await self.test_repo.get_by_id(test_id) if test_id is not None else None
+        if not self._uses_attempts(test):
+            return
+
+        active = await self.attempt_service.get_active_attempt(test, user_answer.user_id)
+        if active is None or active.id != user_answer.attempt_id:
+            raise HTTPException(status_code=409, detail="Попытка уже завершена")
 
     async def update_user_answer(self, user_answer_id: int, user_answer_data: UserAnswerUpdate) -> UserAnswerResponse:
         """Обновить ответ пользователя"""
-        if user_answer_data.selected_answer_id:
+        existing = await self.get_user_answer_by_id(user_answer_id)
+        await self._ensure_answer_editable(existing)
+
+        answer_id = user_answer_data.selected_answer_id
+        if answer_id:
             # Проверяем что ответ существует
-            answer = await self.answer_repo.get_by_id(user_answer_data.selected_answer_id)
-            if not answer:
+            question_id = await self._get_answer_question_id(answer_id)
+            entry = await self._get_key_entry(question_id) if question_id is not None else None
+            if entry is None or answer_id not in entry["answer_ids"]:
                 raise HTTPException(status_code=404, detail="Ответ не найден")
             
             # Обновляем правильность ответа автоматически
             if user_answer_data.is_correct is None:
-                user_answer_data.is_correct = answer.is_correct
+                user_answer_data.is_correct = answer_id in entry["correct_ids"]
         
         updated = await self.user_answer_repo.update(user_answer_id, user_answer_data)
         if not updated:
@@ -79,3 +151,98 @@ class UserAnswerService:
             raise HTTPException(status_code=404, detail="Ответ пользователя не найден")
         return success
 
+    async def submit_test(
+        self,
+        test_id: int,
+        user_id: int,
+        submission: TestSubmitRequest,
+    ) -> TestSubmitResponse:
+        """
+        Принять ответы на весь тест и завершить попытку: проверка по ключу ответов
+        в памяти, оценка за один проход, запись всех строк user_answer одним INSERT
+        и сохранение результата в попытке.
+        Строки user_answer, как и в POST /user-answers, хранят правильность
+        выбранного варианта; правильность вопросов и балл хранятся в попытке.
+        """
+        test = await self.test_repo.get_by_id(test_id)
+        if not test:
+            raise HTTPException(status_code=404, detail="Тест не найден")
+
+        attempt = await self.attempt_service.get_attempt_for_submit(test, user_id)
+        answer_key = await self.test_repo.get_cached_answer_key(test_id)
+
+        selected_by_question: Dict[int, Set[int]] = {}
+        for item in submission.answers:
+            entry = answer_key.get(item.question_id)
+            if entry is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Вопрос {item.question_id} не относится к этому тесту",
+                )
+            if item.question_id in selected_by_question:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Повторный ответ на вопрос {item.question_id}",
+                )
+
+            selected = set(item.selected_answer_ids)
+            foreign = selected - entry["answer_ids"]
+            if foreign:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Ответ {min(foreign)} не принадлежит вопросу {item.question_id}",
+                )
+            if entry["type"] == "single_choice" and len(selected) > 1:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"На вопрос {item.question_id} можно выбрать только один ответ",
+                )
+            selected_by_question[item.question_id] = selected
+
+        answered_at = utc_now()
+        rows: List[Dict[str, Any]] = []
+        results: List[TestSubmitQuestionResult] = []
+        for question_id, selected in selected_by_question.items():
+            is_correct = grade_question(answer_key[question_id], selected)
+            results.append(TestSubmitQuestionResult(
+                question_id=question_id,
+                selected_answer_ids=sorted(selected),
+                is_correct=is_correct,
+            ))
+            # одна строка на каждый выбранный вариант; без выбора — одна пустая строка
+            correct_ids = answer_key[question_id]["correct_ids"]
+            for answer_id in sorted(selected) or [None]:
+                rows.append({
+                    "user_id": user_id,
+                    "question_id": question_id,
+                    "selected_answer_id": answer_id,
+                    "is_correct": answer_id in correct_ids,
+                    "answered_at": answered_at,
+                })
+
+        correct = sum(1 for r in results if r.is_correct)
+        total = len(answer_key)
+        score = round(correct * 100 / total, 2) if total else 0.0
+
+        finished = await self.attempt_repo.finish(
+            attempt.id,
+            rows,
+            score=score,
+            correct_answers=correct,
+            total_questions=total,
+            finished_at=answered_at,
+        )
+        if not finished:
+            raise HTTPException(status_code=409, detail="Попытка уже завершена")
+
+        return TestSubmitResponse(
+            test_id=test_id,
+            attempt_id=attempt.id,
+            user_id=user_id,
+            total_questions=total,
+            answered_questions=len(results),
+            correct_answers=correct,
+            score=score,
+            submitted_at=answered_at,
+            results=results,
+        )
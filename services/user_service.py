@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.security import hash_password
+from core.security import hash_password_async
 from repositories.mock.user_repository import UserRepository
 from repositories.mock.role_repository import RoleRepository
+from repositories.mock.enrollment_repository import EnrollmentRepository
+
+# scope для GET /users: студенты курсов текущего пользователя-тренера
+SCOPE_MY_STUDENTS = "my-students"
+
+# Размер пачки для POST /users/bulk: проверка занятости, хэширование и INSERT
+BULK_CHUNK_SIZE = 500
 
 
 def _norm_role_title(title: str | None) -> str:
@@ -17,6 +26,10 @@ def _norm_role_title(title: str | None) -> str:
 
 class UserService:
     async def _get_current_role_title(self, db: AsyncSession, current_user: Dict[str, Any]) -> str:
+        # title роли уже есть в current_user (get_current_user) — запрос не нужен
+        if current_user.get("role"):
+            return _norm_role_title(current_user["role"])
+
         role_id = current_user.get("role_id")
         if not role_id:
             return ""
@@ -43,29 +56,74 @@ class UserService:
         if role_title == "student":
             return [u for u in all_users if u.get("id") == current_user.get("id")]
 
-        # trainer видит только студентов своих курсов (если у тебя это реально так)
+        # trainer видит только студентов своих курсов
         if role_title == "trainer":
             trainer_id = current_user.get("id")
             if not trainer_id:
                 return []
 
-            from repositories.mock.course_repository import course_repository  # как у тебя сейчас
-            trainer_courses = course_repository.get_courses_by_trainer(trainer_id)
-
-            students_ids = set()
-            for course in trainer_courses:
-                enrolled = course_repository.get_students_by_course(course["id"])
-                for st in enrolled:
-                    students_ids.add(st["id"])
-
+            # один запрос по course_enrollments вместо перебора курсов и студентов
+            students_ids = set(await EnrollmentRepository(db).get_student_ids_for_trainer(trainer_id))
             return [u for u in all_users if u.get("id") in students_ids]
 
         return []
 
-    async def get_visible_users(self, db: AsyncSession, current_user: Dict[str, Any]) -> List[Dict[str, Any]]:
-        repo = UserRepository(db)
-        all_users = await repo.get_all()
-        return await self.apply_visibility(db, all_users, current_user)
+    async def list_users(
+        self,
+        db: AsyncSession,
+        current_user: Dict[str, Any],
+        search: Optional[str] = None,
+        role_titles: Optional[List[str]] = None,
+        role_id: Optional[int] = None,
+        company_id: Optional[int] = None,
+        department_id: Optional[int] = None,
+        position_id: Optional[int] = None,
+        scope: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Страница видимых пользователей и их общее количество.
+        Правила apply_visibility переводятся в условия SQL-запроса.
+        """
+        role_title = await self._get_current_role_title(db, current_user)
+        current_id = current_user.get("id")
+
+        only_user_id = None
+        students_of_trainer_id = None
+
+        if role_title in ("admin", "manager"):
+            if scope == SCOPE_MY_STUDENTS:
+                students_of_trainer_id = current_id
+        elif role_title == "trainer":
+            students_of_trainer_id = current_id
+        elif role_title == "student":
+            only_user_id = current_id
+            if scope == SCOPE_MY_STUDENTS:
+                students_of_trainer_id = current_id
+        else:
+            return [], 0
+
+        if not current_id and (only_user_id is not None or students_of_trainer_id is not None):
+            return [], 0
+
+        try:
+            return await UserRepository(db).search(
+                search=search,
+                role_titles=role_titles,
+                role_id=role_id,
+                company_id=company_id,
+                department_id=department_id,
+                position_id=position_id,
+                only_user_id=only_user_id,
+                students_of_trainer_id=students_of_trainer_id,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     async def create_user(
         self,
@@ -99,31 +157,128 @@ class UserService:
 
         from models.users import Users
 
+        user = Users(**self._user_columns(user_data, role_id, await hash_password_async(raw_password)))
+
+        try:
+            return await repo.create_user(user)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Ошибка создания пользователя")
+
+    @staticmethod
+    def _user_columns(user_data: Dict[str, Any], role_id: int, password_hash: str) -> Dict[str, Any]:
+        """Значения колонок Users для нового пользователя"""
         # ВАЖНО: у тебя TIMESTAMP WITHOUT TIME ZONE => используем naive datetime
         now = datetime.utcnow()
 
-        user = Users(
+        return dict(
             login=user_data.get("login"),
             first_name=user_data.get("first_name") or "",
             last_name=user_data.get("last_name") or "",
             middle_name=user_data.get("middle_name"),
             email=str(user_data.get("email")).strip().lower(),
-            password_hash=hash_password(raw_password),
+            password_hash=password_hash,
             created_at=user_data.get("created_at") or now,
             is_active=user_data.get("is_active", True),
             birth_date=user_data.get("birth_date"),
             company_id=user_data.get("company_id"),
             department_id=user_data.get("department_id"),
             position_id=user_data.get("position_id"),
-            role_id=user_data.get("role_id"),
+            role_id=role_id,
             hire_date=user_data.get("hire_date"),
             telegram_username=user_data.get("telegram_username"),
         )
 
-        try:
-            return await repo.create_user(user)
-        except Exception:
-            raise HTTPException(status_code=400, detail="Ошибка создания пользователя")
+    async def bulk_create_users(
+        self,
+        db: AsyncSession,
+        rows: List[Tuple[int, Dict[str, Any]]],
+        current_user: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Массовое создание пользователей (POST /users/bulk).
+
+        rows — пары (номер строки, данные UserCreate). Роли загружаются один раз,
+        занятость логинов/email проверяется одним запросом на пачку, пароли
+        хэшируются в пуле потоков, вставка — одним INSERT на пачку.
+        Ошибочные строки не прерывают импорт и возвращаются в errors.
+        """
+        await self._ensure_admin_or_manager(db, current_user)
+
+        repo = UserRepository(db)
+        role_ids = await RoleRepository(db).get_id_map()
+
+        created: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        seen_logins: set = set()
+        seen_emails: set = set()
+
+        def fail(row_no: int, data: Dict[str, Any], detail: str) -> None:
+            errors.append({"row": row_no, "login": data.get("login"), "email": data.get("email"), "detail": detail})
+
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            chunk = rows[start:start + BULK_CHUNK_SIZE]
+            taken_logins, taken_emails = await repo.get_taken_logins_and_emails(
+                [data["login"] for _, data in chunk],
+                [str(data["email"]) for _, data in chunk],
+            )
+
+            pending: List[Tuple[int, Dict[str, Any], int]] = []
+            for row_no, data in chunk:
+                login = data["login"].strip().lower()
+                email = str(data["email"]).strip().lower()
+                role_id = role_ids.get(_norm_role_title(data.get("role")))
+
+                if login in taken_logins or login in seen_logins:
+                    fail(row_no, data, "Логин уже занят")
+                elif email in taken_emails or email in seen_emails:
+                    fail(row_no, data, "Email уже занят")
+                elif not _norm_role_title(data.get("role")):
+                    fail(row_no, data, "role обязателен")
+                elif role_id is None:
+                    fail(row_no, data, f"Неизвестная роль: {data.get('role')}")
+                else:
+                    seen_logins.add(login)
+                    seen_emails.add(email)
+                    pending.append((row_no, data, role_id))
+
+            if not pending:
+                continue
+
+            hashes = await asyncio.gather(*(hash_password_async(data["password"]) for _, data, _ in pending))
+            values = [
+                self._user_columns(data, role_id, password_hash)
+                for (_, data, role_id), password_hash in zip(pending, hashes)
+            ]
+
+            try:
+                ids: List[Optional[int]] = await repo.bulk_create(values)
+                await db.commit()
+            except IntegrityError:
+                # кто-то занял логин/email между проверкой и вставкой:
+                # повторяем пачку построчно, чтобы найти конкретные строки
+                await db.rollback()
+                ids = []
+                for value in values:
+                    try:
+                        async with db.begin_nested():
+                            ids.extend(await repo.bulk_create([value]))
+                    except IntegrityError:
+                        ids.append(None)
+                await db.commit()
+
+            for (row_no, data, _), user_id in zip(pending, ids):
+                if user_id is None:
+                    fail(row_no, data, "Ошибка создания пользователя")
+                else:
+                    created.append({"row": row_no, "id": user_id, "login": data["login"]})
+
+        errors.sort(key=lambda e: e["row"])
+        return {
+            "created_count": len(created),
+            "error_count": len(errors),
+            "created": created,
+            "errors": errors,
+        }
 
     async def get_by_id(self, db: AsyncSession, user_id: int, current_user: Dict[str, Any]) -> Dict[str, Any]:
         repo = UserRepository(db)
@@ -168,7 +323,7 @@ class UserService:
         if update_data.get("password"):
             raw_password = update_data.pop("password")
             update_data.pop("password_confirm", None)
-            update_data["password_hash"] = hash_password(raw_password)
+            update_data["password_hash"] = await hash_password_async(raw_password)
 
         update_data.pop("password_confirm", None)
 
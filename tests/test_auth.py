@@ -0,0 +1,79 @@
+"""
+Аутентификация по claims токена: после /auth/login запрос с выданным
+токеном не должен ходить в БД.
+
+Запуск из корня проекта:
+    python -m pytest -q tests
+"""
+import asyncio
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import models  # noqa: F401  регистрирует все таблицы в Base.metadata
+from api.v1.auth import LoginRequest, login
+from core import security
+from core.config import settings
+from core.db import Base
+from models.roles import Role
+from models.users import Users
+
+
+async def _login_then_authenticate() -> int:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(_conn, _cursor, statement, _parameters, _context, _executemany):
+        statements.append(statement)
+
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            db.add(Role(id=1, title="student"))
+            db.add(Users(
+                id=1,
+                first_name="Иван",
+                last_name="Иванов",
+                email="ivan@example.com",
+                login="ivan",
+                password_hash=security.hash_password("secret"),
+                role_id=1,
+                is_active=True,
+            ))
+            await db.commit()
+
+            token = (await login(LoginRequest(login="ivan", password="secret"), db=db)).access_token
+
+            statements.clear()
+            principal = await security.get_current_user(
+                HTTPAuthorizationCredentials(scheme="Bearer", credentials=token),
+                db=db,
+            )
+    finally:
+        await engine.dispose()
+
+    assert principal == {"id": 1, "role_id": 1, "role": "student"}
+    return len(statements)
+
+
+def test_token_claims_authenticate_without_db_after_login(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+    security.principal_cache.clear()
+    security._principal_changed_at.clear()
+
+    assert asyncio.run(_login_then_authenticate()) == 0
+
+
+def test_token_issued_in_the_second_of_change_is_not_trusted():
+    security._principal_changed_at.clear()
+    security.invalidate_principal(1)
+    issued_at = int(security._principal_changed_at.get(1))
+
+    payload = {"user_id": 1, "role_id": 1, "role": "student", "iat": issued_at}
+    assert security._principal_from_claims(1, payload) is None
+    payload["iat"] = issued_at + 1
+    assert security._principal_from_claims(1, payload) is not None
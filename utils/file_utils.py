@@ -3,6 +3,8 @@ import os
 from pathlib import Path
 from typing import Optional
 
+from core.config import settings
+
 # Маппинг расширений файлов к категориям
 FILE_CATEGORIES = {
     "photos": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".svg"],
@@ -34,7 +36,7 @@ def get_uploads_path(category: Optional[str] = None, filename: Optional[str] = N
     Если указана категория, файл будет в соответствующей подпапке.
     Если категория не указана, но указан filename, категория определяется автоматически.
     """
-    base_path = "uploads"
+    base_path = settings.UPLOADS_DIR
     
     if filename and not category:
         category = get_file_category(filename)
@@ -53,3 +55,14 @@ def ensure_upload_dir(category: Optional[str] = None) -> str:
     os.makedirs(path, exist_ok=True)
     return path
 
+
+
+def get_content_addressed_path(digest: str, filename: str) -> str:
+    """
+    Относительный путь файла внутри uploads по хэшу содержимого:
+    <категория>/<первые 2 символа хэша>/<хэш><расширение>.
+    Одинаковые файлы всегда получают один и тот же путь.
+    """
+    category = get_file_category(filename)
+    ext = Path(filename).suffix.lower()
+    return "/".join((category, digest[:2], f"{digest}{ext}"))
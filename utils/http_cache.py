@@ -0,0 +1,21 @@
+# utils/http_cache.py
+import hashlib
+import json
+from typing import Any, Optional
+
+# Браузер хранит ответ, но каждый раз перепроверяет его по ETag
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag из значений, от которых зависит тело ответа"""
+    raw = json.dumps(parts, default=str, sort_keys=True, separators=(",", ":"))
+    return '"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Сравнение If-None-Match с ETag (слабое, как требует RFC 9110 для GET)"""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
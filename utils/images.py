@@ -0,0 +1,87 @@
+# utils/images.py
+"""
+Генерация производных изображений (уменьшенные копии WebP/JPEG и размытое превью).
+
+Модуль выполняется в процессах пула services.image_service, поэтому зависит
+только от Pillow и стандартной библиотеки.
+"""
+import base64
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+from PIL import Image, ImageFilter, ImageOps
+
+MANIFEST_SUFFIX = ".variants.json"
+PLACEHOLDER_WIDTH = 16
+
+
+def derivative_name(stem: str, width: int, ext: str) -> str:
+    return f"{stem}_{width}.{ext}"
+
+
+def manifest_path(source_path: str) -> str:
+    path = Path(source_path)
+    return str(path.with_name(path.stem + MANIFEST_SUFFIX))
+
+
+def _save_atomic(image: Image.Image, path: Path, **params: Any) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    image.save(tmp_path, **params)
+    os.replace(tmp_path, path)
+
+
+def generate_derivatives(source_path: str, widths: Iterable[int], quality: int = 80) -> Dict[str, Any]:
+    """
+    Рядом с исходником создает <stem>_<w>.webp и <stem>_<w>.jpg для каждой ширины
+    не больше исходной и манифест <stem>.variants.json с размерами и data:URI превью.
+    Возвращает манифест.
+    """
+    widths = list(widths)
+    source = Path(source_path)
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    rgba = image.convert("RGBA") if has_alpha else image.convert("RGB")
+    if has_alpha:
+        # JPEG без прозрачности — подкладываем белый фон
+        rgb = Image.new("RGB", rgba.size, (255, 255, 255))
+        rgb.paste(rgba, mask=rgba.getchannel("A"))
+    else:
+        rgb = rgba
+
+    width, height = image.size
+    sizes = sorted({w for w in widths if 0 < w < width} | {min(max(widths, default=width), width)})
+
+    for target in sizes:
+        target_height = max(1, round(height * target / width))
+        resized_rgba = rgba.resize((target, target_height), Image.Resampling.LANCZOS)
+        resized_rgb = resized_rgba if not has_alpha else rgb.resize((target, target_height), Image.Resampling.LANCZOS)
+        _save_atomic(resized_rgba, source.with_name(derivative_name(source.stem, target, "webp")),
+                     format="WEBP", quality=quality, method=4)
+        _save_atomic(resized_rgb, source.with_name(derivative_name(source.stem, target, "jpg")),
+                     format="JPEG", quality=quality, optimize=True, progressive=True)
+
+    tiny = rgb.resize(
+        (PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))),
+        Image.Resampling.BILINEAR,
+    ).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    tiny.save(buffer, format="WEBP", quality=40)
+    placeholder = "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    manifest = {
+        "width": width,
+        "height": height,
+        "sizes": sizes,
+        "placeholder": placeholder,
+        "source_mtime_ns": source.stat().st_mtime_ns,
+    }
+    tmp_manifest = Path(manifest_path(source_path) + ".tmp")
+    tmp_manifest.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(tmp_manifest, manifest_path(source_path))
+    return manifest
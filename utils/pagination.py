@@ -0,0 +1,40 @@
+# utils/pagination.py
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Any, List
+
+# Заголовки ответа для пагинации списков
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Кодирует значения ключа сортировки последней записи страницы
+    в непрозрачную строку для keyset-пагинации.
+    """
+    raw = json.dumps([_to_json_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Декодирует курсор из encode_cursor.
+    Бросает ValueError, если курсор поврежден или содержит не size значений.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError("Некорректный курсор") from e
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Некорректный курсор")
+    return values